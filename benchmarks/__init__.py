@@ -0,0 +1,10 @@
+from typing import Callable, Dict, Any
+
+Benchmark = Callable[[bool], Dict[str, Any]]
+BENCHMARKS: Dict[str, Benchmark] = dict()
+
+
+def benchmark(func: Benchmark) -> Benchmark:
+    """Register a benchmark, it gets the quick flag and returns JSON values"""
+    BENCHMARKS[func.__name__] = func
+    return func
@@ -0,0 +1,87 @@
+import sys
+import json
+import logging
+import argparse
+import platform
+import multiprocessing
+from typing import Dict, Any, Iterator, Tuple
+
+import rosny
+import benchmarks.core  # noqa: F401
+from benchmarks import BENCHMARKS
+
+
+def flatten(results: Dict[str, Any], prefix: str = "") -> Iterator[Tuple[str, float]]:
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            yield from flatten(value, name)
+        elif isinstance(value, (int, float)):
+            yield name, value
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> int:
+    # All values are costs, so an increase over the threshold is a regression
+    current = dict(flatten(results))
+    regressions = 0
+    for name, base_value in flatten(baseline):
+        if name not in current or not base_value:
+            continue
+        change = current[name] / base_value - 1
+        regressed = change > threshold
+        regressions += regressed
+        print(f"{'REGRESSION ' if regressed else ''}{name}: "
+              f"{base_value:.4g} -> {current[name]:.4g} ({change:+.1%})",
+              file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run rosny benchmarks, "
+                                                 "all values are costs in seconds")
+    parser.add_argument("names", nargs="*",
+                        help=f"Benchmarks to run, all by default: "
+                             f"{', '.join(sorted(BENCHMARKS))}")
+    parser.add_argument("-o", "--output", type=str, default=None,
+                        help="Path to the JSON output, stdout by default")
+    parser.add_argument("-q", "--quick", action="store_true",
+                        help="Short runs for smoke testing")
+    parser.add_argument("-c", "--compare", type=str, default=None,
+                        help="Path to a baseline JSON output")
+    parser.add_argument("-t", "--threshold", type=float, default=0.2,
+                        help="Relative increase reported as a regression")
+    args = parser.parse_args()
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    logging.disable(logging.CRITICAL)
+    results = {name: BENCHMARKS[name](args.quick)
+               for name in args.names or sorted(BENCHMARKS)}
+    output = {
+        "meta": {
+            "rosny": rosny.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": multiprocessing.cpu_count(),
+            "start_method": multiprocessing.get_start_method(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    text = json.dumps(output, indent=2, sort_keys=True)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+
+    if args.compare is not None:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
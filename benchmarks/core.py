@@ -0,0 +1,262 @@
+import os
+import time
+import tempfile
+import statistics
+import multiprocessing
+from typing import Callable, List, Dict, Any
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from rosny import CommonState, ThreadNode, ProcessNode, ComposeNode
+from rosny.loop import LoopNode
+from rosny.timing import LoopRateManager, Profiler
+from rosny.graph import Edge
+from rosny.remote import RemoteSender, RemoteReceiver
+from rosny.slab import SlabQueue
+from rosny.serializers import (
+    Serializer,
+    PickleSerializer,
+    BytesSerializer,
+    NumpySerializer,
+    StructSerializer,
+)
+
+from benchmarks import benchmark
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "mean": statistics.fmean(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p99": ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)],
+        "max": ordered[-1],
+    }
+
+
+class EmptyThreadNode(ThreadNode):
+    def work(self):
+        pass
+
+
+class EmptyProcessNode(ProcessNode):
+    def work(self):
+        pass
+
+
+class LifecycleComposeNode(ComposeNode):
+    def __init__(self, node_class: Callable[..., LoopNode], count: int):
+        super().__init__()
+        for index in range(count):
+            setattr(self, f"node{index}", node_class(loop_rate=100))
+
+
+@benchmark
+def loop_overhead(quick: bool) -> Dict[str, Any]:
+    """Seconds per iteration of a bare loop with an empty work"""
+    duration = 0.2 if quick else 1.0
+    results = dict()
+    for name, node_class in (("thread", EmptyThreadNode),
+                             ("process", EmptyProcessNode)):
+        node = node_class(min_sleep=0)
+        node.start()
+        time.sleep(0.1)
+        start_iterations, start_time = node.control.iterations, time.perf_counter()
+        time.sleep(duration)
+        end_iterations, end_time = node.control.iterations, time.perf_counter()
+        node.stop()
+        node.join()
+        iterations = max(end_iterations - start_iterations, 1)
+        results[name] = (end_time - start_time) / iterations
+    return results
+
+
+@benchmark
+def compose_lifecycle(quick: bool) -> Dict[str, Any]:
+    """Seconds to start, stop and join a compose node versus number of children"""
+    counts = (1, 4) if quick else (1, 4, 16)
+    repeats = 1 if quick else 3
+    results: Dict[str, Any] = dict()
+    for name, node_class in (("thread", EmptyThreadNode),
+                             ("process", EmptyProcessNode)):
+        for count in counts:
+            samples: Dict[str, List[float]] = {"start": [], "stop": [], "join": []}
+            for _ in range(repeats):
+                node = LifecycleComposeNode(node_class, count)
+                node.compile()
+                for action in ("start", "stop", "join"):
+                    start = time.perf_counter()
+                    getattr(node, action)()
+                    samples[action].append(time.perf_counter() - start)
+                    if action == "start":
+                        time.sleep(0.05)
+            results[f"{name}_{count}"] = {action: statistics.median(values)
+                                          for action, values in samples.items()}
+    return results
+
+
+@benchmark
+def common_state(quick: bool) -> Dict[str, Any]:
+    """Seconds to construct a common state"""
+    samples = []
+    for _ in range(20 if quick else 200):
+        start = time.perf_counter()
+        CommonState()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+@benchmark
+def profiler_profile(quick: bool) -> Dict[str, Any]:
+    """Seconds per `Profiler.profile` call without and with profiling"""
+    calls = 10_000 if quick else 100_000
+    results = dict()
+    for name, interval in (("disabled", None), ("enabled", 3600.0)):
+        profiler = Profiler(EmptyThreadNode(), interval=interval)
+        start = time.perf_counter()
+        for _ in range(calls):
+            profiler.profile(1e-3)
+        results[name] = (time.perf_counter() - start) / calls
+    return results
+
+
+@benchmark
+def rate_jitter(quick: bool) -> Dict[str, Any]:
+    """Absolute error of loop periods in seconds for several loop rates"""
+    duration = 0.5 if quick else 2.0
+    results = dict()
+    for precision in (False, True):
+        for loop_rate in (30, 300, 1000):
+            rate_manager = LoopRateManager(loop_rate=loop_rate, precision=precision)
+            loop_time = 1.0 / loop_rate
+            errors = []
+            prev_time = time.perf_counter()
+            end_time = prev_time + duration
+            while prev_time < end_time:
+                rate_manager.timing()
+                now = time.perf_counter()
+                errors.append(abs(now - prev_time - loop_time))
+                prev_time = now
+            mode = "precision" if precision else "default"
+            results[f"{mode}_{loop_rate}hz"] = summarize(errors)
+    return results
+
+
+def put_arrays(item_queue: Any, nbytes: int, count: int):
+    array = np.ones(nbytes, dtype=np.uint8)
+    for _ in range(count):
+        item_queue.put(array)
+
+
+@benchmark
+def queue_throughput(quick: bool) -> Dict[str, Any]:
+    """Seconds per array sent between processes through a pickle and a slab queue"""
+    if np is None:
+        return dict()
+    count = 20 if quick else 200
+    results: Dict[str, Any] = dict()
+    for megabytes in (1, 8):
+        nbytes = megabytes << 20
+        source, target = np.ones(nbytes, dtype=np.uint8), np.empty(nbytes, np.uint8)
+        start = time.perf_counter()
+        for _ in range(count):
+            target[...] = source
+        samples = {"memcpy": (time.perf_counter() - start) / count}
+        queues: Dict[str, Any] = {
+            "pickle_queue": multiprocessing.Queue(4),
+            "slab_queue": SlabQueue(4, slab_size=nbytes, slabs=4),
+        }
+        for name, item_queue in queues.items():
+            process = multiprocessing.Process(target=put_arrays,
+                                              args=(item_queue, nbytes, count + 1))
+            process.start()
+            item_queue.get()
+            start = time.perf_counter()
+            for _ in range(count):
+                item_queue.get()
+            samples[name] = (time.perf_counter() - start) / count
+            process.join()
+        results[f"{megabytes}mb"] = samples
+    return results
+
+
+def time_serializer(serializer: Serializer, item: Any, calls: int) -> Dict[str, float]:
+    start = time.perf_counter()
+    for _ in range(calls):
+        data = serializer.dumps(item)
+    dumps_time = (time.perf_counter() - start) / calls
+    start = time.perf_counter()
+    for _ in range(calls):
+        serializer.loads(data)
+    return {"dumps": dumps_time, "loads": (time.perf_counter() - start) / calls}
+
+
+@benchmark
+def serializers(quick: bool) -> Dict[str, Any]:
+    """Seconds per dumps and loads call of serializers for several payloads"""
+    calls = 100 if quick else 1000
+    payloads: Dict[str, Any] = {
+        "record": (StructSerializer("=qdd"), (42, 0.5, -1.5)),
+        "bytes_1kb": (BytesSerializer(), bytes(1 << 10)),
+        "bytes_1mb": (BytesSerializer(), bytes(1 << 20)),
+    }
+    if np is not None:
+        payloads["array_4x4"] = (NumpySerializer(), np.ones((4, 4), np.float32))
+        payloads["image_480p"] = (NumpySerializer(), np.ones((480, 640, 3), np.uint8))
+    results: Dict[str, Any] = dict()
+    for name, (serializer, item) in payloads.items():
+        results[name] = {
+            serializer.name: time_serializer(serializer, item, calls),
+            "pickle": time_serializer(PickleSerializer(), item, calls),
+        }
+    return results
+
+
+def put_items(channel: Any, item: Any, count: int):
+    for _ in range(count):
+        channel.put(item)
+    if isinstance(channel, RemoteSender):
+        channel.close()
+
+
+def time_receive(receiver: Any, sender: Any, item: Any, count: int) -> float:
+    process = multiprocessing.Process(target=put_items,
+                                      args=(sender, item, count + 1))
+    process.start()
+    receiver.get(timeout=10)
+    start = time.perf_counter()
+    for _ in range(count):
+        receiver.get(timeout=10)
+    elapsed = time.perf_counter() - start
+    process.join()
+    return elapsed / count
+
+
+@benchmark
+def remote_throughput(quick: bool) -> Dict[str, Any]:
+    """Seconds per item sent between processes over remote channels
+    and a shared memory edge"""
+    count = 100 if quick else 1000
+    payloads: Dict[str, Any] = {"1kb": (bytes(1 << 10), "bytes")}
+    if np is not None:
+        payloads["1mb"] = (np.ones(1 << 20, dtype=np.uint8), "numpy")
+    results: Dict[str, Any] = dict()
+    with tempfile.TemporaryDirectory() as directory:
+        addresses: Dict[str, Any] = {
+            "tcp": ("127.0.0.1", 0),
+            "unix": os.path.join(directory, "remote.sock"),
+        }
+        for name, (item, serializer) in payloads.items():
+            edge = Edge(capacity=64, kind="shared", serializer=serializer)
+            samples = {"shared_edge": time_receive(edge, edge, item, count)}
+            for transport, address in addresses.items():
+                receiver = RemoteReceiver(address, serializer=serializer)
+                receiver.open()
+                sender = RemoteSender(receiver.address, serializer=serializer)
+                samples[transport] = time_receive(receiver, sender, item, count)
+                receiver.close()
+            results[name] = samples
+    return results
@@ -1,12 +1,11 @@
 import argparse
-from ctypes import c_uint8
-from multiprocessing import Queue, Array, Lock, set_start_method
+from multiprocessing import Queue, set_start_method
 
 import cv2  # type: ignore
 import mediapipe  # type: ignore
-import numpy as np  # type: ignore
 
 from rosny import ProcessNode, ComposeNode
+from rosny.channel import SharedArrayChannel
 
 parser = argparse.ArgumentParser()
 parser.add_argument("-i", "--input", default=0,
@@ -27,34 +26,10 @@ def get_video_params(source):
     return frame_size, fps
 
 
-class NumpyArray:
-    """NumPy array on shared memory"""
-    def __init__(self, shape: tuple, ctype=c_uint8):
-        self.shape = tuple(shape)
-        self.ctype = ctype
-        self.lock = Lock()
-        self.array = Array(ctype, int(np.prod(self.shape)))
-
-    def _numpy_array(self) -> np.ndarray:
-        return np.ndarray(self.shape,
-                          dtype=self.ctype,
-                          buffer=self.array.get_obj())
-
-    @property
-    def value(self) -> np.ndarray:
-        with self.lock:
-            return self._numpy_array().copy()
-
-    @value.setter
-    def value(self, array: np.ndarray):
-        with self.lock:
-            self._numpy_array()[:] = array
-
-
 class VideoNode(ProcessNode):
-    def __init__(self, loop_rate, shared_image: NumpyArray, source=0):
+    def __init__(self, loop_rate, image_channel: SharedArrayChannel, source=0):
         super().__init__(loop_rate=loop_rate, profile_interval=5)
-        self.shared_image = shared_image
+        self.image_channel = image_channel
         self.source = source
         self.video = None
 
@@ -62,9 +37,10 @@ class VideoNode(ProcessNode):
         self.video = cv2.VideoCapture(self.source)
 
     def work(self):
-        success, image = self.video.read()
+        # decode the frame directly into the shared memory slot
+        success, _ = self.video.read(self.image_channel.acquire())
         if success:
-            self.shared_image.value = image
+            self.image_channel.commit()
         else:
             self.common_state.set_exit()
 
@@ -73,9 +49,12 @@ class VideoNode(ProcessNode):
 
 
 class PoseEstimationNode(ProcessNode):
-    def __init__(self, loop_rate, shared_image: NumpyArray, result_queue: Queue):
+    def __init__(self,
+                 loop_rate,
+                 image_channel: SharedArrayChannel,
+                 result_queue: Queue):
         super().__init__(loop_rate=loop_rate, profile_interval=5)
-        self.shared_image = shared_image
+        self.image_channel = image_channel
         self.result_queue = result_queue
         self.pose_estimation = None
 
@@ -87,21 +66,28 @@ class PoseEstimationNode(ProcessNode):
         )
 
     def work(self):
-        image = cv2.cvtColor(self.shared_image.value, cv2.COLOR_BGR2RGB)
+        seq, image = self.image_channel.read()
+        if image is None:
+            return
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        if not self.image_channel.valid(seq):
+            return  # the slot was overwritten during conversion
         image.flags.writeable = False
         output = self.pose_estimation.process(image)
         self.result_queue.put(output.pose_landmarks, timeout=1)
 
 
 class VisualizeNode(ProcessNode):
-    def __init__(self, shared_image: NumpyArray, result_queue: Queue):
+    def __init__(self, image_channel: SharedArrayChannel, result_queue: Queue):
         super().__init__(profile_interval=5)
-        self.shared_image = shared_image
+        self.image_channel = image_channel
         self.result_queue = result_queue
 
     def work(self):
         pose_landmarks = self.result_queue.get(timeout=1)
-        image = self.shared_image.value
+        _, image = self.image_channel.read(copy=True)  # image is drawn in place
+        if image is None:
+            return
         mediapipe.solutions.drawing_utils.draw_landmarks(
             image, pose_landmarks,
             mediapipe.solutions.pose.POSE_CONNECTIONS
@@ -115,11 +101,11 @@ class MainNode(ComposeNode):
     def __init__(self, source):
         super().__init__()
         image_size, fps = get_video_params(source)
-        shared_image = NumpyArray(image_size)
+        image_channel = SharedArrayChannel(image_size, dtype="uint8")
         result_queue = Queue(maxsize=2)
-        self.video_node = VideoNode(fps, shared_image, source)
-        self.pose_node = PoseEstimationNode(fps, shared_image, result_queue)
-        self.visualize_node = VisualizeNode(shared_image, result_queue)
+        self.video_node = VideoNode(fps, image_channel, source)
+        self.pose_node = PoseEstimationNode(fps, image_channel, result_queue)
+        self.visualize_node = VisualizeNode(image_channel, result_queue)
 
 
 if __name__ == "__main__":
@@ -5,6 +5,8 @@ import mediapipe  # type: ignore
 import numpy as np  # type: ignore
 
 from rosny import CommonState, ThreadNode, ComposeNode
+from rosny.timing import AdaptiveRate
+from rosny.topic import Topic
 
 parser = argparse.ArgumentParser()
 parser.add_argument("-i", "--input", default=0,
@@ -15,8 +17,8 @@ args = parser.parse_args()
 class State(CommonState):
     def __init__(self):
         super(State, self).__init__()
-        self.image = None
-        self.selfie_output = None
+        self.image = Topic()
+        self.selfie_output = Topic()
 
 
 class VideoNode(ThreadNode):
@@ -29,7 +31,7 @@ class VideoNode(ThreadNode):
         success, image = self.video.read()
         if success:
             image = cv2.flip(image, 1)
-            self.common_state.image = image
+            self.common_state.image.publish(image)
         else:
             self.common_state.set_exit()
 
@@ -38,28 +40,41 @@ class VideoNode(ThreadNode):
 
 
 class SelfieSegmentationNode(ThreadNode):
-    def __init__(self, loop_rate):
-        super().__init__(loop_rate=loop_rate, profile_interval=5)
+    def __init__(self):
+        super().__init__(profile_interval=5)
         self.selfie_segmentation = mediapipe.solutions\
             .selfie_segmentation.SelfieSegmentation(model_selection=1)
+        self.image_seq = 0
 
     def work(self):
-        image = self.common_state.image
-        if image is not None:
+        # run inference only when a new frame is published
+        message = self.common_state.image.wait(self.image_seq, timeout=0.1)
+        if message is not None:
+            self.image_seq, image = message
             image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
             image.flags.writeable = False
             output = self.selfie_segmentation.process(image)
-            self.common_state.selfie_output = output
+            self.common_state.selfie_output.publish(output)
 
 
 class VisualizeNode(ThreadNode):
     def __init__(self, loop_rate):
         super().__init__(loop_rate=loop_rate, profile_interval=5)
+        self.max_rate = loop_rate
+        self.output_seq = 0
+
+    def on_loop_begin(self):
+        # draw only as fast as the segmentation produces outputs
+        self.rate_manager.adaptive = AdaptiveRate(
+            min_rate=1, max_rate=self.max_rate,
+            inputs=[self.common_state.selfie_output]
+        )
 
     def work(self):
-        image = self.common_state.image
-        output = self.common_state.selfie_output
-        if image is not None and output is not None:
+        message = self.common_state.selfie_output.poll(self.output_seq)
+        if message is not None:
+            self.output_seq, output = message
+            _, image = self.common_state.image.get()
             condition = np.stack((output.segmentation_mask,) * 3, axis=-1) > 0.1
             bg_image = np.zeros(image.shape, dtype=np.uint8)
             bg_image[:] = (192, 192, 192)
@@ -73,7 +88,7 @@ class MainNode(ComposeNode):
     def __init__(self, source):
         super().__init__()
         self.video_node = VideoNode(source)
-        self.selfie_node = SelfieSegmentationNode(self.video_node.fps)
+        self.selfie_node = SelfieSegmentationNode()
         self.visualize_node = VisualizeNode(self.video_node.fps)
         self.compile(common_state=State())  # Share custom common_state between nodes
 
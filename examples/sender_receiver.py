@@ -1,12 +1,13 @@
 import os
 import multiprocessing
-from multiprocessing import Queue
+from queue import Empty
 
 from rosny import ThreadNode, ProcessNode, ComposeNode
+from rosny.trigger import TriggerQueue
 
 
 class SenderNode(ThreadNode):  # using threading.Thread
-    def __init__(self, queue: Queue):
+    def __init__(self, queue: TriggerQueue):
         super().__init__(loop_rate=30)
         self.queue = queue
         self.count = 0
@@ -19,20 +20,25 @@ class SenderNode(ThreadNode):  # using threading.Thread
 
 
 class ReceiverNode(ProcessNode):  # using multiprocessing.Process
-    def __init__(self, queue: Queue):
+    def __init__(self, queue: TriggerQueue):
         super().__init__(profile_interval=3)
         self.queue = queue
+        self.trigger_on(queue)  # wake up only when the queue has new items
 
-    # run the method in a loop in a separate process
+    # run the method in a separate process each time the queue is triggered
     def work(self):
-        value = self.queue.get(timeout=1)
-        self.logger.info(f'pid {os.getpid()}, get {value}')
+        while True:
+            try:
+                value = self.queue.get_nowait()
+            except Empty:
+                break
+            self.logger.info(f'pid {os.getpid()}, get {value}')
 
 
 class MainNode(ComposeNode):  # merging several nodes
     def __init__(self):
         super().__init__()
-        queue = Queue()
+        queue = TriggerQueue()
         self.sender = SenderNode(queue)
         self.receiver = ReceiverNode(queue)
         self.compile()
@@ -1,13 +1,11 @@
-import multiprocessing
 from queue import Queue
 
 from rosny import CommonState, ThreadNode, ProcessNode, ComposeNode
+from rosny.fields import SharedScalar
 
 
 class State(CommonState):
-    def __init__(self):
-        super(State, self).__init__()
-        self.value = multiprocessing.Value("i", 0)
+    value = SharedScalar("i")  # shared between processes
 
 
 class SenderNode(ThreadNode):
@@ -27,7 +25,7 @@ class ReceiverNode(ThreadNode):
         self.queue = queue
 
     def work(self):
-        self.common_state.value.value = self.queue.get(timeout=1)
+        self.common_state.value = self.queue.get(timeout=1)
 
 
 class MultiThreadNode(ComposeNode):
@@ -64,4 +62,4 @@ if __name__ == "__main__":
     node.wait(10)
     node.stop()
     node.join()
-    print("Counter", state.value.value)
+    print("Counter", state.value)
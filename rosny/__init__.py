@@ -1,6 +1,7 @@
 from rosny.state import CommonState
 from rosny.thread import ThreadNode
 from rosny.process import ProcessNode
+from rosny.aio import AsyncioNode
 from rosny.compose import ComposeNode
 
 __version__ = "0.1.0"
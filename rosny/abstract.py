@@ -1,5 +1,6 @@
 import abc
 from typing import Optional
+from multiprocessing.context import BaseContext
 
 from rosny.state import CommonState
 from rosny.utils import setup_logger, default_object_name
@@ -71,10 +72,24 @@ class BaseNode(AbstractNode, metaclass=abc.ABCMeta):
     def __init__(self):
         self.name = default_object_name(self)
         self.logger = setup_logger(self.name)
-        self.common_state = CommonState()
+        self._common_state: Optional[CommonState] = None
+        # Start method of child processes, set by the parent compose node
+        self.mp_context: Optional[BaseContext] = None
         self._compiled = False
         self.handle_signals = True
 
+    @property
+    def common_state(self) -> CommonState:
+        # Replaced by the state of the parent node at compile,
+        # a standalone node creates its own on first use
+        if self._common_state is None:
+            self._common_state = CommonState(mp_context=self.mp_context)
+        return self._common_state
+
+    @common_state.setter
+    def common_state(self, value: CommonState):
+        self._common_state = value
+
     def compile(self,
                 common_state: Optional[CommonState] = None,
                 name: Optional[str] = None,
@@ -97,6 +112,7 @@ class BaseNode(AbstractNode, metaclass=abc.ABCMeta):
     def _actions_before_start(self):
         if not self.compiled():
             self.compile()
+        self.common_state.allocate()
         self.common_state.clear_exit()
         if self.handle_signals:
             start_signals(self)
@@ -0,0 +1,143 @@
+import os
+import abc
+import time
+import asyncio
+import threading
+import concurrent.futures
+from typing import Optional
+
+from rosny.loop import LoopNode
+from rosny.placement import Placement
+from rosny.restart import RestartPolicy
+
+
+class EventLoopThread:
+    """Event loop running forever in a daemon thread"""
+
+    def __init__(self, name: str = "rosny-asyncio"):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def is_alive(self) -> bool:
+        return self.thread.is_alive()
+
+
+_shared_lock = threading.Lock()
+_shared_thread: Optional[EventLoopThread] = None
+_shared_pid: Optional[int] = None
+
+
+def get_event_loop_thread() -> EventLoopThread:
+    """Event loop thread shared by all asyncio nodes of the current process"""
+    global _shared_thread, _shared_pid
+    with _shared_lock:
+        # Threads are not inherited by forked processes
+        if (_shared_thread is None or _shared_pid != os.getpid()
+                or not _shared_thread.is_alive()):
+            _shared_thread = EventLoopThread()
+            _shared_pid = os.getpid()
+        return _shared_thread
+
+
+class AsyncioNode(LoopNode, metaclass=abc.ABCMeta):
+    """Loop node running `async def work()` on an event loop shared by many nodes.
+
+    Work must not block, otherwise it stalls every other node on the loop.
+    Triggers and placement are not supported, because waiting on a trigger
+    blocks and the loop thread is shared. Restart policies are supported.
+    """
+
+    def __init__(self,
+                 loop_rate: Optional[float] = None,
+                 min_sleep: float = 1e-9,
+                 profile_interval: Optional[float] = None,
+                 daemon: bool = False,
+                 restart_policy: Optional[RestartPolicy] = None):
+        super().__init__(loop_rate=loop_rate,
+                         min_sleep=min_sleep,
+                         profile_interval=profile_interval,
+                         daemon=daemon,
+                         restart_policy=restart_policy)
+        self._driver: Optional[concurrent.futures.Future] = None
+
+    @property
+    def placement(self) -> Optional[Placement]:
+        return None
+
+    @placement.setter
+    def placement(self, value: Optional[Placement]):
+        if value is not None:
+            raise ValueError("Asyncio nodes share the event loop thread, "
+                             "so they can't have a placement")
+
+    @abc.abstractmethod
+    async def work(self):
+        pass
+
+    def trigger_on(self, *inputs):
+        raise TypeError("Asyncio nodes can't wait on triggers, "
+                        "poll the inputs in work instead")
+
+    def loop(self):
+        asyncio.run(self.async_loop())
+
+    async def async_loop(self):
+        if self.restart_policy is not None:
+            self.restart_policy.reset()
+        restart_delay: Optional[float] = None
+        while True:
+            try:
+                self.on_loop_begin()
+                self.rate_manager.reset()
+                self.profiler.reset(self)
+                self.control.reset()
+                while not self.stopped():
+                    await self.work()
+                    await self.rate_manager.async_timing()
+                    self.profiler.profile(self.rate_manager.sleep_time)
+                    self.control.beat()
+            except (Exception, KeyboardInterrupt) as exception:
+                restart_delay = self._restart_delay(exception)
+                if restart_delay is None:
+                    self.on_catch_exception(exception)
+            finally:
+                self.on_loop_end()
+            if (restart_delay is None
+                    or not await self._async_wait_restart(restart_delay)):
+                break
+            restart_delay = None
+
+    async def _async_wait_restart(self, delay: float) -> bool:
+        # Same as `_wait_restart`, but yields to the event loop
+        deadline = time.monotonic() + delay
+        while not self.stopped():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.control.restart()
+                return True
+            await asyncio.sleep(min(remaining, 0.05))
+        return False
+
+    def _start_driver(self):
+        event_loop_thread = get_event_loop_thread()
+        self.logger.info(f"Starting coroutine {self.name} "
+                         f"on thread {event_loop_thread.thread.name}")
+        self.control.stopped = False
+        self._driver = asyncio.run_coroutine_threadsafe(self.async_loop(),
+                                                        event_loop_thread.loop)
+
+    def _stop_driver(self):
+        self.control.stopped = True
+
+    def _join_driver(self, timeout: Optional[float] = None):
+        if self._driver is not None:
+            concurrent.futures.wait([self._driver], timeout)
+            if not self._driver.done():
+                self.logger.error(f"Coroutine '{self.name}' join timeout {timeout}")
+            else:
+                self._driver = None
@@ -0,0 +1,44 @@
+import abc
+import time
+from queue import Empty
+from typing import List, Any
+
+
+def drain(queue: Any, max_items: int, timeout: float) -> List[Any]:
+    """Get up to `max_items` items from a queue waiting at most `timeout` seconds"""
+    items: List[Any] = []
+    deadline = time.perf_counter() + timeout
+    while len(items) < max_items:
+        try:
+            items.append(queue.get_nowait())
+        except Empty:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                items.append(queue.get(timeout=remaining))
+            except Empty:
+                break
+    return items
+
+
+class BatchMixin(metaclass=abc.ABCMeta):
+    """Mixin for loop nodes that handle items of an input queue in batches.
+
+    Each loop iteration drains up to `batch_size` items from `batch_input`,
+    waiting at most `batch_timeout` seconds, and passes them to `work_batch`,
+    so stop checks, rate timing and profiling are done once per batch.
+    """
+
+    batch_input: Any = None
+    batch_size: int = 1024
+    batch_timeout: float = 1e-3
+
+    def work(self):
+        items = drain(self.batch_input, self.batch_size, self.batch_timeout)
+        if items:
+            self.work_batch(items)
+
+    @abc.abstractmethod
+    def work_batch(self, items: List[Any]):
+        pass
@@ -0,0 +1,94 @@
+from typing import Optional, Tuple, List, Any
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from rosny.shared import SharedMemoryBlock, align
+from rosny.trigger import TriggerSource
+
+
+class SharedArrayChannel(TriggerSource):
+    """Ring of NumPy arrays on shared memory with a single writer"""
+
+    def __init__(self, shape: Tuple[int, ...], dtype: Any = "uint8", slots: int = 3):
+        if np is None:
+            raise ImportError("SharedArrayChannel requires numpy")
+        if slots < 2:
+            raise ValueError(f"Number of slots must be at least 2, got {slots}")
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.slots = slots
+        self._header_size = align(8 * (slots + 1))
+        self._slot_size = align(int(np.prod(self.shape)) * self.dtype.itemsize)
+        self._block = SharedMemoryBlock(self._header_size + self._slot_size * slots)
+        self._header: memoryview
+        self._arrays: List[Any] = []
+        self._triggers = []
+        self._build()
+
+    def _build(self):
+        buf = self._block.buf
+        # header[0] is the last committed sequence number,
+        # header[1 + slot] is the sequence number stored in the slot, 0 if none
+        self._header = buf[:8 * (self.slots + 1)].cast('q')
+        self._arrays = [
+            np.ndarray(self.shape,
+                       dtype=self.dtype,
+                       buffer=buf,
+                       offset=self._header_size + slot * self._slot_size)
+            for slot in range(self.slots)
+        ]
+
+    @property
+    def seq(self) -> int:
+        return self._header[0]
+
+    def acquire(self):
+        seq = self._header[0] + 1
+        slot = seq % self.slots
+        self._header[1 + slot] = 0
+        return self._arrays[slot]
+
+    def commit(self) -> int:
+        seq = self._header[0] + 1
+        self._header[1 + seq % self.slots] = seq
+        self._header[0] = seq
+        self.notify_triggers()
+        return seq
+
+    def write(self, array) -> int:
+        self.acquire()[...] = array
+        return self.commit()
+
+    def read(self, copy: bool = False) -> Tuple[int, Optional[Any]]:
+        """Latest committed array and its sequence number, (0, None) if none.
+
+        Without copy the array is a view of the slot, which the writer
+        reuses after `slots - 1` further commits. Check `valid(seq)` after
+        using the view to make sure it wasn't overwritten meanwhile.
+        """
+        while True:
+            seq = self._header[0]
+            if not seq:
+                return 0, None
+            slot = seq % self.slots
+            array = self._arrays[slot]
+            if copy:
+                array = array.copy()
+            if self._header[1 + slot] == seq:
+                return seq, array
+
+    def valid(self, seq: int) -> bool:
+        return seq > 0 and self._header[1 + seq % self.slots] == seq
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_header"]
+        del state["_arrays"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._build()
@@ -1,22 +1,71 @@
 import abc
+import copy
 import time
-from typing import Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, Dict, Sequence, Union, Any
 
 from rosny.abstract import BaseNode, AbstractNode
+from rosny.aio import AsyncioNode
+from rosny.control import ControlBlock
+from rosny.exporter import MetricsExporter
+from rosny.graph import Graph, Edge, BoundInput, BoundOutput
+from rosny.loop import LoopNode
+from rosny.placement import Placement, available_cpus
+from rosny.serializers import Serializer
+from rosny.startup import prepare_start_method
 from rosny.state import CommonState
+from rosny.watchdog import Watchdog
 
 
 class ComposeNode(BaseNode, metaclass=abc.ABCMeta):
     @abc.abstractmethod
-    def __init__(self):
+    def __init__(self,
+                 concurrent: bool = False,
+                 start_method: Optional[str] = None,
+                 preload: Sequence[str] = (),
+                 spread_cpus: bool = False):
         super().__init__()
+        # Multiprocessing objects shared with children are bound to the start
+        # method, rosny creates them in `mp_context`, objects created in
+        # subclasses must be created in it too, e.g. `self.mp_context.Queue()`
+        if start_method is not None:
+            self.mp_context = prepare_start_method(start_method, preload)
         self._nodes: Dict[str, AbstractNode] = dict()
+        self.control_block: Optional[ControlBlock] = None
+        self.exporter: Optional[MetricsExporter] = None
+        self.watchdog: Optional[Watchdog] = None
+        self.concurrent = concurrent
+        self.start_method = start_method
+        self.preload = tuple(preload)
+        self.spread_cpus = spread_cpus
+        self.graph = Graph()
+        self.start_durations: Dict[str, float] = dict()
+        self.join_durations: Dict[str, float] = dict()
 
     def __setattr__(self, name, value):
         if isinstance(value, AbstractNode):
             self._nodes[name] = value
         object.__setattr__(self, name, value)
 
+    def _port_owner(self, port: Any) -> BaseNode:
+        for node in self._nodes.values():
+            if any(value is port for value in vars(node).values()):
+                return node  # type: ignore
+        raise ValueError("Port does not belong to a child node")
+
+    def connect(self,
+                output: BoundOutput,
+                input_: BoundInput,
+                capacity: int = 1,
+                policy: str = "block",
+                kind: str = "process",
+                serializer: Union[str, Serializer, None] = None) -> Edge:
+        return self.graph.connect(self._port_owner(output), output,
+                                  self._port_owner(input_), input_,
+                                  capacity=capacity, policy=policy, kind=kind,
+                                  serializer=serializer,
+                                  mp_context=self.mp_context)
+
     def compile(self,
                 common_state: Optional[CommonState] = None,
                 name: Optional[str] = None,
@@ -26,27 +75,86 @@ class ComposeNode(BaseNode, metaclass=abc.ABCMeta):
                         name=name,
                         handle_signals=handle_signals)
         for node_name, node in self._nodes.items():
+            if isinstance(node, BaseNode) and node.mp_context is None:
+                node.mp_context = self.mp_context
             node.compile(
                 common_state=self.common_state,
                 name=f"{self.name}/{node_name}",
                 handle_signals=False
             )
+        self._compile_control_block()
+        if self.spread_cpus:
+            self._spread_cpus()
         self.on_compile_end()
 
+    def _compile_control_block(self):
+        loop_nodes = [node for node in self._nodes.values()
+                      if isinstance(node, LoopNode) and node.joined()]
+        if loop_nodes:
+            self.control_block = ControlBlock(len(loop_nodes))
+            for index, node in enumerate(loop_nodes):
+                node.control = self.control_block.slot(index)
+
+    def _spread_cpus(self):
+        # Pins each loop node without its own affinity to one of the available cores
+        cpus = available_cpus()
+        loop_nodes = [node for node in self._nodes.values()
+                      if isinstance(node, LoopNode)
+                      and not isinstance(node, AsyncioNode)]
+        for index, node in enumerate(loop_nodes):
+            cpu = cpus[index % len(cpus)]
+            if node.placement is None:
+                node.placement = Placement(cpus=[cpu])
+            elif node.placement.cpus is None:
+                node.placement = copy.copy(node.placement)
+                node.placement.cpus = [cpu]
+        self.logger.info("CPU placement - " + ", ".join(
+            f"{node.name} {node.placement.cpus}" for node in loop_nodes
+        ))
+
+    def _run_nodes(self, action: Callable[[AbstractNode], None]) -> Dict[str, float]:
+        # Returns duration of the action for each child node
+        def run(node: AbstractNode) -> float:
+            start = time.perf_counter()
+            action(node)
+            return time.perf_counter() - start
+
+        if self.concurrent and len(self._nodes) > 1:
+            with ThreadPoolExecutor(max_workers=len(self._nodes),
+                                    thread_name_prefix=self.name) as executor:
+                futures = {name: executor.submit(run, node)
+                           for name, node in self._nodes.items()}
+                return {name: future.result() for name, future in futures.items()}
+        return {name: run(node) for name, node in self._nodes.items()}
+
+    def _log_durations(self, action: str, durations: Dict[str, float]):
+        items = ", ".join(f"{name} {duration:.3g}s"
+                          for name, duration in durations.items())
+        self.logger.info(f"{action} durations - {items}")
+
     def start(self):
         self.logger.info("Starting node")
         self._actions_before_start()
         self.on_start_begin()
-        for node in self._nodes.values():
-            node.start()
+        if self.watchdog is not None:
+            self.watchdog.attach()
+        self.start_durations = self._run_nodes(lambda node: node.start())
+        self._log_durations("Start", self.start_durations)
+        if self.exporter is not None:
+            self.exporter.start()
+        if self.watchdog is not None:
+            self.watchdog.start()
         self.on_start_end()
         self.logger.info("Node started")
 
     def stop(self):
         self.logger.info("Stopping node")
         self.on_stop_begin()
-        for node in self._nodes.values():
-            node.stop()
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        if self.exporter is not None:
+            self.exporter.stop()
+        self._run_nodes(lambda node: node.stop())
         self.on_stop_end()
         self._actions_after_stop()
         self.logger.info("Node stopped")
@@ -54,12 +162,17 @@ class ComposeNode(BaseNode, metaclass=abc.ABCMeta):
     def join(self, timeout: Optional[float] = None):
         self.logger.info("Joining node")
         self.on_join_begin()
-        for node in self._nodes.values():
-            start = time.perf_counter()
-            node.join(timeout=timeout)
-            if timeout is not None:
-                timeout -= time.perf_counter() - start
-                timeout = max(timeout, 0)
+        # All children are joined against one deadline
+        deadline = None if timeout is None else time.perf_counter() + timeout
+
+        def join(node: AbstractNode):
+            if deadline is None:
+                node.join()
+            else:
+                node.join(timeout=max(deadline - time.perf_counter(), 0))
+
+        self.join_durations = self._run_nodes(join)
+        self._log_durations("Join", self.join_durations)
         self.on_join_end()
         self.logger.info("Node joined")
 
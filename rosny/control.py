@@ -0,0 +1,98 @@
+import os
+import time
+
+from rosny.shared import SharedMemoryBlock
+
+_ROW_SIZE = 64  # one cache line per node to avoid false sharing
+_STOPPED = 0
+_ITERATIONS = 1
+_TIMESTAMP = 2
+_PID = 3
+_STARTED = 4
+_RESTARTS = 5
+
+
+class ControlBlock:
+    """Stop flags and heartbeats of several nodes on one shared memory segment"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._block = SharedMemoryBlock(size * _ROW_SIZE)
+        for index in range(size):
+            self.slot(index).stopped = True
+
+    def slot(self, index: int) -> 'ControlSlot':
+        if not 0 <= index < self.size:
+            raise IndexError(f"Control slot index {index} out of range")
+        return ControlSlot(self, index)
+
+    def row(self, index: int) -> memoryview:
+        offset = index * _ROW_SIZE
+        return self._block.buf[offset:offset + _ROW_SIZE]
+
+
+class ControlSlot:
+    """Row of a control block that belongs to a single node"""
+
+    def __init__(self, block: ControlBlock, index: int):
+        self.block = block
+        self.index = index
+        self._ints: memoryview
+        self._floats: memoryview
+        self._build()
+
+    def _build(self):
+        row = self.block.row(self.index)
+        self._ints = row.cast('q')
+        self._floats = row.cast('d')
+
+    @property
+    def stopped(self) -> bool:
+        return bool(self._ints[_STOPPED])
+
+    @stopped.setter
+    def stopped(self, value: bool):
+        self._ints[_STOPPED] = int(value)
+
+    @property
+    def iterations(self) -> int:
+        return self._ints[_ITERATIONS]
+
+    @property
+    def timestamp(self) -> float:
+        return self._floats[_TIMESTAMP]
+
+    @property
+    def pid(self) -> int:
+        return self._ints[_PID]
+
+    @property
+    def started(self) -> float:
+        return self._floats[_STARTED]
+
+    @started.setter
+    def started(self, value: float):
+        self._floats[_STARTED] = value  # type: ignore
+
+    @property
+    def restarts(self) -> int:
+        return self._ints[_RESTARTS]
+
+    def restart(self):
+        self._ints[_RESTARTS] += 1
+
+    def reset(self):
+        self._ints[_ITERATIONS] = 0
+        self._floats[_TIMESTAMP] = time.monotonic()
+        self._ints[_PID] = os.getpid()
+
+    def beat(self):
+        self._ints[_ITERATIONS] += 1
+        self._floats[_TIMESTAMP] = time.monotonic()
+
+    def __getstate__(self) -> dict:
+        return {"block": self.block, "index": self.index}
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._build()
@@ -0,0 +1,199 @@
+import os
+import math
+import time
+from threading import Thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Optional, Dict, List, Tuple, Any, Union
+
+from rosny.abstract import AbstractNode, BaseNode
+from rosny.loop import LoopNode
+from rosny.utils import setup_logger
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r'\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def _labels(**labels: Any) -> str:
+    items = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+    return "{" + items + "}"
+
+
+def read_process_stats(pid: int) -> Optional[Tuple[float, int]]:
+    """CPU seconds and resident memory bytes of a process from procfs"""
+    try:
+        with open(f"/proc/{pid}/stat") as file:
+            stat = file.read()
+    except OSError:
+        return None
+    fields = stat[stat.rfind(")") + 2:].split()
+    cpu_time = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    rss = int(fields[21]) * os.sysconf("SC_PAGE_SIZE")
+    return cpu_time, rss
+
+
+def collect_loop_nodes(node: AbstractNode) -> List[LoopNode]:
+    if isinstance(node, LoopNode):
+        return [node]
+    loop_nodes: List[LoopNode] = []
+    for child in getattr(node, "_nodes", dict()).values():
+        loop_nodes += collect_loop_nodes(child)
+    return loop_nodes
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.exporter.render().encode()  # type: ignore
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+class MetricsExporter:
+    """Serves node stats in Prometheus text format from a background thread.
+
+    Stats are read from shared memory on every scrape,
+    so the exporter adds nothing to the node loops.
+    """
+
+    def __init__(self,
+                 node: BaseNode,
+                 host: str = "127.0.0.1",
+                 port: Optional[int] = None,
+                 path: Optional[str] = None):
+        if (port is None) == (path is None):
+            raise ValueError("Exactly one of port or path must be set")
+        self.node = node
+        self.host = host
+        self.port = port
+        self.path = path
+        self.queues: Dict[str, Any] = dict()
+        self.logger = setup_logger(f"{node.name}/exporter")
+        self._server: Optional[Union[ThreadingHTTPServer, _UnixHTTPServer]] = None
+        self._thread: Optional[Thread] = None
+
+    @property
+    def address(self) -> Any:
+        if self._server is None:
+            return None
+        return self._server.server_address
+
+    def add_queue(self, name: str, queue: Any):
+        self.queues[name] = queue
+
+    def start(self):
+        if self._server is not None:
+            self.logger.error("Exporter is already started")
+            return
+        if self.path is not None:
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            self._server = _UnixHTTPServer(self.path, _MetricsHandler)
+        else:
+            self._server = ThreadingHTTPServer((self.host, self.port), _MetricsHandler)
+            self._server.daemon_threads = True
+        self._server.exporter = self  # type: ignore
+        self._thread = Thread(target=self._server.serve_forever,
+                              name=self.logger.name,
+                              daemon=True)
+        self._thread.start()
+        self.logger.info(f"Serving metrics on {self.address}")
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        if self.path is not None and os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = None
+        self._thread = None
+        self.logger.info("Metrics exporter stopped")
+
+    def render(self) -> str:
+        metrics: Dict[str, List[str]] = dict()
+
+        def add(name: str, kind: str, labels: str, value: float):
+            lines = metrics.setdefault(name, [f"# TYPE {name} {kind}"])
+            lines.append(f"{name}{labels} {_format_value(value)}")
+
+        now = time.monotonic()
+        pids: Dict[int, List[str]] = dict()
+        profile_stats = self.node.common_state.profile_stats
+        for node in collect_loop_nodes(self.node):
+            name = node.name
+            control = node.control
+            labels = _labels(node=name)
+            add("rosny_node_up", "gauge", labels, int(not control.stopped))
+            add("rosny_node_iterations_total", "counter", labels, control.iterations)
+            add("rosny_node_restarts_total", "counter", labels, control.restarts)
+            if control.pid:
+                add("rosny_node_heartbeat_age_seconds", "gauge", labels,
+                    max(now - control.timestamp, 0.0))
+                pids.setdefault(control.pid, []).append(name)
+            if name not in profile_stats:
+                continue
+            stats = profile_stats.stats(name)
+            add("rosny_node_loop_rate", "gauge", labels, stats["loop_rate"])
+            add("rosny_node_target_rate", "gauge", labels, stats["target_rate"])
+            add("rosny_node_overruns_total", "counter", labels, stats["overruns"])
+            for kind in ("loop", "work", "sleep", "jitter"):
+                for quantile, key in (("0.5", "p50"), ("0.9", "p90"),
+                                      ("0.99", "p99"), ("1", "max")):
+                    add(f"rosny_node_{kind}_time_seconds", "gauge",
+                        _labels(node=name, quantile=quantile),
+                        stats[f"{kind}_{key}"])
+
+        for queue_name, queue in self.queues.items():
+            try:
+                depth = queue.qsize()
+            except NotImplementedError:
+                continue
+            add("rosny_queue_depth", "gauge", _labels(queue=queue_name), depth)
+
+        graph = getattr(self.node, "graph", None)
+        for link in graph.stats() if graph is not None else []:
+            labels = _labels(source=link["source"], target=link["target"])
+            add("rosny_edge_depth", "gauge", labels, link["depth"])
+            add("rosny_edge_puts_total", "counter", labels, link["puts"])
+            add("rosny_edge_gets_total", "counter", labels, link["gets"])
+            add("rosny_edge_drops_total", "counter", labels, link["drops"])
+            if link["serializer"]:
+                add("rosny_edge_serialize_seconds", "gauge", labels,
+                    link["serialize_time"])
+                add("rosny_edge_deserialize_seconds", "gauge", labels,
+                    link["deserialize_time"])
+
+        for pid, names in sorted(pids.items()):
+            process_stats = read_process_stats(pid)
+            if process_stats is None:
+                continue
+            cpu_time, rss = process_stats
+            labels = _labels(pid=pid, nodes=",".join(names))
+            add("rosny_process_cpu_seconds_total", "counter", labels, cpu_time)
+            add("rosny_process_resident_memory_bytes", "gauge", labels, rss)
+
+        return "".join(line + "\n" for lines in metrics.values() for line in lines)
@@ -0,0 +1,171 @@
+import abc
+import struct
+from typing import Any, Dict, Mapping, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from rosny.shared import SharedMemoryBlock, SeqLock, WriterDiedError, align
+
+SCALAR_FORMATS = "?bBhHiIlLqQefd"
+
+
+class SharedField(metaclass=abc.ABCMeta):
+    """Typed field declared as a common state class attribute.
+
+    Values are stored in the shared memory segment of the common state,
+    so threads and processes of all nodes see the same value.
+    A field expects a single writer, readers retry while a write is
+    in progress and never observe torn values.
+    """
+
+    nbytes = 0
+
+    def __init__(self):
+        self.name = ""
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+    def initialize(self, buf: memoryview):
+        pass
+
+    @abc.abstractmethod
+    def load(self, buf: memoryview) -> Any:
+        pass
+
+    @abc.abstractmethod
+    def store(self, buf: memoryview, value: Any):
+        pass
+
+    def __get__(self, state: Any, owner: Any = None) -> Any:
+        if state is None:
+            return self
+        return state._shared_fields.read(self)
+
+    def __set__(self, state: Any, value: Any):
+        state._shared_fields.write(self, value)
+
+
+class SharedScalar(SharedField):
+    def __init__(self, format: str = "d", default: Any = 0):
+        super().__init__()
+        if len(format) != 1 or format not in SCALAR_FORMATS:
+            raise ValueError(f"Scalar format must be one of '{SCALAR_FORMATS}', "
+                             f"got '{format}'")
+        self.format = "=" + format
+        self.default = default
+        self.nbytes = struct.calcsize(self.format)
+
+    def initialize(self, buf: memoryview):
+        self.store(buf, self.default)
+
+    def load(self, buf: memoryview) -> Any:
+        return struct.unpack_from(self.format, buf)[0]
+
+    def store(self, buf: memoryview, value: Any):
+        buf[:] = struct.pack(self.format, value)
+
+
+class SharedStruct(SharedField):
+    """Record of scalars, read as a dict and written from a mapping"""
+
+    def __init__(self, **formats: str):
+        super().__init__()
+        if not formats:
+            raise ValueError("Struct must have at least one field")
+        for format in formats.values():
+            if len(format) != 1 or format not in SCALAR_FORMATS:
+                raise ValueError(f"Struct field formats must be one of "
+                                 f"'{SCALAR_FORMATS}', got '{format}'")
+        self.fields = tuple(formats)
+        self.format = "=" + "".join(formats.values())
+        self.nbytes = struct.calcsize(self.format)
+
+    def load(self, buf: memoryview) -> Dict[str, Any]:
+        return dict(zip(self.fields, struct.unpack_from(self.format, buf)))
+
+    def store(self, buf: memoryview, value: Mapping[str, Any]):
+        buf[:] = struct.pack(self.format, *(value[field] for field in self.fields))
+
+
+class SharedArray(SharedField):
+    """NumPy array of a fixed shape and dtype, reads return copies"""
+
+    def __init__(self, shape: Tuple[int, ...], dtype: Any = "float64"):
+        super().__init__()
+        if np is None:
+            raise ImportError("SharedArray requires numpy")
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.nbytes = int(np.prod(self.shape)) * self.dtype.itemsize
+
+    def _view(self, buf: memoryview) -> Any:
+        return np.ndarray(self.shape, dtype=self.dtype, buffer=buf)
+
+    def load(self, buf: memoryview) -> Any:
+        return self._view(buf).copy()
+
+    def store(self, buf: memoryview, value: Any):
+        self._view(buf)[...] = value
+
+
+def collect_shared_fields(state_class: type) -> Dict[str, SharedField]:
+    fields: Dict[str, SharedField] = dict()
+    for klass in reversed(state_class.__mro__):
+        for name, value in vars(klass).items():
+            if isinstance(value, SharedField):
+                fields[name] = value
+    return fields
+
+
+class SharedFields:
+    """Shared memory segment with a seqlocked slot for each field"""
+
+    def __init__(self, fields: Dict[str, SharedField]):
+        self.fields = fields
+        self._offsets: Dict[str, int] = dict()
+        size = 0
+        for name, field in fields.items():
+            self._offsets[name] = size
+            # every slot starts at its own cache line
+            size += align(SeqLock.nbytes + field.nbytes)
+        self._block = SharedMemoryBlock(size)
+        self._locks: Dict[str, SeqLock] = dict()
+        self._values: Dict[str, memoryview] = dict()
+        self._build()
+        for name, field in fields.items():
+            field.initialize(self._values[name])
+
+    def _build(self):
+        buf = self._block.buf
+        for name, field in self.fields.items():
+            offset = self._offsets[name]
+            self._locks[name] = SeqLock(buf[offset:offset + SeqLock.nbytes])
+            offset += SeqLock.nbytes
+            self._values[name] = buf[offset:offset + field.nbytes]
+
+    def read(self, field: SharedField) -> Any:
+        buf = self._values[field.name]
+        try:
+            return self._locks[field.name].read(lambda: field.load(buf))
+        except WriterDiedError as error:
+            raise WriterDiedError(f"Shared field '{field.name}' is left locked: "
+                                  f"{error}") from None
+
+    def write(self, field: SharedField, value: Any):
+        with self._locks[field.name].write():
+            field.store(self._values[field.name], value)
+
+    def __getstate__(self) -> dict:
+        return {"fields": self.fields, "offsets": self._offsets, "block": self._block}
+
+    def __setstate__(self, state: dict):
+        self.fields = state["fields"]
+        self._offsets = state["offsets"]
+        self._block = state["block"]
+        self._locks = dict()
+        self._values = dict()
+        self._build()
@@ -0,0 +1,327 @@
+import abc
+import time
+import queue
+import pickle
+import multiprocessing
+from multiprocessing.context import BaseContext
+from typing import Optional, Dict, List, Tuple, Union, Any
+
+from rosny.abstract import BaseNode
+from rosny.shared import SharedMemoryBlock
+from rosny.slab import SlabQueue
+from rosny.serializers import Serializer, get_serializer
+from rosny.trigger import Trigger, TriggerSource
+
+EDGE_POLICIES = ("block", "drop_oldest", "drop_newest", "latest_only")
+EDGE_KINDS = ("process", "thread", "shared")
+_PUTS = 0
+_GETS = 1
+_DROPS = 2
+_SERIALIZE_NS = 3
+_SERIALIZES = 4
+_DESERIALIZE_NS = 5
+
+
+class Edge(TriggerSource):
+    """Bounded channel between an output and an input port.
+
+    On a full edge `block` waits for a free place, `drop_oldest` evicts
+    the oldest item, `drop_newest` discards the new item and `latest_only`
+    keeps just the last item. Counters are approximate with several writers.
+    A `shared` edge moves large buffers through shared memory slabs.
+    With a serializer items cross the edge as bytes, serialize and
+    deserialize times are counted. Triggers are notified on every put,
+    `process` and `shared` edges pass items through a feeder thread,
+    so a triggered reader should get them with a timeout.
+    """
+
+    def __init__(self,
+                 capacity: int = 1,
+                 policy: str = "block",
+                 kind: str = "process",
+                 serializer: Union[str, Serializer, None] = None,
+                 mp_context: Optional[BaseContext] = None):
+        if policy not in EDGE_POLICIES:
+            raise ValueError(f"Edge policy must be one of {EDGE_POLICIES}, "
+                             f"got '{policy}'")
+        if kind not in EDGE_KINDS:
+            raise ValueError(f"Edge kind must be one of {EDGE_KINDS}, got '{kind}'")
+        if capacity < 1:
+            raise ValueError(f"Edge capacity must be positive, got {capacity}")
+        if policy == "latest_only":
+            capacity = 1
+        self.capacity = capacity
+        self.policy = policy
+        self.kind = kind
+        self.serializer = None if serializer is None else get_serializer(serializer)
+        self._queue: Any
+        context = mp_context or multiprocessing.get_context()
+        if kind == "process":
+            self._queue = context.Queue(capacity)
+        elif kind == "shared":
+            self._queue = SlabQueue(capacity, mp_context=context)
+        else:
+            self._queue = queue.Queue(capacity)
+        self._block = SharedMemoryBlock(6 * 8)
+        self._counters = self._block.buf.cast('q')
+        self._triggers = []
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def puts(self) -> int:
+        return self._counters[_PUTS]
+
+    @property
+    def gets(self) -> int:
+        return self._counters[_GETS]
+
+    @property
+    def drops(self) -> int:
+        return self._counters[_DROPS]
+
+    @property
+    def serialize_time(self) -> float:
+        serializes = self._counters[_SERIALIZES]
+        return self._counters[_SERIALIZE_NS] / serializes * 1e-9 if serializes else 0.
+
+    @property
+    def deserialize_time(self) -> float:
+        gets = self._counters[_GETS]
+        return self._counters[_DESERIALIZE_NS] / gets * 1e-9 if gets else 0.
+
+    def _dumps(self, item: Any) -> Any:
+        start = time.perf_counter_ns()
+        data = self.serializer.dumps(item)  # type: ignore
+        self._counters[_SERIALIZE_NS] += time.perf_counter_ns() - start
+        self._counters[_SERIALIZES] += 1
+        if self.kind == "shared":
+            return pickle.PickleBuffer(data)  # goes through a slab
+        return data
+
+    def _loads(self, data: Any) -> Any:
+        start = time.perf_counter_ns()
+        item = self.serializer.loads(data)  # type: ignore
+        self._counters[_DESERIALIZE_NS] += time.perf_counter_ns() - start
+        return item
+
+    def put(self, item: Any, timeout: Optional[float] = None):
+        if self.serializer is not None:
+            item = self._dumps(item)
+        if self.policy == "block":
+            self._queue.put(item, timeout=timeout)
+        elif self.policy == "drop_newest":
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                self._counters[_DROPS] += 1
+                return
+        else:
+            while True:
+                try:
+                    self._queue.put_nowait(item)
+                    break
+                except queue.Full:
+                    try:
+                        self._queue.get_nowait()
+                        self._counters[_DROPS] += 1
+                    except queue.Empty:
+                        pass
+        self._counters[_PUTS] += 1
+        self.notify_triggers()
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        item = self._queue.get(timeout=timeout)
+        if self.serializer is not None:
+            item = self._loads(item)
+        self._counters[_GETS] += 1
+        return item
+
+    def get_nowait(self) -> Any:
+        item = self._queue.get_nowait()
+        if self.serializer is not None:
+            item = self._loads(item)
+        self._counters[_GETS] += 1
+        return item
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_counters"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._counters = self._block.buf.cast('q')
+
+
+class Port(metaclass=abc.ABCMeta):
+    """Typed port declared as a loop node class attribute.
+
+    Accessed on a node instance it returns a port bound to that node,
+    which is connected to edges by `ComposeNode.connect`.
+    """
+
+    def __init__(self, dtype: type = object):
+        self.dtype = dtype
+        self.name = ""
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+    @abc.abstractmethod
+    def bind(self) -> Any:
+        pass
+
+    def __get__(self, node: Any, owner: Optional[type] = None) -> Any:
+        if node is None:
+            return self
+        bound = self.bind()
+        node.__dict__[self.name] = bound  # shadows the port from now on
+        return bound
+
+
+class BoundInput(TriggerSource):
+    """Input port of a node, triggers added before the port is connected
+    are passed to the edge"""
+
+    def __init__(self, port: 'Input'):
+        self.port = port
+        self.edge: Optional[Edge] = None
+        self._triggers = []
+
+    def connect(self, edge: Edge):
+        self.edge = edge
+        for trigger in self._triggers:
+            edge.add_trigger(trigger)
+
+    def add_trigger(self, trigger: Trigger):
+        super().add_trigger(trigger)
+        if self.edge is not None:
+            self.edge.add_trigger(trigger)
+
+    def notify_triggers(self):
+        if self.edge is not None:
+            self.edge.notify_triggers()
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        if self.edge is None:
+            raise RuntimeError(f"Input port '{self.port.name}' is not connected")
+        return self.edge.get(timeout=timeout)
+
+    def get_nowait(self) -> Any:
+        if self.edge is None:
+            raise RuntimeError(f"Input port '{self.port.name}' is not connected")
+        return self.edge.get_nowait()
+
+
+class BoundOutput:
+    def __init__(self, port: 'Output'):
+        self.port = port
+        self.edges: List[Edge] = []
+
+    def put(self, item: Any, timeout: Optional[float] = None):
+        for edge in self.edges:
+            edge.put(item, timeout=timeout)
+
+
+class Input(Port):
+    def bind(self) -> BoundInput:
+        return BoundInput(self)
+
+
+class Output(Port):
+    def bind(self) -> BoundOutput:
+        return BoundOutput(self)
+
+
+def serialization_stats(node: Any) -> Dict[str, float]:
+    """Mean serialize time of output edges and deserialize time of input edges"""
+    serialize_ns = serializes = deserialize_ns = gets = 0
+    for value in vars(node).values():
+        if isinstance(value, BoundOutput):
+            for edge in value.edges:
+                serialize_ns += edge._counters[_SERIALIZE_NS]
+                serializes += edge._counters[_SERIALIZES]
+        elif isinstance(value, BoundInput) and value.edge is not None:
+            deserialize_ns += value.edge._counters[_DESERIALIZE_NS]
+            gets += value.edge._counters[_GETS]
+    return {
+        "serialize_time": serialize_ns / serializes * 1e-9 if serializes else 0.,
+        "deserialize_time": deserialize_ns / gets * 1e-9 if gets else 0.,
+    }
+
+
+class Graph:
+    """Edges between ports of nodes with their runtime stats"""
+
+    def __init__(self):
+        self.connections: List[Tuple[BaseNode, BoundOutput,
+                                     BaseNode, BoundInput, Edge]] = []
+        self._samples: Dict[int, Tuple[float, int, int, int]] = dict()
+
+    def connect(self,
+                source: BaseNode,
+                output: BoundOutput,
+                target: BaseNode,
+                input_: BoundInput,
+                capacity: int = 1,
+                policy: str = "block",
+                kind: str = "process",
+                serializer: Union[str, Serializer, None] = None,
+                mp_context: Optional[BaseContext] = None) -> Edge:
+        if not isinstance(output, BoundOutput) or not isinstance(input_, BoundInput):
+            raise TypeError("Edges connect an output port to an input port")
+        if not issubclass(output.port.dtype, input_.port.dtype):
+            raise TypeError(f"Output type {output.port.dtype.__name__} of "
+                            f"'{output.port.name}' is not compatible with input "
+                            f"type {input_.port.dtype.__name__} "
+                            f"of '{input_.port.name}'")
+        if input_.edge is not None:
+            raise ValueError(f"Input port '{input_.port.name}' is already connected")
+        edge = Edge(capacity=capacity, policy=policy, kind=kind,
+                    serializer=serializer, mp_context=mp_context)
+        output.edges.append(edge)
+        input_.connect(edge)
+        self.connections.append((source, output, target, input_, edge))
+        for node in (source, target):
+            profiler = getattr(node, "profiler", None)
+            if profiler is not None and serialization_stats not in profiler.stats_hooks:
+                profiler.stats_hooks.append(serialization_stats)
+        return edge
+
+    def topology(self) -> List[Dict[str, Any]]:
+        return [
+            {"source": f"{source.name}.{output.port.name}",
+             "target": f"{target.name}.{input_.port.name}",
+             "dtype": output.port.dtype.__name__,
+             "capacity": edge.capacity,
+             "policy": edge.policy,
+             "kind": edge.kind,
+             "serializer": edge.serializer.name if edge.serializer else ""}
+            for source, output, target, input_, edge in self.connections
+        ]
+
+    def stats(self) -> List[Dict[str, Any]]:
+        # Rates are averaged since the previous call
+        now = time.monotonic()
+        stats = self.topology()
+        for link, connection in zip(stats, self.connections):
+            edge = connection[-1]
+            puts, gets, drops = edge.puts, edge.gets, edge.drops
+            prev_time, prev_puts, prev_gets, prev_drops = self._samples.get(
+                id(edge), (now, puts, gets, drops)
+            )
+            elapsed = now - prev_time
+            link["depth"] = edge.depth
+            link["puts"] = puts
+            link["gets"] = gets
+            link["drops"] = drops
+            link["put_rate"] = (puts - prev_puts) / elapsed if elapsed else 0.0
+            link["get_rate"] = (gets - prev_gets) / elapsed if elapsed else 0.0
+            link["drop_rate"] = (drops - prev_drops) / elapsed if elapsed else 0.0
+            link["serialize_time"] = edge.serialize_time
+            link["deserialize_time"] = edge.deserialize_time
+            self._samples[id(edge)] = (now, puts, gets, drops)
+        return stats
@@ -0,0 +1,105 @@
+import math
+from typing import Optional
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of durations in seconds with fixed memory.
+
+    Bucket bounds are the same for every histogram, so histograms collected
+    over different intervals or in different processes can be merged.
+    """
+
+    min_value = 1e-6
+    buckets_per_octave = 4
+    num_buckets = 128  # from 1 microsecond to about an hour
+    _count = num_buckets
+    _total = num_buckets + 1
+    _max = num_buckets + 2
+    size = num_buckets + 3
+    nbytes = size * 8
+
+    def __init__(self, buffer: Optional[memoryview] = None):
+        if buffer is None:
+            buffer = memoryview(bytearray(self.nbytes))
+        self._data = buffer.cast('B').cast('d')
+
+    @classmethod
+    def bucket_index(cls, value: float) -> int:
+        if value < cls.min_value:
+            return 0
+        index = 1 + int(math.log2(value / cls.min_value) * cls.buckets_per_octave)
+        return min(index, cls.num_buckets - 1)
+
+    @classmethod
+    def bucket_bound(cls, index: int) -> float:
+        return cls.min_value * 2 ** (index / cls.buckets_per_octave)
+
+    @property
+    def count(self) -> int:
+        return int(self._data[self._count])
+
+    @property
+    def total(self) -> float:
+        return self._data[self._total]
+
+    @property
+    def mean(self) -> float:
+        count = self._data[self._count]
+        return self._data[self._total] / count if count else 0.0
+
+    @property
+    def max(self) -> float:
+        return self._data[self._max]
+
+    def add(self, value: float):
+        data = self._data
+        data[self.bucket_index(value)] += 1
+        data[self._count] += 1
+        data[self._total] += value  # type: ignore
+        if value > data[self._max]:
+            data[self._max] = value  # type: ignore
+
+    def percentile(self, q: float) -> float:
+        data = self._data
+        count = data[self._count]
+        if not count:
+            return 0.0
+        rank = max(math.ceil(q / 100 * count), 1)
+        cumulative = 0.0
+        for index in range(self.num_buckets):
+            cumulative += data[index]
+            if cumulative >= rank:
+                return min(self.bucket_bound(index), data[self._max])
+        return data[self._max]
+
+    def merge(self, other: 'LatencyHistogram'):
+        data, other_data = self._data, other._data
+        for index in range(self._max):
+            data[index] += other_data[index]
+        data[self._max] = max(data[self._max], other_data[self._max])
+
+    def reset(self):
+        data = self._data
+        for index in range(self.size):
+            data[index] = 0.0
+
+    def copy(self) -> 'LatencyHistogram':
+        histogram = LatencyHistogram()
+        histogram.merge(self)
+        return histogram
+
+    def summary(self) -> dict:
+        return {
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+    def __getstate__(self) -> dict:
+        return {"data": self._data.tolist()}
+
+    def __setstate__(self, state: dict):
+        self.__init__()  # type: ignore
+        for index, value in enumerate(state["data"]):
+            self._data[index] = value
@@ -1,9 +1,14 @@
 import abc
-from typing import Optional, Union, Any
+import time
+from typing import Optional, Callable, List, Union, Any
 
 from rosny.state import CommonState
 from rosny.abstract import BaseNode
+from rosny.control import ControlBlock, ControlSlot
+from rosny.placement import Placement, read_placement
+from rosny.restart import RestartPolicy
 from rosny.timing import LoopRateManager, Profiler
+from rosny.trigger import Trigger
 
 
 class LoopNode(BaseNode, metaclass=abc.ABCMeta):
@@ -11,31 +16,150 @@ class LoopNode(BaseNode, metaclass=abc.ABCMeta):
                  loop_rate: Optional[float] = None,
                  min_sleep: float = 1e-9,
                  profile_interval: Optional[float] = None,
-                 daemon: bool = False):
+                 daemon: bool = False,
+                 placement: Optional[Placement] = None,
+                 restart_policy: Optional[RestartPolicy] = None):
         super().__init__()
         self.daemon = daemon
+        self.placement = placement
+        self.restart_policy = restart_policy
         self._driver: Optional[Any] = None
         self.rate_manager = LoopRateManager(loop_rate=loop_rate,
                                             min_sleep=min_sleep)
-        self.profiler = Profiler(node=self, interval=profile_interval)
+        self.profiler = Profiler(node=self,
+                                 interval=profile_interval,
+                                 rate_manager=self.rate_manager)
+        self._control: Optional[ControlSlot] = None
+        self.trigger: Optional[Trigger] = None
+        self._trigger_inputs: Optional[List[Any]] = None
+        self.trigger_timeout: Optional[float] = None
+        self._trigger_seq = 0
+        self._reconfigure = False
+        self.rate_manager.on_change = self.reconfigure
+        self.profiler.on_change = self.reconfigure
+
+    @property
+    def control(self) -> ControlSlot:
+        # Compose nodes assign slots of a shared block at compile,
+        # a standalone node allocates its own slot on first use
+        if self._control is None:
+            self._control = ControlBlock(1).slot(0)
+        return self._control
+
+    @control.setter
+    def control(self, value: ControlSlot):
+        self._control = value
 
     @abc.abstractmethod
     def work(self):
         pass
 
+    def trigger_on(self, *inputs: Any):
+        # The trigger is created at compile in the context of the start method,
+        # inputs must be declared before nodes that write to them are started
+        if self._trigger_inputs is None:
+            self._trigger_inputs = []
+        self._trigger_inputs.extend(inputs)
+        if self.compiled():
+            self._compile_trigger()
+        self.reconfigure()
+
+    def _compile_trigger(self):
+        if self._trigger_inputs is None:
+            return
+        if self.trigger is None:
+            self.trigger = Trigger(self.mp_context)
+        for input_ in self._trigger_inputs:
+            input_.add_trigger(self.trigger)
+        self._trigger_inputs.clear()
+
+    def reconfigure(self):
+        # The running loop picks a loop body for the current features
+        self._reconfigure = True
+
+    def _loop_body(self) -> Callable[[], None]:
+        self._reconfigure = False
+        if (self.trigger is None
+                and self.rate_manager.loop_rate is None
+                and not self.rate_manager.min_sleep
+                and self.profiler.interval is None):
+            return self._bare_loop
+        return self._full_loop
+
+    def _bare_loop(self):
+        stopped = self.stopped
+        work = self.work
+        beat = self.control.beat
+        while not (self._reconfigure or stopped()):
+            work()
+            beat()
+
+    def _full_loop(self):
+        while not (self._reconfigure or self.stopped()):
+            wait_time = 0.
+            if self.trigger is not None:
+                wait_start = time.perf_counter()
+                self._trigger_seq = self.trigger.wait(self._trigger_seq,
+                                                      self.trigger_timeout)
+                wait_time = time.perf_counter() - wait_start
+                if self.stopped():
+                    break
+            self.work()
+            self.rate_manager.timing()
+            self.profiler.profile(self.rate_manager.sleep_time + wait_time)
+            self.control.beat()
+
+    def _apply_placement(self):
+        if self.placement is not None:
+            self.placement.apply(self.logger)
+        self.profiler.placement = read_placement()
+
     def loop(self):
-        try:
-            self.on_loop_begin()
-            self.rate_manager.reset()
-            self.profiler.reset(self)
-            while not self.stopped():
-                self.work()
-                self.rate_manager.timing()
-                self.profiler.profile()
-        except (Exception, KeyboardInterrupt) as exception:
-            self.on_catch_exception(exception)
-        finally:
-            self.on_loop_end()
+        if self.restart_policy is not None:
+            self.restart_policy.reset()
+        restart_delay: Optional[float] = None
+        while True:
+            try:
+                self._apply_placement()
+                self.on_loop_begin()
+                self.rate_manager.reset()
+                self.profiler.reset(self)
+                self.control.reset()
+                self._trigger_seq = 0
+                while not self.stopped():
+                    self._loop_body()()
+            except (Exception, KeyboardInterrupt) as exception:
+                restart_delay = self._restart_delay(exception)
+                if restart_delay is None:
+                    self.on_catch_exception(exception)
+            finally:
+                self.on_loop_end()
+            if restart_delay is None or not self._wait_restart(restart_delay):
+                break
+            restart_delay = None
+
+    def _restart_delay(self, exception: BaseException) -> Optional[float]:
+        if self.restart_policy is None or not isinstance(exception, Exception):
+            return None
+        delay = self.restart_policy.next_delay()
+        if delay is None:
+            self.logger.error(f"Restart limit {self.restart_policy.max_restarts} "
+                              f"in {self.restart_policy.window} seconds is reached")
+        else:
+            self.logger.exception(exception)
+            self.logger.warning(f"Restarting loop in {delay:.3g} seconds")
+        return delay
+
+    def _wait_restart(self, delay: float) -> bool:
+        # Sleeps before a restart, returns False if the node is stopped meanwhile
+        deadline = time.monotonic() + delay
+        while not self.stopped():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.control.restart()
+                return True
+            time.sleep(min(remaining, 0.05))
+        return False
 
     def on_catch_exception(self, exception: Union[Exception, KeyboardInterrupt]):
         self.logger.exception(exception)
@@ -67,6 +191,7 @@ class LoopNode(BaseNode, metaclass=abc.ABCMeta):
         super().compile(common_state=common_state,
                         name=name,
                         handle_signals=handle_signals)
+        self._compile_trigger()
         self.on_compile_end()
 
     def start(self):
@@ -88,6 +213,8 @@ class LoopNode(BaseNode, metaclass=abc.ABCMeta):
         if not self.stopped():
             self.on_stop_begin()
             self._stop_driver()
+            if self.trigger is not None:
+                self.trigger.notify()
             self.on_stop_end()
             self._actions_after_stop()
             self.logger.info("Node stopped")
@@ -104,5 +231,8 @@ class LoopNode(BaseNode, metaclass=abc.ABCMeta):
         else:
             self.logger.error("Node is already joined")
 
+    def stopped(self) -> bool:
+        return self._control is None or self._control.stopped
+
     def joined(self) -> bool:
         return self._driver is None
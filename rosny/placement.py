@@ -0,0 +1,81 @@
+import os
+import logging
+from typing import Optional, Iterable, Dict, List
+
+SCHED_POLICIES = ("other", "fifo", "rr")
+
+
+def _policy_value(policy: str) -> int:
+    return getattr(os, f"SCHED_{policy.upper()}")
+
+
+def available_cpus() -> List[int]:
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return list(range(os.cpu_count() or 1))
+
+
+def read_placement() -> Dict[str, float]:
+    """Placement of the calling thread as profile stats values.
+
+    The affinity is reported as the number of allowed CPUs with the first
+    and the last of them, a bitmask doesn't fit a float on large machines.
+    """
+    placement = {"cpu_count": float("nan"),
+                 "cpu_first": float("nan"),
+                 "cpu_last": float("nan"),
+                 "nice": float("nan"),
+                 "sched_policy": float("nan"),
+                 "sched_priority": float("nan")}
+    try:
+        cpus = os.sched_getaffinity(0)
+        placement["cpu_count"] = len(cpus)
+        placement["cpu_first"] = min(cpus)
+        placement["cpu_last"] = max(cpus)
+        placement["nice"] = os.getpriority(os.PRIO_PROCESS, 0)
+        placement["sched_policy"] = os.sched_getscheduler(0)
+        placement["sched_priority"] = os.sched_getparam(0).sched_priority
+    except (AttributeError, OSError):
+        pass
+    return placement
+
+
+class Placement:
+    """CPU affinity, nice value and scheduling policy of a node loop.
+
+    Applied to the thread that runs the loop, Linux schedules threads
+    individually. Settings that are not permitted are logged and skipped.
+    """
+
+    def __init__(self,
+                 cpus: Optional[Iterable[int]] = None,
+                 nice: Optional[int] = None,
+                 policy: Optional[str] = None,
+                 priority: int = 0):
+        if policy is not None and policy not in SCHED_POLICIES:
+            raise ValueError(f"Scheduling policy must be one of {SCHED_POLICIES}, "
+                             f"got '{policy}'")
+        self.cpus = None if cpus is None else sorted(cpus)
+        self.nice = nice
+        self.policy = policy
+        self.priority = priority
+
+    def apply(self, logger: logging.Logger):
+        if self.cpus is not None:
+            try:
+                os.sched_setaffinity(0, self.cpus)
+            except (AttributeError, OSError) as error:
+                logger.warning(f"Failed to set CPU affinity {self.cpus}: {error}")
+        if self.nice is not None:
+            try:
+                os.setpriority(os.PRIO_PROCESS, 0, self.nice)
+            except (AttributeError, OSError) as error:
+                logger.warning(f"Failed to set nice value {self.nice}: {error}")
+        if self.policy is not None:
+            try:
+                os.sched_setscheduler(0, _policy_value(self.policy),
+                                      os.sched_param(self.priority))
+            except (AttributeError, OSError) as error:
+                logger.warning(f"Failed to set scheduling policy {self.policy} "
+                               f"with priority {self.priority}: {error}")
@@ -0,0 +1,224 @@
+import queue
+import threading
+import multiprocessing
+from typing import Optional, Callable, Dict, List, Any
+
+from rosny.loop import LoopNode
+from rosny.thread import ThreadNode
+from rosny.process import ProcessNode
+from rosny.compose import ComposeNode
+
+POOL_DRIVERS = ("process", "thread")
+
+
+class PoolLoad:
+    """Number of items in flight per replica of a pool"""
+
+    def __init__(self, replicas: int, max_pending: int):
+        self.max_pending = max_pending
+        self.pending = [0] * replicas
+        self.dispatched = 0
+        self.collected = 0
+        self.condition = threading.Condition()
+
+    def reset(self):
+        with self.condition:
+            self.pending = [0] * len(self.pending)
+            self.dispatched = 0
+            self.collected = 0
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[int]:
+        """Index of the least loaded replica with a free place"""
+        with self.condition:
+            if not self.condition.wait_for(
+                    lambda: min(self.pending) < self.max_pending, timeout=timeout):
+                return None
+            index = min(range(len(self.pending)), key=self.pending.__getitem__)
+            self.pending[index] += 1
+            return index
+
+    def release(self, index: int, collected: bool = True):
+        with self.condition:
+            self.pending[index] -= 1
+            self.collected += int(collected)
+            self.condition.notify()
+
+
+class _ReplicaMixin:
+    def __init__(self,
+                 handler_factory: Callable[[], Callable[[Any], Any]],
+                 index: int,
+                 input_queue: Any,
+                 result_queue: Any,
+                 timeout: float):
+        super().__init__()  # type: ignore
+        self.handler_factory = handler_factory
+        self.index = index
+        self.input_queue = input_queue
+        self.result_queue = result_queue
+        self.timeout = timeout
+        self.handler: Optional[Callable[[Any], Any]] = None
+
+    def on_loop_begin(self):
+        # The handler is created in the replica, so it can hold unpicklable resources
+        self.handler = self.handler_factory()
+
+    def work(self):
+        try:
+            seq, item = self.input_queue.get(timeout=self.timeout)
+        except queue.Empty:
+            return
+        try:
+            result = self.handler(item)
+        except Exception:
+            # The collector must not wait for the result of a failed item
+            self.result_queue.put((seq, self.index, False, None))
+            raise
+        self.result_queue.put((seq, self.index, True, result))
+
+    def on_loop_end(self):
+        self.handler = None
+
+
+class ThreadReplica(_ReplicaMixin, ThreadNode):
+    pass
+
+
+class ProcessReplica(_ReplicaMixin, ProcessNode):
+    pass
+
+
+class PoolDispatcher(ThreadNode):
+    def __init__(self,
+                 load: PoolLoad,
+                 input_queue: Any,
+                 replica_queues: List[Any],
+                 timeout: float):
+        super().__init__()
+        self.load = load
+        self.input_queue = input_queue
+        self.replica_queues = replica_queues
+        self.timeout = timeout
+
+    def work(self):
+        index = self.load.acquire(timeout=self.timeout)
+        if index is None:
+            return
+        try:
+            item = self.input_queue.get(timeout=self.timeout)
+        except queue.Empty:
+            self.load.release(index, collected=False)
+            return
+        seq = self.load.dispatched
+        self.load.dispatched += 1
+        self.replica_queues[index].put((seq, item))
+
+
+class PoolCollector(ThreadNode):
+    def __init__(self,
+                 load: PoolLoad,
+                 result_queue: Any,
+                 output_queue: Any,
+                 ordered: bool,
+                 timeout: float):
+        super().__init__()
+        self.load = load
+        self.result_queue = result_queue
+        self.output_queue = output_queue
+        self.ordered = ordered
+        self.timeout = timeout
+        self._next_seq = 0
+        self._reorder: Dict[int, Any] = dict()
+
+    def reset(self):
+        # Sequence numbers restart with the dispatcher only, a restart of
+        # the collector loop alone keeps waiting for the next dispatched item
+        self._next_seq = 0
+        self._reorder.clear()
+
+    def work(self):
+        try:
+            seq, index, success, result = self.result_queue.get(timeout=self.timeout)
+        except queue.Empty:
+            return
+        self.load.release(index, collected=success)
+        if not self.ordered:
+            if success:
+                self.output_queue.put(result)
+            return
+        self._reorder[seq] = (success, result)
+        while self._next_seq in self._reorder:
+            success, result = self._reorder.pop(self._next_seq)
+            if success:
+                self.output_queue.put(result)
+            self._next_seq += 1
+
+
+class PoolNode(ComposeNode):
+    """Replicas of one stage that share an input and an output queue.
+
+    `handler_factory` is called in every replica once its loop begins and
+    must return a callable that turns an input item into an output item,
+    so replicas are plain loop nodes driven by the pool and not arbitrary
+    user nodes. Items go to the replica with the fewest items in flight,
+    at most `max_pending` per replica. With `ordered` outputs keep the input
+    order, an item whose handler raised is skipped and produces no output.
+    """
+
+    def __init__(self,
+                 handler_factory: Callable[[], Callable[[Any], Any]],
+                 replicas: int = 2,
+                 driver: str = "process",
+                 input_queue: Optional[Any] = None,
+                 output_queue: Optional[Any] = None,
+                 ordered: bool = False,
+                 max_pending: int = 2,
+                 timeout: float = 0.1,
+                 start_method: Optional[str] = None):
+        super().__init__(start_method=start_method)
+        if driver not in POOL_DRIVERS:
+            raise ValueError(f"Driver must be one of {POOL_DRIVERS}, got '{driver}'")
+        if replicas < 1:
+            raise ValueError(f"Number of replicas must be positive, got {replicas}")
+        replica_class = ProcessReplica if driver == "process" else ThreadReplica
+        context = self.mp_context or multiprocessing.get_context()
+        if input_queue is None:
+            input_queue = context.Queue()
+        if output_queue is None:
+            output_queue = context.Queue()
+        self.driver = driver
+        self.input_queue = input_queue
+        self.output_queue = output_queue
+        self.load = PoolLoad(replicas, max_pending)
+        self.dispatcher = PoolDispatcher(self.load,
+                                         self.input_queue,
+                                         [],
+                                         timeout)
+        self.collector = PoolCollector(self.load,
+                                       None,
+                                       self.output_queue,
+                                       ordered,
+                                       timeout)
+        self.replicas: List[LoopNode] = []
+        for index in range(replicas):
+            replica = replica_class(handler_factory, index, None, None, timeout)
+            setattr(self, f"replica{index}", replica)
+            self.replicas.append(replica)
+
+    def on_compile_begin(self):
+        # Internal queues are created once the start method of a parent
+        # compose node is known
+        queue_class = queue.Queue
+        if self.driver == "process":
+            queue_class = (self.mp_context or multiprocessing.get_context()).Queue
+        result_queue = queue_class()
+        self.dispatcher.replica_queues = [queue_class() for _ in self.replicas]
+        self.collector.result_queue = result_queue
+        for replica, replica_queue in zip(self.replicas,
+                                          self.dispatcher.replica_queues):
+            replica.input_queue = replica_queue  # type: ignore
+            replica.result_queue = result_queue  # type: ignore
+
+    def on_start_begin(self):
+        self.load.reset()
+        self.collector.reset()
@@ -1,8 +1,14 @@
 import abc
+import time
+import signal
+import faulthandler
+import multiprocessing
 from typing import Optional
-from multiprocessing import Process, Value
+from multiprocessing.process import BaseProcess
 
 from rosny.loop import LoopNode
+from rosny.placement import Placement
+from rosny.restart import RestartPolicy
 from rosny.utils import setup_logger
 
 
@@ -11,28 +17,53 @@ class ProcessNode(LoopNode, metaclass=abc.ABCMeta):
                  loop_rate: Optional[float] = None,
                  min_sleep: float = 1e-9,
                  profile_interval: Optional[float] = None,
-                 daemon: bool = False):
+                 daemon: bool = False,
+                 placement: Optional[Placement] = None,
+                 restart_policy: Optional[RestartPolicy] = None):
         super().__init__(loop_rate=loop_rate,
                          min_sleep=min_sleep,
                          profile_interval=profile_interval,
-                         daemon=daemon)
-        self._driver: Optional[Process] = None
-        self._stopped = Value('i', 1)
+                         daemon=daemon,
+                         placement=placement,
+                         restart_policy=restart_policy)
+        self._driver: Optional[BaseProcess] = None
+        # Set by the watchdog of the parent compose node
+        self.dump_stacks = False
+        self._start_time: Optional[float] = None
+
+    @property
+    def startup_time(self) -> Optional[float]:
+        # Time from the driver start to the loop start in the child process
+        if self._start_time is None or self.control.started < self._start_time:
+            return None
+        return self.control.started - self._start_time
 
     def loop(self):
+        self.control.started = time.monotonic()
         self.logger = setup_logger(self.name)  # necessary for spawn and forkserver
+        startup_time = self.startup_time
+        if startup_time is None:
+            self.logger.info("Process started")
+        else:
+            self.logger.info(f"Process started in {startup_time:.3g} seconds")
+        if self.dump_stacks and hasattr(signal, "SIGUSR1"):
+            # The watchdog requests stack dumps of stalled nodes with the signal,
+            # a handler installed by user code is still called
+            faulthandler.register(signal.SIGUSR1, all_threads=True, chain=True)
         super().loop()
 
     def _start_driver(self):
-        self._driver = Process(target=self.loop,
-                               name=self.name,
-                               daemon=self.daemon)
+        self._start_time = time.monotonic()
+        context = self.mp_context or multiprocessing.get_context()
+        self._driver = context.Process(target=self.loop,
+                                       name=self.name,
+                                       daemon=self.daemon)
         self.logger.info(f"Starting process {self.name}")
-        self._stopped.value = 0
+        self.control.stopped = False
         self._driver.start()
 
     def _stop_driver(self):
-        self._stopped.value = 1
+        self.control.stopped = True
 
     def _join_driver(self, timeout: Optional[float] = None):
         if self._driver is not None:
@@ -41,6 +72,3 @@ class ProcessNode(LoopNode, metaclass=abc.ABCMeta):
                 self.logger.error(f"Process '{self._driver}' join timeout {timeout}")
             else:
                 self._driver = None
-
-    def stopped(self) -> bool:
-        return self._stopped.value  # type: ignore
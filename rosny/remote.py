@@ -0,0 +1,684 @@
+import os
+import hmac
+import time
+import zlib
+import queue
+import struct
+import socket
+import selectors
+import threading
+import multiprocessing
+from multiprocessing import AuthenticationError
+from typing import Optional, Dict, List, Tuple, Union, Any
+
+from rosny.serializers import Serializer, get_serializer
+from rosny.thread import ThreadNode
+from rosny.trigger import TriggerSource
+from rosny.utils import setup_logger, default_object_name
+
+Address = Union[str, Tuple[str, int]]
+
+FRAME_HEADER = struct.Struct("!IBB")  # payload length, kind, flags
+FRAME_DATA = 0
+FRAME_EXIT = 1
+FRAME_STOP = 2
+FRAME_AUTH = 3
+MAX_FRAME_SIZE = 1 << 26
+_COMPRESSED = 1
+_ITEM_SIZE = struct.Struct("!I")
+_POLL_INTERVAL = 0.1
+_CHALLENGE_SIZE = 32
+_AUTH_FRAME_SIZE = 64
+_AUTH_DIGEST = "sha256"
+_AUTH_WELCOME = b"#WELCOME#"
+_AUTH_FAILURE = b"#FAILURE#"
+_AUTH_TIMEOUT = 5.0
+_MAX_HANDSHAKES = 16
+
+
+def create_socket(address: Address) -> socket.socket:
+    """Stream socket, a Unix socket for a path and TCP for a host and port"""
+    if isinstance(address, str):
+        return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def connect(address: Address, timeout: float) -> socket.socket:
+    # The listening side may start later, so connection is retried
+    deadline = time.monotonic() + timeout
+    while True:
+        sock = create_socket(address)
+        try:
+            sock.connect(address)
+            return sock
+        except (ConnectionRefusedError, FileNotFoundError):
+            sock.close()
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(_POLL_INTERVAL / 10)
+
+
+def listen(address: Address) -> socket.socket:
+    sock = create_socket(address)
+    if isinstance(address, str):
+        if os.path.exists(address):
+            os.unlink(address)
+    else:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(address)
+    sock.listen()
+    return sock
+
+
+def resolve_authkey(authkey: Optional[bytes]) -> bytes:
+    # Like `multiprocessing.connection`, processes of a program share
+    # the authkey of the main process by default
+    if authkey is None:
+        return bytes(multiprocessing.current_process().authkey)
+    return bytes(authkey)
+
+
+def pack_batch(items: List[bytes]) -> bytes:
+    parts = []
+    for data in items:
+        parts.append(_ITEM_SIZE.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def unpack_batch(payload: bytes) -> List[memoryview]:
+    view = memoryview(payload)
+    items = []
+    offset = 0
+    while offset < len(view):
+        size, = _ITEM_SIZE.unpack_from(view, offset)
+        offset += _ITEM_SIZE.size
+        items.append(view[offset:offset + size])
+        offset += size
+    return items
+
+
+class FramedSocket:
+    """Length-prefixed frames over a stream socket.
+
+    Payloads of at least `compress_min_size` bytes are compressed with zlib
+    when `compress_level` is set, a flag in the header marks them.
+    Frames larger than `max_frame_size` bytes, before or after decompression,
+    are rejected with `ConnectionError`.
+    """
+
+    def __init__(self,
+                 sock: socket.socket,
+                 compress_level: int = 0,
+                 compress_min_size: int = 1024,
+                 max_frame_size: int = MAX_FRAME_SIZE):
+        self.socket = sock
+        self.compress_level = compress_level
+        self.compress_min_size = compress_min_size
+        self.max_frame_size = max_frame_size
+        self.sent_bytes = 0
+        self.received_bytes = 0
+        self._send_lock = threading.Lock()
+
+    def send(self, kind: int, payload: bytes = b""):
+        flags = 0
+        if self.compress_level and len(payload) >= self.compress_min_size:
+            payload = zlib.compress(payload, self.compress_level)
+            flags |= _COMPRESSED
+        header = FRAME_HEADER.pack(len(payload), kind, flags)
+        with self._send_lock:
+            if len(payload) < 1 << 16:
+                self.socket.sendall(header + payload)
+            else:  # don't copy large payloads
+                self.socket.sendall(header)
+                self.socket.sendall(payload)
+        self.sent_bytes += FRAME_HEADER.size + len(payload)
+
+    def _recv_exactly(self, size: int) -> Optional[bytearray]:
+        data = bytearray(size)
+        view = memoryview(data)
+        received = 0
+        while received < size:
+            count = self.socket.recv_into(view[received:])
+            if not count:
+                return None
+            received += count
+        return data
+
+    def recv(self) -> Optional[Tuple[int, bytes]]:
+        """Kind and payload of the next frame, None if the peer closed"""
+        return self._recv(self.max_frame_size)
+
+    def _recv(self, max_size: int) -> Optional[Tuple[int, bytes]]:
+        header = self._recv_exactly(FRAME_HEADER.size)
+        if header is None:
+            return None
+        size, kind, flags = FRAME_HEADER.unpack(header)
+        if size > max_size:
+            raise ConnectionError(f"Frame of {size} bytes exceeds "
+                                  f"the limit of {max_size} bytes")
+        payload = self._recv_exactly(size)
+        if payload is None:
+            return None
+        self.received_bytes += FRAME_HEADER.size + size
+        if flags & _COMPRESSED:
+            return kind, self._decompress(payload, max_size)
+        return kind, bytes(payload)
+
+    @staticmethod
+    def _decompress(payload: bytearray, max_size: int) -> bytes:
+        decompressor = zlib.decompressobj()
+        try:
+            data = decompressor.decompress(payload, max_size)
+        except zlib.error as error:
+            raise ConnectionError(f"Failed to decompress a frame: {error}")
+        if decompressor.unconsumed_tail:
+            raise ConnectionError(f"Decompressed frame exceeds "
+                                  f"the limit of {max_size} bytes")
+        if not decompressor.eof:
+            raise ConnectionError("Compressed frame is truncated")
+        return data
+
+    def authenticate(self, authkey: bytes, server: bool,
+                     timeout: float = _AUTH_TIMEOUT):
+        """Mutual challenge-response with a shared key like in
+        `multiprocessing.connection`, raises `AuthenticationError` on failure"""
+        self.socket.settimeout(timeout)
+        try:
+            if server:
+                self._deliver_challenge(authkey)
+                self._answer_challenge(authkey)
+            else:
+                self._answer_challenge(authkey)
+                self._deliver_challenge(authkey)
+        finally:
+            self.socket.settimeout(None)
+
+    def _deliver_challenge(self, authkey: bytes):
+        message = os.urandom(_CHALLENGE_SIZE)
+        self.send(FRAME_AUTH, message)
+        digest = hmac.new(authkey, message, _AUTH_DIGEST).digest()
+        if not hmac.compare_digest(self._recv_auth(), digest):
+            self.send(FRAME_AUTH, _AUTH_FAILURE)
+            raise AuthenticationError("Digest received from the peer is wrong")
+        self.send(FRAME_AUTH, _AUTH_WELCOME)
+
+    def _answer_challenge(self, authkey: bytes):
+        message = self._recv_auth()
+        self.send(FRAME_AUTH, hmac.new(authkey, message, _AUTH_DIGEST).digest())
+        if self._recv_auth() != _AUTH_WELCOME:
+            raise AuthenticationError("Digest sent to the peer was rejected")
+
+    def _recv_auth(self) -> bytes:
+        frame = self._recv(_AUTH_FRAME_SIZE)
+        if frame is None or frame[0] != FRAME_AUTH:
+            raise AuthenticationError("Peer didn't authenticate")
+        return frame[1]
+
+    def poll(self, timeout: Optional[float] = 0.) -> bool:
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.socket, selectors.EVENT_READ)
+            return bool(selector.select(timeout))
+
+    def close(self):
+        try:
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.socket.close()
+
+
+class RemoteSender:
+    """Sending end of a remote channel, connects to a receiver.
+
+    Items are serialized in `put` and sent by a background thread in frames
+    of up to `batch_size` items collected within `batch_delay` seconds.
+    The connection is opened in the process that puts the first item.
+    The receiver must have the same `authkey`, by default the authkey
+    of the main process, so senders on another host need an explicit key.
+    """
+
+    def __init__(self,
+                 address: Address,
+                 serializer: Union[str, Serializer] = "pickle",
+                 capacity: int = 64,
+                 batch_size: int = 64,
+                 batch_delay: float = 1e-3,
+                 compress_level: int = 0,
+                 connect_timeout: float = 5.0,
+                 authkey: Optional[bytes] = None,
+                 max_frame_size: int = MAX_FRAME_SIZE):
+        self.address = address
+        self.authkey = None if authkey is None else bytes(authkey)
+        self.max_frame_size = max_frame_size
+        self.serializer = get_serializer(serializer)
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.compress_level = compress_level
+        self.connect_timeout = connect_timeout
+        self._init()
+
+    def _init(self):
+        self.puts = 0
+        self.frames = 0
+        self.error: Optional[BaseException] = None
+        self.logger = setup_logger(default_object_name(self))
+        self._queue: queue.Queue = queue.Queue(self.capacity)
+        self._framed: Optional[FramedSocket] = None
+        self._carry: Optional[bytes] = None
+        self._closing = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def sent_bytes(self) -> int:
+        return self._framed.sent_bytes if self._framed is not None else 0
+
+    def open(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # items and threads of a parent process are not inherited
+            self._queue = queue.Queue(self.capacity)
+            self._carry = None
+            self._closing = threading.Event()
+            self.error = None
+            framed = FramedSocket(connect(self.address, self.connect_timeout),
+                                  compress_level=self.compress_level,
+                                  max_frame_size=self.max_frame_size)
+            try:
+                framed.authenticate(resolve_authkey(self.authkey), server=False)
+            except BaseException:
+                framed.close()
+                raise
+            self._framed = framed
+            self._thread = threading.Thread(target=self._run,
+                                            name=self.logger.name,
+                                            daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def put(self, item: Any, timeout: Optional[float] = None):
+        self.open()
+        if self.error is not None:
+            raise ConnectionError(f"Remote channel to {self.address} "
+                                  f"is broken: {self.error!r}")
+        data = self.serializer.dumps(item)
+        if _ITEM_SIZE.size + len(data) > self.max_frame_size:
+            raise ValueError(f"Serialized item of {len(data)} bytes exceeds "
+                             f"the frame limit of {self.max_frame_size} bytes")
+        self._queue.put(data, timeout=timeout)
+        self.puts += 1
+
+    def _next_batch(self) -> List[bytes]:
+        if self._carry is not None:
+            batch, self._carry = [self._carry], None
+        else:
+            batch = [self._queue.get(timeout=_POLL_INTERVAL)]
+        size = _ITEM_SIZE.size + len(batch[0])
+        deadline = time.monotonic() + self.batch_delay
+        while len(batch) < self.batch_size:
+            try:
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    data = self._queue.get(timeout=remaining)
+                else:
+                    data = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            size += _ITEM_SIZE.size + len(data)
+            if size > self.max_frame_size:
+                self._carry = data  # starts the next frame
+                break
+            batch.append(data)
+        return batch
+
+    def _run(self):
+        # Items put before close are sent
+        while not (self._closing.is_set() and self._queue.empty()
+                   and self._carry is None):
+            try:
+                batch = self._next_batch()
+            except queue.Empty:
+                continue
+            try:
+                self._framed.send(FRAME_DATA, pack_batch(batch))
+                self.frames += 1
+            except OSError as error:
+                self.error = error
+                self.logger.error(f"Failed to send to {self.address}: {error}")
+                return
+
+    def close(self, timeout: Optional[float] = None):
+        if self._pid != os.getpid():
+            return
+        self._closing.set()
+        self._thread.join(timeout)  # type: ignore
+        self._framed.close()  # type: ignore
+        self._pid = None
+
+    def __getstate__(self) -> dict:
+        return {"address": self.address,
+                "serializer": self.serializer,
+                "capacity": self.capacity,
+                "batch_size": self.batch_size,
+                "batch_delay": self.batch_delay,
+                "compress_level": self.compress_level,
+                "connect_timeout": self.connect_timeout,
+                "authkey": self.authkey,
+                "max_frame_size": self.max_frame_size}
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._init()
+
+
+class RemoteReceiver(TriggerSource):
+    """Receiving end of a remote channel, listens for senders.
+
+    A background thread accepts senders and reads their frames into a queue
+    of `capacity` items, a full queue holds back the senders. Items are
+    deserialized in `get`. The socket is opened in the process that calls
+    `open` or gets the first item, so an ephemeral TCP port is known
+    from `address` after `open`. Senders that fail to authenticate with
+    `authkey` are dropped before any of their frames is read.
+    """
+
+    def __init__(self,
+                 address: Address,
+                 serializer: Union[str, Serializer] = "pickle",
+                 capacity: int = 64,
+                 authkey: Optional[bytes] = None,
+                 max_frame_size: int = MAX_FRAME_SIZE):
+        self.requested_address = address
+        self.authkey = None if authkey is None else bytes(authkey)
+        self.max_frame_size = max_frame_size
+        self.serializer = get_serializer(serializer)
+        self.capacity = capacity
+        self._triggers = []
+        self._init()
+
+    def _init(self):
+        self.gets = 0
+        self.logger = setup_logger(default_object_name(self))
+        self._queue: queue.Queue = queue.Queue(self.capacity)
+        self._listener: Optional[socket.socket] = None
+        self._address = self.requested_address
+        self._connections: Dict[socket.socket, FramedSocket] = dict()
+        self._accepted: List[FramedSocket] = []
+        self._accept_lock = threading.Lock()
+        self._handshakes = threading.BoundedSemaphore(_MAX_HANDSHAKES)
+        self._wakeup: Optional[Tuple[socket.socket, socket.socket]] = None
+        self._closing = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def address(self) -> Address:
+        return self._address
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def open(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # items and threads of a parent process are not inherited
+            self._queue = queue.Queue(self.capacity)
+            self._connections = dict()
+            self._accepted = []
+            self._accept_lock = threading.Lock()
+            self._handshakes = threading.BoundedSemaphore(_MAX_HANDSHAKES)
+            self._wakeup = socket.socketpair()
+            self._closing = threading.Event()
+            self._listener = listen(self.requested_address)
+            self._address = self._listener.getsockname()
+            self._thread = threading.Thread(target=self._run,
+                                            name=self.logger.name,
+                                            daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self):
+        wakeup = self._wakeup[0]  # type: ignore
+        with selectors.DefaultSelector() as selector:
+            selector.register(self._listener, selectors.EVENT_READ)
+            selector.register(wakeup, selectors.EVENT_READ)
+            while not self._closing.is_set():
+                for key, _ in selector.select(_POLL_INTERVAL):
+                    if key.fileobj is self._listener:
+                        self._accept()
+                    elif key.fileobj is wakeup:
+                        wakeup.recv(1024)
+                        with self._accept_lock:
+                            accepted, self._accepted = self._accepted, []
+                        for framed in accepted:
+                            self._connections[framed.socket] = framed
+                            selector.register(framed.socket, selectors.EVENT_READ)
+                    elif not self._read(self._connections[key.fileobj]):
+                        selector.unregister(key.fileobj)
+                        self._connections.pop(key.fileobj).close()  # type: ignore
+        with self._accept_lock:
+            for framed in self._accepted + list(self._connections.values()):
+                framed.close()
+            self._accepted = []
+            for sock in self._wakeup:  # type: ignore
+                sock.close()
+        self._connections.clear()
+        self._listener.close()
+
+    def _accept(self):
+        # Senders authenticate in their own threads, so a silent peer
+        # doesn't hold back reads from the authenticated ones
+        sock, _ = self._listener.accept()  # type: ignore
+        if not self._handshakes.acquire(blocking=False):
+            self.logger.warning(f"Rejected a sender, {_MAX_HANDSHAKES} "
+                                f"handshakes are already in progress")
+            sock.close()
+            return
+        threading.Thread(target=self._authenticate,
+                         args=(FramedSocket(sock, max_frame_size=self.max_frame_size),),
+                         name=f"{self.logger.name}-handshake",
+                         daemon=True).start()
+
+    def _authenticate(self, framed: FramedSocket):
+        try:
+            framed.authenticate(resolve_authkey(self.authkey), server=True)
+        except (AuthenticationError, OSError) as error:
+            self.logger.warning(f"Rejected a sender: {error!r}")
+            framed.close()
+            return
+        finally:
+            self._handshakes.release()
+        with self._accept_lock:
+            if self._closing.is_set():
+                framed.close()
+                return
+            self._accepted.append(framed)
+            self._wakeup[1].send(b"\0")  # type: ignore
+
+    def _read(self, framed: FramedSocket) -> bool:
+        try:
+            frame = framed.recv()
+        except OSError as error:
+            self.logger.error(f"Failed to receive from a sender: {error}")
+            return False
+        if frame is None:
+            return False
+        kind, payload = frame
+        if kind != FRAME_DATA:
+            return True
+        for data in unpack_batch(payload):
+            while not self._closing.is_set():
+                try:
+                    self._queue.put(data, timeout=_POLL_INTERVAL)
+                    break
+                except queue.Full:
+                    pass
+        self.notify_triggers()
+        return True
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        self.open()
+        item = self.serializer.loads(self._queue.get(timeout=timeout))
+        self.gets += 1
+        return item
+
+    def get_nowait(self) -> Any:
+        self.open()
+        item = self.serializer.loads(self._queue.get_nowait())
+        self.gets += 1
+        return item
+
+    def close(self):
+        if self._pid != os.getpid():
+            return
+        self._closing.set()
+        self._thread.join()
+        if isinstance(self.requested_address, str):
+            try:
+                os.unlink(self.requested_address)
+            except FileNotFoundError:
+                pass
+        self._pid = None
+
+    def __getstate__(self) -> dict:
+        return {"requested_address": self.requested_address,
+                "serializer": self.serializer,
+                "capacity": self.capacity,
+                "authkey": self.authkey,
+                "max_frame_size": self.max_frame_size,
+                "_triggers": self._triggers}
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._init()
+
+
+class BridgeNode(ThreadNode):
+    """Links exit and stop of pipelines on two hosts over a socket.
+
+    One bridge listens on the address and the other connects to it.
+    Exit of either common state, stop of either bridge and a lost
+    connection set the exit of the other pipeline. Both bridges must have
+    the same `authkey`, a listening bridge ignores peers that fail
+    to authenticate, a connecting bridge sets exit.
+    """
+
+    def __init__(self,
+                 address: Address,
+                 listen: bool = False,
+                 loop_rate: float = 20.0,
+                 connect_timeout: float = 10.0,
+                 authkey: Optional[bytes] = None):
+        super().__init__(loop_rate=loop_rate)
+        self.address = address
+        self.authkey = None if authkey is None else bytes(authkey)
+        self.listen = listen
+        self.connect_timeout = connect_timeout
+        self.connected = False
+        self._listener: Optional[socket.socket] = None
+        self._framed: Optional[FramedSocket] = None
+        self._exit_sent = False
+        self._connect_deadline = 0.
+
+    def on_loop_begin(self):
+        self.connected = False
+        self._exit_sent = False
+        self._connect_deadline = time.monotonic() + self.connect_timeout
+        if self.listen and self._listener is None:
+            self._listener = listen(self.address)
+
+    def _connect(self):
+        if self._listener is not None:
+            if not FramedSocket(self._listener).poll(0.):
+                return
+            sock, _ = self._listener.accept()
+        else:
+            try:
+                sock = connect(self.address, timeout=0.)
+            except (ConnectionRefusedError, FileNotFoundError):
+                return
+        framed = FramedSocket(sock, max_frame_size=_AUTH_FRAME_SIZE)
+        try:
+            framed.authenticate(resolve_authkey(self.authkey),
+                                server=self._listener is not None)
+        except (AuthenticationError, OSError) as error:
+            framed.close()
+            if self._listener is not None:
+                self.logger.warning(f"Bridge rejected a peer: {error!r}")
+            else:
+                self.logger.error(f"Bridge failed to authenticate "
+                                  f"on {self.address}: {error!r}")
+                self.common_state.set_exit()
+                self._connect_deadline = float("inf")
+            return
+        self._framed = framed
+        self.connected = True
+        self.logger.info(f"Bridge connected on {self.address}")
+
+    def work(self):
+        if self._framed is None:
+            if self._connect_deadline == float("inf"):
+                return  # exit is set, the bridge doesn't connect anymore
+            self._connect()
+            if self._framed is None:
+                if time.monotonic() > self._connect_deadline:
+                    self.logger.error(f"Bridge on {self.address} is not connected "
+                                      f"in {self.connect_timeout} seconds")
+                    self.common_state.set_exit()
+                    self._connect_deadline = float("inf")
+                return
+        if self.common_state.exit_is_set() and not self._exit_sent:
+            self._send(FRAME_EXIT)
+        while self._framed is not None and self._framed.poll(0.):
+            try:
+                frame = self._framed.recv()
+            except OSError:
+                frame = None
+            if frame is None:
+                self.logger.warning(f"Bridge on {self.address} is disconnected")
+                self._close_connection()
+                self._remote_exit()
+            elif frame[0] in (FRAME_EXIT, FRAME_STOP):
+                self._remote_exit()
+
+    def _remote_exit(self):
+        self._exit_sent = True  # don't echo the exit back
+        if not self.common_state.exit_is_set():
+            self.logger.info("Exit is received from the remote pipeline")
+            self.common_state.set_exit()
+
+    def _send(self, kind: int):
+        try:
+            self._framed.send(kind)  # type: ignore
+            self._exit_sent = True
+        except OSError as error:
+            self.logger.warning(f"Failed to send to the remote pipeline: {error}")
+            self._close_connection()
+
+    def _close_connection(self):
+        if self._framed is not None:
+            self._framed.close()
+            self._framed = None
+
+    def on_loop_end(self):
+        if self._framed is not None:
+            self._send(FRAME_STOP)
+        self._close_connection()
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+            if isinstance(self.address, str) and os.path.exists(self.address):
+                os.unlink(self.address)
@@ -0,0 +1,44 @@
+import time
+from collections import deque
+from typing import Optional, Deque
+
+
+class RestartPolicy:
+    """Restarts of a failed loop with exponential backoff.
+
+    At most `max_restarts` restarts are allowed within `window` seconds,
+    after that the failure is escalated. The delay before a restart grows
+    by `multiplier` with every recent restart, up to `max_backoff` seconds.
+    """
+
+    def __init__(self,
+                 max_restarts: int = 3,
+                 window: float = 60.0,
+                 backoff: float = 0.1,
+                 multiplier: float = 2.0,
+                 max_backoff: float = 10.0):
+        self.max_restarts = max_restarts
+        self.window = window
+        self.backoff = backoff
+        self.multiplier = multiplier
+        self.max_backoff = max_backoff
+        self._restart_times: Deque[float] = deque()
+
+    def reset(self):
+        self._restart_times.clear()
+
+    @property
+    def recent_restarts(self) -> int:
+        return len(self._restart_times)
+
+    def next_delay(self, now: Optional[float] = None) -> Optional[float]:
+        """Delay before the next restart, None if the failure must be escalated"""
+        if now is None:
+            now = time.monotonic()
+        while self._restart_times and now - self._restart_times[0] > self.window:
+            self._restart_times.popleft()
+        if len(self._restart_times) >= self.max_restarts:
+            return None
+        delay = self.backoff * self.multiplier ** len(self._restart_times)
+        self._restart_times.append(now)
+        return min(delay, self.max_backoff)
@@ -0,0 +1,213 @@
+import os
+import time
+import itertools
+import threading
+from queue import Empty
+from concurrent.futures import Future, TimeoutError
+from multiprocessing.context import BaseContext
+from typing import Optional, Callable, Dict, List, Tuple, Any
+
+from rosny.trigger import Trigger, TriggerQueue, TriggerSource
+
+_RECEIVE_INTERVAL = 0.05
+_receiver_lock = threading.Lock()
+
+
+def expose(method: Callable) -> Callable:
+    """Mark a node method as callable through an RPC server"""
+    method._rpc_exposed = True  # type: ignore
+    return method
+
+
+class RpcClient:
+    """Sends requests to an RPC server and resolves futures with responses.
+
+    Responses of all in-flight requests of a client are read by a single
+    receiver thread, which is started in each process that uses the client.
+    Requests not answered within their timeout fail with `TimeoutError`.
+    Responses go to the client, so each process needs its own client.
+    """
+
+    def __init__(self,
+                 requests: TriggerQueue,
+                 responses: TriggerQueue,
+                 client_id: int,
+                 timeout: Optional[float] = None):
+        self.client_id = client_id
+        self.timeout = timeout
+        self._requests = requests
+        self._responses = responses
+        self._ids = itertools.count()
+        self._pending: Dict[int, Tuple[Future, Optional[float]]] = dict()
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def request(self,
+                method: str,
+                args: tuple = (),
+                kwargs: Optional[Dict[str, Any]] = None,
+                timeout: Optional[float] = None) -> Future:
+        self._start_receiver()
+        future: Future = Future()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        call_id = next(self._ids)
+        with self._lock:
+            self._pending[call_id] = (future, deadline)
+        try:
+            self._requests.put((self.client_id, call_id, deadline,
+                                method, args, kwargs or dict()))
+        except BaseException:
+            with self._lock:
+                del self._pending[call_id]
+            raise
+        return future
+
+    def call(self, method: str, *args: Any, **kwargs: Any) -> Future:
+        return self.request(method, args, kwargs, timeout=self.timeout)
+
+    def _start_receiver(self):
+        if self._pid == os.getpid():
+            return
+        with _receiver_lock:
+            if self._pid == os.getpid():
+                return
+            # threads and pending requests are not inherited by forked processes
+            self._lock = threading.Lock()
+            self._pending = dict()
+            self._stop_event = threading.Event()
+            self._thread = threading.Thread(target=self._receive,
+                                            name=f"rpc-client-{self.client_id}",
+                                            daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _receive(self):
+        while not self._stop_event.is_set():
+            try:
+                call_id, success, value = self._responses.get(
+                    timeout=self._receive_timeout()
+                )
+            except Empty:
+                pass
+            else:
+                with self._lock:
+                    entry = self._pending.pop(call_id, None)
+                if entry is not None:  # not expired
+                    self._resolve(entry[0], success, value)
+            self._expire()
+
+    def _receive_timeout(self) -> float:
+        timeout = _RECEIVE_INTERVAL
+        now = time.monotonic()
+        with self._lock:
+            for _, deadline in self._pending.values():
+                if deadline is not None:
+                    timeout = min(timeout, deadline - now)
+        return max(timeout, 0.)
+
+    def _expire(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [call_id for call_id, (_, deadline) in self._pending.items()
+                       if deadline is not None and deadline <= now]
+            futures = [self._pending.pop(call_id)[0] for call_id in expired]
+        for future in futures:
+            self._resolve(future, False, TimeoutError("RPC request timed out"))
+
+    @staticmethod
+    def _resolve(future: Future, success: bool, value: Any):
+        if future.cancelled():
+            return
+        if success:
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+
+    def close(self):
+        if self._thread is not None and self._pid == os.getpid():
+            self._stop_event.set()
+            self._thread.join()
+        self._thread = None
+        self._pid = None
+
+    def __getstate__(self) -> dict:
+        return {"requests": self._requests,
+                "responses": self._responses,
+                "client_id": self.client_id,
+                "timeout": self.timeout}
+
+    def __setstate__(self, state: dict):
+        self.__init__(**state)  # type: ignore
+
+
+class RpcServer(TriggerSource):
+    """Requests to exposed methods of a node, served in the loop of the node.
+
+    Clients must be created before the nodes that use them are started.
+    A node can wake up on requests with `trigger_on(server)`.
+    """
+
+    def __init__(self, mp_context: Optional[BaseContext] = None):
+        self.mp_context = mp_context
+        self._requests = TriggerQueue(mp_context)
+        self._responses: List[TriggerQueue] = []
+
+    def add_trigger(self, trigger: Trigger):
+        self._requests.add_trigger(trigger)
+
+    def notify_triggers(self):
+        self._requests.notify_triggers()
+
+    def client(self, timeout: Optional[float] = None) -> RpcClient:
+        responses = TriggerQueue(self.mp_context)
+        self._responses.append(responses)
+        return RpcClient(self._requests, responses,
+                         client_id=len(self._responses) - 1,
+                         timeout=timeout)
+
+    def serve(self,
+              target: Any,
+              timeout: Optional[float] = 0.,
+              max_requests: Optional[int] = None) -> int:
+        """Handle pending requests, wait for the first one up to timeout"""
+        served = 0
+        try:
+            request = self._requests.get(timeout=timeout)
+        except Empty:
+            return served
+        while True:
+            self._handle(target, request)
+            served += 1
+            if max_requests is not None and served >= max_requests:
+                return served
+            try:
+                request = self._requests.get_nowait()
+            except Empty:
+                return served
+
+    def _handle(self, target: Any, request: tuple):
+        client_id, call_id, deadline, method, args, kwargs = request
+        if deadline is not None and time.monotonic() > deadline:
+            return  # the caller doesn't wait anymore
+        function = getattr(target, method, None)
+        try:
+            if not getattr(function, "_rpc_exposed", False):
+                raise AttributeError(f"'{type(target).__name__}' has no exposed "
+                                     f"method '{method}'")
+            response = (call_id, True, function(*args, **kwargs))  # type: ignore
+        except Exception as error:
+            response = (call_id, False, error)
+        responses = self._responses[client_id]
+        try:
+            responses.put(response)
+        except Exception as error:
+            # the result or the exception can't be pickled
+            responses.put((call_id, False, RuntimeError(
+                f"Failed to send response of '{method}': {error!r}"
+            )))
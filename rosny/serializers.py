@@ -0,0 +1,132 @@
+import abc
+import struct
+import pickle
+from typing import Dict, Type, Union, Any
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+_NUMPY_HEADER = struct.Struct("=BB")
+
+
+class Serializer(metaclass=abc.ABCMeta):
+    """Converts channel items to bytes and back"""
+
+    name = ""
+
+    @abc.abstractmethod
+    def dumps(self, item: Any) -> bytes:
+        pass
+
+    @abc.abstractmethod
+    def loads(self, data: Any) -> Any:
+        pass
+
+
+class PickleSerializer(Serializer):
+    name = "pickle"
+
+    def __init__(self, protocol: int = pickle.HIGHEST_PROTOCOL):
+        self.protocol = protocol
+
+    def dumps(self, item: Any) -> bytes:
+        return pickle.dumps(item, protocol=self.protocol)
+
+    def loads(self, data: Any) -> Any:
+        return pickle.loads(data)
+
+
+class BytesSerializer(Serializer):
+    """Passes bytes-like items as raw bytes"""
+
+    name = "bytes"
+
+    def dumps(self, item: Any) -> bytes:
+        return bytes(item)
+
+    def loads(self, data: Any) -> bytes:
+        return bytes(data)
+
+
+class NumpySerializer(Serializer):
+    """NumPy arrays as a dtype and shape header followed by raw data.
+
+    Loaded arrays are views of the received data, so they are read-only
+    when the data is immutable.
+    """
+
+    name = "numpy"
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("NumpySerializer requires numpy")
+
+    def dumps(self, item: Any) -> bytes:
+        array = np.asarray(item)
+        if not array.flags.c_contiguous:
+            array = array.copy()
+        if array.dtype.hasobject:
+            raise TypeError("NumpySerializer can't serialize object arrays")
+        dtype = array.dtype.str.encode()
+        header = _NUMPY_HEADER.pack(len(dtype), array.ndim) + dtype
+        shape = struct.pack(f"={array.ndim}q", *array.shape)
+        data = memoryview(array.reshape(-1).view(np.uint8))  # type: ignore
+        return b"".join((header, shape, data))
+
+    def loads(self, data: Any) -> Any:
+        dtype_size, ndim = _NUMPY_HEADER.unpack_from(data)
+        offset = _NUMPY_HEADER.size
+        dtype = np.dtype(bytes(data[offset:offset + dtype_size]).decode())
+        offset += dtype_size
+        shape = struct.unpack_from(f"={ndim}q", data, offset)
+        offset += 8 * ndim
+        return np.frombuffer(data, dtype=dtype, offset=offset).reshape(shape)
+
+
+class StructSerializer(Serializer):
+    """Tuples of scalars packed with a `struct` format, plain scalars
+    with a single value format"""
+
+    name = "struct"
+
+    def __init__(self, format: str):
+        self.format = format
+        self._struct = struct.Struct(format)
+        self._scalar = len(self._struct.unpack(bytes(self._struct.size))) == 1
+
+    def dumps(self, item: Any) -> bytes:
+        if self._scalar:
+            return self._struct.pack(item)
+        return self._struct.pack(*item)
+
+    def loads(self, data: Any) -> Any:
+        values = self._struct.unpack(data)
+        return values[0] if self._scalar else values
+
+    def __getstate__(self) -> dict:
+        return {"format": self.format}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state["format"])  # type: ignore
+
+
+SERIALIZERS: Dict[str, Type[Serializer]] = {
+    "pickle": PickleSerializer,
+    "bytes": BytesSerializer,
+    "numpy": NumpySerializer,
+    "struct": StructSerializer,
+}
+
+
+def get_serializer(serializer: Union[str, Serializer]) -> Serializer:
+    if isinstance(serializer, Serializer):
+        return serializer
+    if serializer == StructSerializer.name:
+        raise ValueError("Struct serializer needs a format, "
+                         "pass a StructSerializer instance")
+    if serializer not in SERIALIZERS:
+        raise ValueError(f"Serializer must be one of {tuple(SERIALIZERS)}, "
+                         f"got '{serializer}'")
+    return SERIALIZERS[serializer]()
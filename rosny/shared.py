@@ -0,0 +1,129 @@
+import os
+import time
+import contextlib
+from typing import Optional, Callable, Iterator, TypeVar
+from multiprocessing import util
+from multiprocessing.shared_memory import SharedMemory
+
+T = TypeVar("T")
+# Parts of segments written by different processes start on separate cache lines
+ALIGNMENT = 64
+
+
+def align(size: int) -> int:
+    return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _release_shared_memory(shared_memory: SharedMemory, owner_pid: Optional[int]):
+    try:
+        shared_memory.close()
+    except BufferError:
+        # Views of the segment are still alive, so the mapping
+        # will be released together with the last of them.
+        shared_memory._buf = None  # type: ignore
+        shared_memory._mmap = None  # type: ignore
+    if os.getpid() == owner_pid:
+        try:
+            shared_memory.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedMemoryBlock:
+    """Shared memory segment, unlinked by the process that created it"""
+
+    def __init__(self, size: int):
+        self._owner_pid: Optional[int] = os.getpid()
+        self._shared_memory = SharedMemory(create=True, size=max(size, 1))
+        # Unlike weakref.finalize, runs on exit of multiprocessing children
+        self._finalizer = util.Finalize(
+            self, _release_shared_memory,
+            args=(self._shared_memory, self._owner_pid), exitpriority=0
+        )
+
+    @property
+    def name(self) -> str:
+        return self._shared_memory.name
+
+    @property
+    def size(self) -> int:
+        return self._shared_memory.size
+
+    @property
+    def buf(self) -> memoryview:
+        return self._shared_memory.buf  # type: ignore
+
+    def close(self):
+        self._finalizer()
+
+    def __getstate__(self) -> dict:
+        return {"name": self.name}
+
+    def __setstate__(self, state: dict):
+        self._owner_pid = None
+        self._shared_memory = SharedMemory(name=state["name"])
+        self._finalizer = util.Finalize(
+            self, _release_shared_memory,
+            args=(self._shared_memory, None), exitpriority=0
+        )
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class WriterDiedError(RuntimeError):
+    pass
+
+
+class SeqLock:
+    """Sequence lock for data with a single writer on shared memory.
+
+    Takes `SeqLock.nbytes` bytes for the sequence number, which is odd
+    while a write is in progress, and the pid of the last writer.
+    Readers retry while a write is in progress, so they never observe
+    torn values, and detect writers that died during a write.
+    """
+
+    nbytes = 16
+
+    def __init__(self, buf: memoryview):
+        self._words = buf[:self.nbytes].cast('q')
+
+    @property
+    def seq(self) -> int:
+        return self._words[0]
+
+    def reset(self):
+        # Unlocks after a writer that died during a write
+        self._words[0] -= self._words[0] % 2
+
+    @contextlib.contextmanager
+    def write(self) -> Iterator[None]:
+        self._words[1] = os.getpid()
+        # a write after a dead writer keeps the sequence odd, not inverted
+        self._words[0] |= 1
+        try:
+            yield
+        finally:
+            self._words[0] += 1
+
+    def read(self, load: Callable[[], T]) -> T:
+        """Consistent result of `load`, raises `WriterDiedError` if the data
+        stays locked by a writer that doesn't exist anymore"""
+        words = self._words
+        while True:
+            seq = words[0]
+            if not seq % 2:
+                value = load()
+                if words[0] == seq:
+                    return value
+            elif words[0] == seq and not pid_alive(words[1]):
+                raise WriterDiedError(f"Process {words[1]} died during a write")
+            time.sleep(0)
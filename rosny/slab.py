@@ -0,0 +1,161 @@
+import time
+import queue
+import pickle
+import multiprocessing
+from multiprocessing.context import BaseContext
+from typing import Optional, List, Tuple, Any
+
+from rosny.shared import SharedMemoryBlock, align
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.)
+
+
+class SlabPool:
+    """Fixed number of equal shared memory slabs, shared between processes"""
+
+    def __init__(self,
+                 slab_size: int,
+                 slabs: int,
+                 mp_context: Optional[BaseContext] = None):
+        if slab_size < 1 or slabs < 1:
+            raise ValueError(f"Slab size and number of slabs must be positive, "
+                             f"got {slab_size} and {slabs}")
+        self.slab_size = slab_size
+        self.slabs = slabs
+        self._header_size = align(slabs)
+        self._stride = align(slab_size)
+        self._block = SharedMemoryBlock(self._header_size + self._stride * slabs)
+        context = mp_context or multiprocessing.get_context()
+        self._free = context.Semaphore(slabs)
+        self._lock = context.Lock()
+        self._used: memoryview
+        self._build()
+
+    def _build(self):
+        self._used = self._block.buf[:self.slabs]
+
+    def slab(self, index: int) -> memoryview:
+        offset = self._header_size + index * self._stride
+        return self._block.buf[offset:offset + self.slab_size]
+
+    def acquire(self,
+                block: bool = True,
+                timeout: Optional[float] = None) -> Optional[int]:
+        if not self._free.acquire(block, timeout):
+            return None
+        with self._lock:
+            index = bytes(self._used).index(0)
+            self._used[index] = 1
+        return index
+
+    def release(self, index: int):
+        with self._lock:
+            self._used[index] = 0
+        self._free.release()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_used"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._build()
+
+
+class SlabQueue:
+    """Process queue that moves large buffers out-of-band through shared memory.
+
+    Items are pickled with protocol 5, buffers of at least `min_size` bytes,
+    like NumPy arrays, are copied into slabs of a pool and only the pickle
+    header and slab indexes go through the pipe. A getter copies buffers
+    out of the slabs and returns them to the pool. Buffers larger than
+    a slab, and further buffers of an item while the pool is exhausted,
+    are pickled in-band.
+    """
+
+    def __init__(self,
+                 maxsize: int = 0,
+                 slab_size: int = 1 << 22,
+                 slabs: int = 4,
+                 min_size: int = 1 << 16,
+                 mp_context: Optional[BaseContext] = None):
+        self.maxsize = maxsize
+        self.min_size = min_size
+        context = mp_context or multiprocessing.get_context()
+        self.pool = SlabPool(slab_size, slabs, mp_context=context)
+        self._queue: Any = context.Queue(maxsize)
+
+    def _dumps(self, item: Any, block: bool, deadline: Optional[float]
+               ) -> Tuple[bytes, List[Tuple[int, int]]]:
+        refs: List[Tuple[int, int]] = []
+
+        def buffer_callback(buffer: pickle.PickleBuffer) -> bool:
+            try:
+                raw = buffer.raw()
+            except BufferError:  # not contiguous
+                return True
+            if not self.min_size <= raw.nbytes <= self.pool.slab_size:
+                return True
+            if refs:
+                # don't wait for a slab while holding others
+                index = self.pool.acquire(block=False)
+                if index is None:
+                    return True
+            else:
+                index = self.pool.acquire(block, _remaining(deadline))
+                if index is None:
+                    raise queue.Full
+            self.pool.slab(index)[:raw.nbytes] = raw
+            refs.append((index, raw.nbytes))
+            return False
+
+        try:
+            header = pickle.dumps(item, protocol=5, buffer_callback=buffer_callback)
+        except BaseException:
+            self._release(refs)
+            raise
+        return header, refs
+
+    def _release(self, refs: List[Tuple[int, int]]):
+        for index, _ in refs:
+            self.pool.release(index)
+
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        header, refs = self._dumps(item, block, deadline)
+        try:
+            self._queue.put((header, refs), block, _remaining(deadline))
+        except BaseException:
+            self._release(refs)
+            raise
+
+    def put_nowait(self, item: Any):
+        self.put(item, block=False)
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        header, refs = self._queue.get(block, timeout)
+        buffers = []
+        for index, nbytes in refs:
+            buffers.append(bytearray(self.pool.slab(index)[:nbytes]))
+            self.pool.release(index)
+        return pickle.loads(header, buffers=buffers)
+
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def empty(self) -> bool:
+        return self._queue.empty()
+
+    def full(self) -> bool:
+        return self._queue.full()
+
+    def close(self):
+        self._queue.close()
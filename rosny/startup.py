@@ -0,0 +1,29 @@
+import importlib
+import multiprocessing
+from multiprocessing import forkserver
+from multiprocessing.context import BaseContext
+from typing import Sequence
+
+START_METHODS = ("fork", "spawn", "forkserver")
+
+
+def prepare_start_method(method: str, preload: Sequence[str] = ()) -> BaseContext:
+    """Context of a start method for child processes, `preload` modules are
+    imported once.
+
+    With forkserver the modules are imported in the server, which is started
+    right away, so children are forked from a warm template. With fork they are
+    imported in the parent and inherited. Spawned children import everything.
+    The global start method is not changed.
+    """
+    if method not in START_METHODS:
+        raise ValueError(f"Start method must be one of {START_METHODS}, "
+                         f"got '{method}'")
+    context = multiprocessing.get_context(method)
+    if method == "forkserver":
+        context.set_forkserver_preload(list(preload))
+        forkserver.ensure_running()
+    elif method == "fork":
+        for module in preload:
+            importlib.import_module(module)
+    return context
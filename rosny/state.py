@@ -1,12 +1,42 @@
+import multiprocessing
 from typing import Optional
-from multiprocessing import Event, Manager
+from multiprocessing.context import BaseContext
+from multiprocessing.managers import SyncManager
+
+from rosny.stats import StatsTable
+from rosny.fields import SharedFields, collect_shared_fields
 
 
 class CommonState:
-    def __init__(self):
-        self._manager: Optional[Manager] = Manager()
-        self.profile_stats: dict = self._manager.dict()
-        self._exit_event = Event()
+    def __init__(self,
+                 max_nodes: int = 256,
+                 mp_context: Optional[BaseContext] = None):
+        self._manager: Optional[SyncManager] = None
+        self.max_nodes = max_nodes
+        # Locks and events are bound to the start method of child processes
+        self.mp_context = mp_context or multiprocessing.get_context()
+        self._profile_stats: Optional[StatsTable] = None
+        self._exit_event = self.mp_context.Event()
+        fields = collect_shared_fields(type(self))
+        self._shared_fields = SharedFields(fields) if fields else None
+
+    @property
+    def profile_stats(self) -> StatsTable:
+        self.allocate()
+        return self._profile_stats  # type: ignore
+
+    def allocate(self):
+        # Stats are allocated on first use, nodes allocate them before
+        # child processes are started, so all processes share one table
+        if self._profile_stats is None:
+            self._profile_stats = StatsTable(max_nodes=self.max_nodes,
+                                             mp_context=self.mp_context)
+
+    @property
+    def manager(self) -> SyncManager:
+        if self._manager is None:
+            self._manager = self.mp_context.Manager()
+        return self._manager
 
     def set_exit(self):
         self._exit_event.set()
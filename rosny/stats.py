@@ -0,0 +1,187 @@
+import multiprocessing
+from multiprocessing.context import BaseContext
+from typing import Dict, Iterator, Mapping, Optional
+
+from rosny.shared import SharedMemoryBlock, SeqLock, WriterDiedError, align
+from rosny.histogram import LatencyHistogram
+
+HISTOGRAM_KINDS = ("loop", "work", "sleep")
+STATS_FIELDS = (
+    "loop_time",
+    "loop_rate",
+    "iterations",
+    "start_time",
+    "timestamp",
+    "overruns",
+    "target_rate",
+    "cpu_count",
+    "cpu_first",
+    "cpu_last",
+    "nice",
+    "sched_policy",
+    "sched_priority",
+    "serialize_time",
+    "deserialize_time",
+) + tuple(f"{kind}_{name}" for kind in HISTOGRAM_KINDS + ("jitter",)
+          for name in ("p50", "p90", "p99", "max"))
+_NAME_SIZE = 128
+
+
+class StatsRow:
+    """Row of a stats table written in place by a single node"""
+
+    def __init__(self, table: 'StatsTable', index: int):
+        self.table = table
+        self.index = index
+        self._lock: SeqLock
+        self._values: memoryview
+        self._histograms: Dict[str, LatencyHistogram] = dict()
+        self._fields = {field: pos for pos, field in enumerate(table.fields)}
+        self._build()
+
+    def _build(self):
+        row = self.table.row(self.index)
+        self._lock = SeqLock(row[_NAME_SIZE:_NAME_SIZE + SeqLock.nbytes])
+        self._values = row[_NAME_SIZE + SeqLock.nbytes:].cast('d')
+        self._histograms = {
+            kind: LatencyHistogram(self.table.histogram_buffer(self.index, kind))
+            for kind in HISTOGRAM_KINDS
+        }
+
+    @property
+    def name(self) -> str:
+        return self.table.row_name(self.index)
+
+    @property
+    def written(self) -> bool:
+        return self._lock.seq > 0
+
+    def write(self,
+              histograms: Optional[Dict[str, LatencyHistogram]] = None,
+              **values: float):
+        with self._lock.write():
+            for field, value in values.items():
+                self._values[self._fields[field]] = value  # type: ignore
+            if histograms is not None:
+                for kind, histogram in histograms.items():
+                    self._histograms[kind].merge(histogram)
+
+    def read(self) -> Dict[str, float]:
+        return dict(zip(self.table.fields, self._read(self._values.tolist)))
+
+    def read_histogram(self, kind: str) -> LatencyHistogram:
+        return self._read(self._histograms[kind].copy)
+
+    def _read(self, load):
+        try:
+            return self._lock.read(load)
+        except WriterDiedError:
+            # Stats are advisory, so the row of a node that died during
+            # a write is read as is until the node registers again
+            return load()
+
+    def __getstate__(self) -> dict:
+        return {"table": self.table, "index": self.index}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state["table"], state["index"])  # type: ignore
+
+
+class StatsTable(Mapping[str, float]):
+    """Fixed layout table of node profile stats on shared memory.
+
+    Maps node names to mean loop times, full rows are available with `stats`.
+    """
+
+    def __init__(self,
+                 max_nodes: int = 256,
+                 mp_context: Optional[BaseContext] = None):
+        self.max_nodes = max_nodes
+        self.fields = STATS_FIELDS
+        row_size = _NAME_SIZE + SeqLock.nbytes + 8 * len(self.fields)
+        self._row_size = align(row_size)
+        self._block = SharedMemoryBlock(max_nodes * self._row_size)
+        self._histogram_block = SharedMemoryBlock(
+            max_nodes * len(HISTOGRAM_KINDS) * LatencyHistogram.nbytes
+        )
+        self._lock = (mp_context or multiprocessing.get_context()).Lock()
+        self._indexes: Dict[str, int] = dict()
+
+    def row(self, index: int) -> memoryview:
+        offset = index * self._row_size
+        return self._block.buf[offset:offset + self._row_size]
+
+    def histogram_buffer(self, index: int, kind: str) -> memoryview:
+        size = LatencyHistogram.nbytes
+        offset = (index * len(HISTOGRAM_KINDS) + HISTOGRAM_KINDS.index(kind)) * size
+        return self._histogram_block.buf[offset:offset + size]
+
+    def row_name(self, index: int) -> str:
+        name = bytes(self.row(index)[:_NAME_SIZE])
+        return name.rstrip(b"\0").decode()
+
+    def _find(self, name: str) -> Optional[int]:
+        if name in self._indexes:
+            return self._indexes[name]
+        for index in range(self.max_nodes):
+            row_name = self.row_name(index)
+            if not row_name:
+                break
+            self._indexes[row_name] = index
+            if row_name == name:
+                return index
+        return None
+
+    def register(self, name: str) -> StatsRow:
+        encoded = name.encode()
+        if not encoded or len(encoded) > _NAME_SIZE:
+            raise ValueError(f"Node name must be 1 to {_NAME_SIZE} bytes long")
+        with self._lock:
+            index = self._find(name)
+            if index is None:
+                for index in range(self.max_nodes):
+                    if not self.row_name(index):
+                        break
+                else:
+                    raise RuntimeError(f"Stats table is full, max nodes "
+                                       f"{self.max_nodes}")
+                self.row(index)[:len(encoded)] = encoded
+                self._indexes[name] = index
+            row = StatsRow(self, index)
+            # the previous writer of the row may have died during a write
+            row._lock.reset()
+        return row
+
+    def stats(self, name: str) -> Dict[str, float]:
+        index = self._find(name)
+        if index is None:
+            raise KeyError(name)
+        row = StatsRow(self, index)
+        if not row.written:
+            raise KeyError(name)
+        return row.read()
+
+    def histogram(self, name: str, kind: str = "loop") -> LatencyHistogram:
+        index = self._find(name)
+        if index is None:
+            raise KeyError(name)
+        return StatsRow(self, index).read_histogram(kind)
+
+    def __getitem__(self, name: str) -> float:
+        return self.stats(name)["loop_time"]
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self.max_nodes):
+            name = self.row_name(index)
+            if not name:
+                break
+            if StatsRow(self, index).written:
+                yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_indexes"] = dict()
+        return state
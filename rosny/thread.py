@@ -3,6 +3,8 @@ from threading import Thread
 from typing import Optional
 
 from rosny.loop import LoopNode
+from rosny.placement import Placement
+from rosny.restart import RestartPolicy
 
 
 class ThreadNode(LoopNode, metaclass=abc.ABCMeta):
@@ -10,24 +12,27 @@ class ThreadNode(LoopNode, metaclass=abc.ABCMeta):
                  loop_rate: Optional[float] = None,
                  min_sleep: float = 1e-9,
                  profile_interval: Optional[float] = None,
-                 daemon: bool = False):
+                 daemon: bool = False,
+                 placement: Optional[Placement] = None,
+                 restart_policy: Optional[RestartPolicy] = None):
         super().__init__(loop_rate=loop_rate,
                          min_sleep=min_sleep,
                          profile_interval=profile_interval,
-                         daemon=daemon)
+                         daemon=daemon,
+                         placement=placement,
+                         restart_policy=restart_policy)
         self._driver: Optional[Thread] = None
-        self._stopped = True
 
     def _start_driver(self):
         self._driver = Thread(target=self.loop,
                               name=self.name,
                               daemon=self.daemon)
         self.logger.info(f"Starting thread {self.name}")
-        self._stopped = False
+        self.control.stopped = False
         self._driver.start()
 
     def _stop_driver(self):
-        self._stopped = True
+        self.control.stopped = True
 
     def _join_driver(self, timeout: Optional[float] = None):
         if self._driver is not None:
@@ -36,6 +41,3 @@ class ThreadNode(LoopNode, metaclass=abc.ABCMeta):
                 self.logger.error(f"Thread '{self._driver}' join timeout {timeout}")
             else:
                 self._driver = None
-
-    def stopped(self) -> bool:
-        return self._stopped
@@ -1,7 +1,11 @@
+import math
 import time
-from typing import Optional
+import asyncio
+from typing import Optional, Callable, Sequence, Dict, List, Any
 
 from rosny.abstract import BaseNode
+from rosny.histogram import LatencyHistogram
+from rosny.stats import StatsRow
 
 
 class LoopTimeMeter:
@@ -18,26 +22,148 @@ class LoopTimeMeter:
     def start(self):
         self.last_time = time.perf_counter()
 
-    def end(self):
+    def end(self) -> float:
         self.count += 1
         now_time = time.perf_counter()
         delta = now_time - self.last_time
         self.mean += (delta - self.mean) / self.count
         self.last_time = now_time
+        return delta
+
+
+MISS_POLICIES = ("catch_up", "skip", "rephase")
+
+
+def arrival_count(source: Any) -> int:
+    """Number of items that have arrived to an edge, a topic or a channel"""
+    if callable(source):
+        return source()
+    for attribute in ("puts", "seq"):
+        if hasattr(source, attribute):
+            return getattr(source, attribute)
+    raise TypeError(f"Can't count arrivals of {source!r}")
+
+
+def queue_capacity(queue: Any) -> Optional[int]:
+    for attribute in ("capacity", "maxsize", "_maxsize"):
+        capacity = getattr(queue, attribute, None)
+        if isinstance(capacity, int) and 0 < capacity < 2 ** 31 - 1:
+            return capacity
+    return None
+
+
+class AdaptiveRate:
+    """Loop rate that follows the input arrival rate and backs off on full outputs.
+
+    The target rate is `headroom` times the fastest input arrival rate,
+    or `max_rate` without inputs. While the fullest output is above
+    `high_occupancy` the rate is multiplied by `decrease`, while it is above
+    `low_occupancy` the rate is not raised. The rate moves to the target
+    with `gain` every `interval` seconds and stays within min and max rates.
+    Outputs without a known capacity count as full at `default_capacity` items.
+    """
+
+    def __init__(self,
+                 min_rate: float,
+                 max_rate: float,
+                 inputs: Sequence[Any] = (),
+                 outputs: Sequence[Any] = (),
+                 interval: float = 0.5,
+                 headroom: float = 1.1,
+                 low_occupancy: float = 0.25,
+                 high_occupancy: float = 0.75,
+                 decrease: float = 0.7,
+                 gain: float = 0.5,
+                 default_capacity: int = 16):
+        if not 0 < min_rate <= max_rate:
+            raise ValueError(f"Rates must satisfy 0 < min_rate <= max_rate, "
+                             f"got {min_rate} and {max_rate}")
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.interval = interval
+        self.headroom = headroom
+        self.low_occupancy = low_occupancy
+        self.high_occupancy = high_occupancy
+        self.decrease = decrease
+        self.gain = gain
+        self.default_capacity = default_capacity
+        self.rate = max_rate
+        self.input_rate = 0.0
+        self.occupancy = 0.0
+        self._counts: Optional[list] = None
+        self._last_time = time.perf_counter()
+        self.next_time = self._last_time + interval
+
+    def reset(self, rate: Optional[float] = None):
+        self.rate = self.max_rate if rate is None else self._clamp(rate)
+        self._counts = None
+        self._last_time = time.perf_counter()
+        self.next_time = self._last_time + self.interval
+
+    def _clamp(self, rate: float) -> float:
+        return min(max(rate, self.min_rate), self.max_rate)
+
+    def _occupancy(self, queue: Any) -> float:
+        if callable(queue):
+            return queue()
+        depth = queue.depth if hasattr(queue, "depth") else queue.qsize()
+        return depth / (queue_capacity(queue) or self.default_capacity)
+
+    def update(self, now: Optional[float] = None) -> float:
+        if now is None:
+            now = time.perf_counter()
+        target = self.max_rate
+        if self.inputs:
+            counts = [arrival_count(source) for source in self.inputs]
+            elapsed = now - self._last_time
+            if self._counts is not None and elapsed > 0:
+                self.input_rate = max(
+                    (count - prev) / elapsed for count, prev in zip(counts, self._counts)
+                )
+                target = self.input_rate * self.headroom
+            self._counts = counts
+        if self.outputs:
+            self.occupancy = max(self._occupancy(queue) for queue in self.outputs)
+            if self.occupancy >= self.high_occupancy:
+                target = min(target, self.rate * self.decrease)
+            elif self.occupancy > self.low_occupancy:
+                target = min(target, self.rate)
+        self.rate = self._clamp(self.rate + self.gain * (target - self.rate))
+        self._last_time = now
+        self.next_time = now + self.interval
+        return self.rate
 
 
 class LoopRateManager:
     def __init__(self,
                  loop_rate: Optional[float] = None,
-                 min_sleep: float = 1e-9):
+                 min_sleep: float = 1e-9,
+                 precision: bool = False,
+                 spin_time: float = 1e-3,
+                 miss_policy: str = "skip",
+                 adaptive: Optional[AdaptiveRate] = None):
+        if miss_policy not in MISS_POLICIES:
+            raise ValueError(f"Miss policy must be one of {MISS_POLICIES}, "
+                             f"got '{miss_policy}'")
+        self.on_change: Optional[Callable[[], None]] = None
         self._loop_rate: Optional[float] = None
         self._loop_time: Optional[float] = None
         self._sleep_delay: Optional[float] = None
         self._time_meter = LoopTimeMeter()
         self._prev_time = time.perf_counter()
+        self._next_time = self._prev_time
+        self.sleep_time = 0.0
+        self.overruns = 0
+        self.jitter = LatencyHistogram()
 
+        self._precision = precision
+        self._min_sleep = min_sleep
+        self.spin_time = spin_time
+        self.miss_policy = miss_policy
+        self._adaptive = adaptive
         self.loop_rate = loop_rate
-        self.min_sleep = min_sleep
 
     def _build(self, loop_rate):
         self._loop_rate = loop_rate
@@ -49,8 +175,14 @@ class LoopRateManager:
             self._sleep_delay = 0.
         self._time_meter.reset()
         self._prev_time = time.perf_counter()
+        self._next_time = self._prev_time + (self._loop_time or 0.)
+        self.overruns = 0
+        self.jitter.reset()
 
     def reset(self):
+        if self._adaptive is not None:
+            self._adaptive.reset(self._loop_rate)
+            self._loop_rate = self._adaptive.rate
         self._build(self._loop_rate)
 
     @property
@@ -60,48 +192,222 @@ class LoopRateManager:
     @loop_rate.setter
     def loop_rate(self, value: Optional[float]):
         self._build(value)
+        self._changed()
+
+    @property
+    def min_sleep(self) -> float:
+        return self._min_sleep
+
+    @min_sleep.setter
+    def min_sleep(self, value: float):
+        self._min_sleep = value
+        self._changed()
+
+    @property
+    def precision(self) -> bool:
+        return self._precision
+
+    @precision.setter
+    def precision(self, value: bool):
+        self._precision = value
+        self._changed()
+
+    @property
+    def adaptive(self) -> Optional[AdaptiveRate]:
+        return self._adaptive
+
+    @adaptive.setter
+    def adaptive(self, value: Optional[AdaptiveRate]):
+        self._adaptive = value
+        if value is not None:
+            value.reset(self._loop_rate)
+            self._build(value.rate)
+        self._changed()
+
+    def _adapt(self):
+        # Changes the rate in place, so the schedule and stats are kept
+        rate = self._adaptive.update()
+        if rate != self._loop_rate:
+            self._loop_rate = rate
+            self._loop_time = 1.0 / rate
+            self._time_meter.reset()
+            self._sleep_delay = 0.
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change()
 
     def timing(self):
+        if (self._adaptive is not None
+                and time.perf_counter() >= self._adaptive.next_time):
+            self._adapt()
+        if self._loop_rate is None:
+            if self._min_sleep:
+                sleep_start = time.perf_counter()
+                time.sleep(self._min_sleep)
+                self.sleep_time = time.perf_counter() - sleep_start
+        elif self._precision:
+            self._precision_timing()
+        else:
+            sleep_start, sleep_time = self._sleep_duration()
+            time.sleep(sleep_time)
+            self._prev_time = time.perf_counter()
+            self.sleep_time = self._prev_time - sleep_start
+
+    async def async_timing(self):
+        # Same as `timing`, but yields to the event loop instead of blocking.
+        # Precision mode keeps absolute deadlines without the spin phase.
+        if (self._adaptive is not None
+                and time.perf_counter() >= self._adaptive.next_time):
+            self._adapt()
         if self._loop_rate is None:
-            if self.min_sleep:
-                time.sleep(self.min_sleep)
+            sleep_start = time.perf_counter()
+            await asyncio.sleep(self._min_sleep)
+            self.sleep_time = time.perf_counter() - sleep_start
+        elif self._precision:
+            sleep_start = time.perf_counter()
+            deadline = self._precision_deadline(sleep_start)
+            await asyncio.sleep(max(deadline - sleep_start, 0.))
+            self._precision_end(sleep_start, deadline, time.perf_counter())
         else:
-            self._time_meter.end()
-            self._sleep_delay += self._time_meter.mean - self._loop_time
-            self._sleep_delay = max(self._sleep_delay, 0)
+            sleep_start, sleep_time = self._sleep_duration()
+            await asyncio.sleep(sleep_time)
+            self._prev_time = time.perf_counter()
+            self.sleep_time = self._prev_time - sleep_start
+
+    def _sleep_duration(self):
+        self._time_meter.end()
+        self._sleep_delay += self._time_meter.mean - self._loop_time
+        self._sleep_delay = max(self._sleep_delay, 0)
 
-            sleep_time = (self._loop_time
-                          + self._prev_time
-                          - time.perf_counter()
-                          - self._sleep_delay)
-            sleep_time = max(self.min_sleep, sleep_time)
+        sleep_start = time.perf_counter()
+        sleep_time = (self._loop_time
+                      + self._prev_time
+                      - sleep_start
+                      - self._sleep_delay)
+        if sleep_time <= 0:
+            self.overruns += 1
+        return sleep_start, max(self._min_sleep, sleep_time)
 
+    def _precision_timing(self):
+        # Iterations are scheduled on absolute deadlines, so errors do not
+        # accumulate. Sleep until shortly before the deadline, then spin.
+        sleep_start = time.perf_counter()
+        deadline = self._precision_deadline(sleep_start)
+        sleep_time = deadline - self.spin_time - sleep_start
+        if sleep_time > 0:
             time.sleep(sleep_time)
-            self._prev_time = time.perf_counter()
+        now = time.perf_counter()
+        while now < deadline:
+            now = time.perf_counter()
+        self._precision_end(sleep_start, deadline, now)
+
+    def _precision_deadline(self, now):
+        loop_time = self._loop_time
+        deadline = self._next_time
+        if now >= deadline:
+            self.overruns += 1
+            if self.miss_policy == "skip":
+                missed = math.floor((now - deadline) / loop_time) + 1
+                deadline += missed * loop_time
+            elif self.miss_policy == "rephase":
+                deadline = now
+        return deadline
+
+    def _precision_end(self, sleep_start, deadline, now):
+        self.jitter.add(now - deadline)
+        self._next_time = deadline + self._loop_time
+        self._prev_time = now
+        self.sleep_time = now - sleep_start
 
 
 class Profiler:
-    def __init__(self, node: BaseNode, interval: Optional[float] = None):
+    def __init__(self,
+                 node: BaseNode,
+                 interval: Optional[float] = None,
+                 rate_manager: Optional[LoopRateManager] = None):
+        self.on_change: Optional[Callable[[], None]] = None
         self._node = node
-        self.interval = interval
+        self._interval = interval
+        self.rate_manager = rate_manager
         self._time_meter = LoopTimeMeter()
         self._last_profile_time = time.perf_counter()
+        self._stats_row: Optional[StatsRow] = None
+        self._iterations = 0
+        self._start_time = time.monotonic()
+        self.placement: Dict[str, float] = dict()
+        # Callables of the node that add their own values to reported stats
+        self.stats_hooks: List[Callable[[BaseNode], Dict[str, float]]] = []
+        self.histograms = {
+            "loop": LatencyHistogram(),
+            "work": LatencyHistogram(),
+            "sleep": LatencyHistogram(),
+        }
+
+    @property
+    def interval(self) -> Optional[float]:
+        return self._interval
+
+    @interval.setter
+    def interval(self, value: Optional[float]):
+        self._interval = value
+        self._time_meter.reset()
+        self._last_profile_time = time.perf_counter()
+        if self.on_change is not None:
+            self.on_change()
 
     def reset(self, node: BaseNode):
         self._node = node
         self._time_meter.reset()
         self._last_profile_time = time.perf_counter()
+        self._stats_row = None
+        self._iterations = 0
+        self._start_time = time.monotonic()
+        for histogram in self.histograms.values():
+            histogram.reset()
 
-    def profile(self):
-        if self.interval is not None:
-            self._time_meter.end()
-            if self._time_meter.last_time - self._last_profile_time > self.interval:
-                loop_time = self._time_meter.mean
-                loop_rate = 1 / loop_time if loop_time else float('inf')
-                self._node.common_state.profile_stats[self._node.name] = loop_time
-                self._node.logger.info(
-                    f"Profile - loop time {loop_time:.6g}, loop rate {loop_rate:.4g}"
-                )
-
+    def profile(self, sleep_time: float = 0.0):
+        if self._interval is not None:
+            delta = self._time_meter.end()
+            self.histograms["loop"].add(delta)
+            self.histograms["work"].add(delta - sleep_time)
+            self.histograms["sleep"].add(sleep_time)
+            if self._time_meter.last_time - self._last_profile_time > self._interval:
+                self._report()
                 self._time_meter.reset()
                 self._last_profile_time = time.perf_counter()
+
+    def _report(self):
+        loop_time = self._time_meter.mean
+        loop_rate = 1 / loop_time if loop_time else float('inf')
+        self._iterations += self._time_meter.count
+        stats: Dict[str, float] = dict(self.placement)
+        for hook in self.stats_hooks:
+            stats.update(hook(self._node))
+        for kind, histogram in self.histograms.items():
+            for name, value in histogram.summary().items():
+                stats[f"{kind}_{name}"] = value
+        if self.rate_manager is not None:
+            stats["overruns"] = self.rate_manager.overruns
+            stats["target_rate"] = self.rate_manager.loop_rate or float("inf")
+            for name, value in self.rate_manager.jitter.summary().items():
+                stats[f"jitter_{name}"] = value
+            self.rate_manager.jitter.reset()
+        if self._stats_row is None:
+            profile_stats = self._node.common_state.profile_stats
+            self._stats_row = profile_stats.register(self._node.name)
+        self._stats_row.write(histograms=self.histograms,
+                              loop_time=loop_time,
+                              loop_rate=loop_rate,
+                              iterations=self._iterations,
+                              start_time=self._start_time,
+                              timestamp=time.monotonic(),
+                              **stats)
+        self._node.logger.info(
+            f"Profile - loop time {loop_time:.6g}, loop rate {loop_rate:.4g}, "
+            f"p50 {stats['loop_p50']:.4g}, "
+            f"p99 {stats['loop_p99']:.4g}, "
+            f"max {stats['loop_max']:.4g}"
+        )
+        for histogram in self.histograms.values():
+            histogram.reset()
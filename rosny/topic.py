@@ -0,0 +1,49 @@
+from threading import Condition
+from typing import Optional, Tuple, Any
+
+from rosny.trigger import TriggerSource
+
+
+class Topic(TriggerSource):
+    """Latest value mailbox with sequence numbers, shared between threads"""
+
+    def __init__(self):
+        self._condition = Condition()
+        self._seq = 0
+        self._value: Any = None
+        self._triggers = []
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def publish(self, value: Any) -> int:
+        with self._condition:
+            self._seq += 1
+            self._value = value
+            self._condition.notify_all()
+            seq = self._seq
+        self.notify_triggers()
+        return seq
+
+    def get(self) -> Tuple[int, Any]:
+        with self._condition:
+            return self._seq, self._value
+
+    def poll(self, since: int) -> Optional[Tuple[int, Any]]:
+        with self._condition:
+            if self._seq > since:
+                return self._seq, self._value
+            return None
+
+    def wait(self,
+             since: int,
+             timeout: Optional[float] = None) -> Optional[Tuple[int, Any]]:
+        with self._condition:
+            if self._condition.wait_for(lambda: self._seq > since, timeout=timeout):
+                return self._seq, self._value
+            return None
+
+    def __reduce__(self):
+        raise TypeError("Topic is shared between threads only and can't be "
+                        "passed to another process")
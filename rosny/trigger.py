@@ -0,0 +1,77 @@
+import multiprocessing
+from queue import Empty
+from multiprocessing.queues import SimpleQueue
+from multiprocessing.context import BaseContext
+from typing import Optional, List, Any
+
+
+class Trigger:
+    """Counter of input events that nodes in any process can wait on"""
+
+    def __init__(self, mp_context: Optional[BaseContext] = None):
+        context = mp_context or multiprocessing.get_context()
+        self._condition = context.Condition()
+        self._seq = context.RawValue('q', 0)
+
+    @property
+    def seq(self) -> int:
+        return self._seq.value
+
+    def notify(self):
+        with self._condition:
+            self._seq.value += 1
+            self._condition.notify_all()
+
+    def wait(self, since: int, timeout: Optional[float] = None) -> int:
+        with self._condition:
+            self._condition.wait_for(lambda: self._seq.value != since,
+                                     timeout=timeout)
+            return self._seq.value
+
+
+class TriggerSource:
+    """Mixin for inputs that notify triggers after new data is available"""
+
+    _triggers: List[Trigger]
+
+    def add_trigger(self, trigger: Trigger):
+        if trigger not in self._triggers:
+            self._triggers.append(trigger)
+
+    def notify_triggers(self):
+        for trigger in self._triggers:
+            trigger.notify()
+
+
+class TriggerQueue(SimpleQueue, TriggerSource):
+    """Process queue that notifies triggers once an item can be read.
+
+    Items are written to the pipe in `put`, so unlike `multiprocessing.Queue`
+    the item is available to readers when triggers are notified.
+    Intended for a single reader.
+    """
+
+    def __init__(self, mp_context: Optional[BaseContext] = None):
+        super().__init__(ctx=mp_context or multiprocessing.get_context())
+        self._triggers = []
+
+    def put(self, obj: Any):
+        super().put(obj)
+        self.notify_triggers()
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        if not block:
+            timeout = 0.
+        if timeout is not None and not self._reader.poll(timeout):  # type: ignore
+            raise Empty
+        return super().get()
+
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+
+    def __getstate__(self):
+        return super().__getstate__(), self._triggers  # type: ignore
+
+    def __setstate__(self, state):
+        super().__setstate__(state[0])  # type: ignore
+        self._triggers = state[1]
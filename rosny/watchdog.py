@@ -0,0 +1,157 @@
+import os
+import sys
+import time
+import signal
+import threading
+import traceback
+from typing import Optional, Dict, Tuple
+
+from rosny.abstract import BaseNode
+from rosny.exporter import collect_loop_nodes
+from rosny.loop import LoopNode
+from rosny.process import ProcessNode
+from rosny.utils import setup_logger
+
+WATCHDOG_ACTIONS = ("stop", "restart")
+
+
+def format_thread_stack(ident: int) -> Optional[str]:
+    frame = sys._current_frames().get(ident)
+    if frame is None:
+        return None
+    return "".join(traceback.format_stack(frame))
+
+
+class Watchdog:
+    """Flags loop nodes whose iterations stall, checked from a background thread.
+
+    A node stalls when its heartbeat does not change for `factor` expected
+    loop times, but not less than `min_timeout` seconds. The expected loop time
+    comes from the loop rate or the profile stats. Stacks of thread nodes are
+    logged, process nodes dump their stacks to stderr.
+    """
+
+    def __init__(self,
+                 node: BaseNode,
+                 factor: float = 10.0,
+                 min_timeout: float = 1.0,
+                 interval: float = 0.1,
+                 action: Optional[str] = None,
+                 join_timeout: float = 1.0):
+        if action is not None and action not in WATCHDOG_ACTIONS:
+            raise ValueError(f"Watchdog action must be one of {WATCHDOG_ACTIONS}, "
+                             f"got '{action}'")
+        self.node = node
+        self.factor = factor
+        self.min_timeout = min_timeout
+        self.interval = interval
+        self.action = action
+        self.join_timeout = join_timeout
+        self.stalls: Dict[str, int] = dict()
+        self.logger = setup_logger(f"{node.name}/watchdog")
+        self._heartbeats: Dict[str, Tuple[int, float]] = dict()
+        self._stalled: Dict[str, bool] = dict()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def attach(self):
+        # Process nodes register the stack dump signal handler only when
+        # a watchdog can send the signal, called before they are started
+        for node in collect_loop_nodes(self.node):
+            if isinstance(node, ProcessNode):
+                node.dump_stacks = True
+
+    def start(self):
+        if self._thread is not None:
+            self.logger.error("Watchdog is already started")
+            return
+        self.logger = setup_logger(f"{self.node.name}/watchdog")
+        self._heartbeats.clear()
+        self._stalled.clear()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name=self.logger.name,
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.check()
+
+    def timeout(self, node: LoopNode) -> Optional[float]:
+        if node.trigger is not None:
+            if node.trigger_timeout is None:
+                return None  # waits for input as long as needed
+            expected = node.trigger_timeout
+        elif node.rate_manager.loop_rate:
+            expected = 1.0 / node.rate_manager.loop_rate
+        else:
+            profile_stats = node.common_state.profile_stats
+            expected = profile_stats[node.name] if node.name in profile_stats else 0.
+        return max(self.factor * expected, self.min_timeout)
+
+    def check(self):
+        now = time.monotonic()
+        for node in collect_loop_nodes(self.node):
+            if node.stopped() or node.joined():
+                self._heartbeats.pop(node.name, None)
+                continue
+            iterations = node.control.iterations
+            last_iterations, last_time = self._heartbeats.get(node.name, (-1, now))
+            if iterations != last_iterations:
+                self._heartbeats[node.name] = (iterations, now)
+                self._stalled[node.name] = False
+                continue
+            timeout = self.timeout(node)
+            if timeout is None or now - last_time <= timeout:
+                continue
+            if not self._stalled.get(node.name):
+                self._stalled[node.name] = True
+                self.stalls[node.name] = self.stalls.get(node.name, 0) + 1
+                self.on_stall(node, now - last_time)
+
+    def on_stall(self, node: LoopNode, duration: float):
+        self.logger.warning(f"Node '{node.name}' stalled for {duration:.3g} seconds "
+                            f"at iteration {node.control.iterations}")
+        self.log_stack(node)
+        if self.action == "stop":
+            node.stop()
+        elif self.action == "restart":
+            self.restart(node)
+
+    def log_stack(self, node: LoopNode):
+        driver = node._driver
+        if isinstance(driver, threading.Thread) and driver.ident is not None:
+            stack = format_thread_stack(driver.ident)
+            if stack is not None:
+                self.logger.warning(f"Stack of node '{node.name}':\n{stack}")
+        elif node.control.pid and node.control.pid != os.getpid():
+            try:
+                os.kill(node.control.pid, signal.SIGUSR1)
+                self.logger.warning(f"Stack of node '{node.name}' is dumped "
+                                    f"to stderr of process {node.control.pid}")
+            except (AttributeError, OSError) as error:
+                self.logger.error(f"Failed to dump stack of node '{node.name}': "
+                                  f"{error}")
+
+    def restart(self, node: LoopNode):
+        node.stop()
+        node.join(timeout=self.join_timeout)
+        terminate = getattr(node._driver, "terminate", None)
+        if not node.joined() and terminate is not None:
+            self.logger.warning(f"Terminating process of node '{node.name}'")
+            terminate()
+            node.join(timeout=self.join_timeout)
+        if node.joined():
+            node.start()
+            self.logger.info(f"Node '{node.name}' restarted")
+        else:
+            self.logger.error(f"Node '{node.name}' can't be restarted, "
+                              f"it is still running")
@@ -0,0 +1,130 @@
+import time
+import pytest
+import asyncio
+import threading
+
+from rosny import AsyncioNode, ComposeNode
+from rosny.aio import get_event_loop_thread
+from rosny.placement import Placement
+from rosny.restart import RestartPolicy
+from rosny.timing import LoopRateManager
+
+
+class CountNode(AsyncioNode):
+    def __init__(self, loop_rate=None):
+        super().__init__(loop_rate=loop_rate)
+        self.count = 0
+
+    async def work(self):
+        await asyncio.sleep(0)
+        self.count += 1
+
+
+class ErrorNode(AsyncioNode):
+    async def work(self):
+        raise ValueError
+
+
+class FailingNode(AsyncioNode):
+    def __init__(self, failures, restart_policy=None):
+        super().__init__(loop_rate=100, restart_policy=restart_policy)
+        self.failures = failures
+        self.begins = 0
+        self.count = 0
+
+    def on_loop_begin(self):
+        self.begins += 1
+
+    async def work(self):
+        if self.begins <= self.failures:
+            raise RuntimeError("failure")
+        self.count += 1
+
+
+class ManyNodes(ComposeNode):
+    def __init__(self, size):
+        super().__init__()
+        for index in range(size):
+            setattr(self, f"node{index}", CountNode(loop_rate=50))
+
+
+class TestAsyncioNode:
+    def test_start_stop_join(self):
+        node = CountNode()
+        node.compile()
+        node.start()
+        time.sleep(0.1)
+        assert not node.stopped()
+        assert not node.joined()
+        node.stop()
+        node.join()
+        assert node.stopped()
+        assert node.joined()
+        assert node.count > 0
+        assert node.control.iterations == node.count
+
+    def test_many_nodes_share_thread(self):
+        get_event_loop_thread()
+        num_threads = threading.active_count()
+        compose = ManyNodes(100)
+        compose.compile()
+        compose.start()
+        time.sleep(0.5)
+        assert threading.active_count() == num_threads
+        compose.stop()
+        compose.join()
+        counts = [node.count for node in compose._nodes.values()]
+        assert min(counts) > 10
+        assert max(counts) < 40
+
+    def test_exception(self):
+        node = ErrorNode()
+        node.compile()
+        node.start()
+        node.join(timeout=1.0)
+        assert node.joined()
+        assert node.common_state.exit_is_set()
+        node.stop()
+
+    def test_join_timeout(self):
+        node = CountNode(loop_rate=1)
+        node.compile()
+        node.start()
+        while not node.count:
+            time.sleep(0.01)
+        node.stop()  # the coroutine sleeps until the next iteration
+        node.join(timeout=0.01)
+        assert not node.joined()
+        node.join()
+        assert node.joined()
+
+    def test_restart(self):
+        node = FailingNode(2, RestartPolicy(max_restarts=3, backoff=0.01))
+        node.start()
+        node.wait(timeout=0.5)
+        assert not node.common_state.exit_is_set()
+        assert node.begins == 3
+        assert node.control.restarts == 2
+        assert node.count > 10
+        node.stop()
+        node.join()
+
+    def test_unsupported(self):
+        node = CountNode()
+        with pytest.raises(TypeError):
+            node.trigger_on()
+        with pytest.raises(ValueError):
+            node.placement = Placement(cpus=[0])
+        node.placement = None
+        assert node.placement is None
+
+
+def test_async_timing():
+    async def run():
+        rate_manager = LoopRateManager(loop_rate=100)
+        start = time.perf_counter()
+        for _ in range(20):
+            await rate_manager.async_timing()
+        return time.perf_counter() - start
+
+    assert 0.15 < asyncio.run(run()) < 0.4
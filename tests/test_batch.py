@@ -0,0 +1,60 @@
+import time
+import queue
+import pytest
+import multiprocessing
+
+from rosny import ThreadNode, ProcessNode
+from rosny.batch import drain, BatchMixin
+
+
+class TestDrain:
+    def test_max_items(self):
+        items = queue.Queue()
+        for index in range(10):
+            items.put(index)
+        assert drain(items, max_items=4, timeout=1) == [0, 1, 2, 3]
+        assert drain(items, max_items=100, timeout=0) == [4, 5, 6, 7, 8, 9]
+
+    def test_timeout(self, time_meter):
+        items = queue.Queue()
+        items.put(0)
+        time_meter.start()
+        assert drain(items, max_items=10, timeout=0.1) == [0]
+        time_meter.end()
+        assert pytest.approx(time_meter.mean, abs=0.05) == 0.1
+
+    def test_empty(self):
+        assert drain(queue.Queue(), max_items=10, timeout=0.01) == []
+
+
+@pytest.mark.parametrize('node_class', [ThreadNode, ProcessNode])
+def test_batch_node(node_class):
+    class CountBatchNode(BatchMixin, node_class):
+        def __init__(self, input_queue, output_queue):
+            super().__init__(min_sleep=0)
+            self.batch_input = input_queue
+            self.batch_size = 100
+            self.batch_timeout = 0.01
+            self.output_queue = output_queue
+
+        def work_batch(self, items):
+            self.output_queue.put(len(items))
+
+    input_queue = multiprocessing.Queue()
+    output_queue = multiprocessing.Queue()
+    for index in range(1000):
+        input_queue.put(index)
+    time.sleep(0.1)
+
+    node = CountBatchNode(input_queue, output_queue)
+    node.start()
+    node.wait(timeout=0.5)
+    node.stop()
+    node.join()
+
+    batches = []
+    while not output_queue.empty():
+        batches.append(output_queue.get())
+    assert sum(batches) == 1000
+    assert max(batches) == 100
+    assert len(batches) < 100
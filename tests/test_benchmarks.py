@@ -0,0 +1,31 @@
+from benchmarks import BENCHMARKS
+from benchmarks.core import summarize
+from benchmarks.__main__ import flatten, compare
+
+
+def test_registry():
+    assert set(BENCHMARKS) >= {"loop_overhead", "compose_lifecycle", "common_state",
+                               "profiler_profile", "rate_jitter",
+                               "queue_throughput", "serializers",
+                               "remote_throughput"}
+
+
+def test_summarize():
+    summary = summarize([3.0, 1.0, 2.0, 4.0])
+    assert summary == {"mean": 2.5, "p50": 3.0, "p99": 4.0, "max": 4.0}
+
+
+def test_quick_run():
+    results = BENCHMARKS["profiler_profile"](True)
+    assert 0 < results["disabled"] < results["enabled"]
+    assert BENCHMARKS["common_state"](True)["p50"] > 0
+    results = BENCHMARKS["serializers"](True)
+    assert results["record"]["struct"]["dumps"] > 0
+    assert results["bytes_1kb"]["pickle"]["loads"] > 0
+
+
+def test_compare():
+    baseline = {"a": {"b": 1.0, "c": 2.0}, "d": 0.0}
+    assert dict(flatten(baseline)) == {"a.b": 1.0, "a.c": 2.0, "d": 0.0}
+    assert compare({"a": {"b": 1.1, "c": 3.0}}, baseline, threshold=0.2) == 1
+    assert compare({"a": {"b": 0.5, "c": 2.0}}, baseline, threshold=0.2) == 0
@@ -0,0 +1,104 @@
+import pickle
+import pytest
+
+from rosny import ThreadNode, ProcessNode
+
+np = pytest.importorskip("numpy")
+
+from rosny.channel import SharedArrayChannel  # noqa: E402
+from rosny.trigger import Trigger  # noqa: E402
+
+
+@pytest.fixture(scope='function')
+def channel() -> SharedArrayChannel:
+    return SharedArrayChannel((4, 3), dtype=np.float32, slots=3)
+
+
+class TestSharedArrayChannel:
+    def test_init(self, channel):
+        assert channel.shape == (4, 3)
+        assert channel.dtype == np.float32
+        assert channel.seq == 0
+        assert channel.read() == (0, None)
+        with pytest.raises(ValueError):
+            SharedArrayChannel((2,), slots=1)
+
+    def test_write_read(self, channel):
+        for value in range(1, 10):
+            seq = channel.write(np.full((4, 3), value))
+            assert seq == value
+            read_seq, array = channel.read()
+            assert read_seq == seq
+            assert array.dtype == np.float32
+            assert np.all(array == value)
+
+    def test_zero_copy_read(self, channel):
+        seq = channel.write(np.ones((4, 3)))
+        _, view = channel.read()
+        _, copy = channel.read(copy=True)
+        for _ in range(channel.slots - 1):
+            channel.write(np.zeros((4, 3)))
+        assert channel.valid(seq)
+        channel.acquire()[...] = 2
+        assert not channel.valid(seq)
+        assert np.all(view == 2)
+        assert np.all(copy == 1)
+
+    def test_valid(self, channel):
+        first_seq = channel.write(np.zeros((4, 3)))
+        assert channel.valid(first_seq)
+        for _ in range(channel.slots - 1):
+            channel.write(np.zeros((4, 3)))
+        assert channel.valid(first_seq)
+        channel.write(np.zeros((4, 3)))
+        assert not channel.valid(first_seq)
+        assert channel.valid(channel.seq)
+        assert not channel.valid(0)
+
+    def test_acquire_commit(self, channel):
+        frame = channel.acquire()
+        frame[...] = 5
+        assert channel.read() == (0, None)
+        seq = channel.commit()
+        _, array = channel.read()
+        assert seq == 1
+        assert array is frame
+
+    def test_trigger(self, channel):
+        trigger = Trigger()
+        channel.add_trigger(trigger)
+        channel.acquire()
+        assert trigger.seq == 0
+        channel.commit()
+        assert trigger.seq == 1
+
+    def test_pickle(self, channel):
+        channel.write(np.full((4, 3), 7))
+        copied = pickle.loads(pickle.dumps(channel))
+        assert copied.seq == 1
+        assert np.all(copied.read()[1] == 7)
+        copied.write(np.full((4, 3), 8))
+        assert channel.seq == 2
+        assert np.all(channel.read()[1] == 8)
+
+
+@pytest.mark.parametrize('node_class', [ThreadNode, ProcessNode])
+def test_channel_between_nodes(node_class, channel):
+    class WriterNode(node_class):
+        def __init__(self, channel: SharedArrayChannel):
+            super().__init__(loop_rate=100)
+            self.channel = channel
+            self.count = 0
+
+        def work(self):
+            self.count += 1
+            self.channel.write(np.full(self.channel.shape, self.count))
+
+    node = WriterNode(channel)
+    node.start()
+    node.wait(timeout=0.5)
+    node.stop()
+    node.join()
+    seq, array = channel.read()
+    assert seq > 10
+    assert np.all(array == seq)
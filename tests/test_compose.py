@@ -141,3 +141,50 @@ class TestBaseComposeNode:
         assert not compose_node.joined()
         compose_node.join(timeout=1)
         assert compose_node.joined()
+
+
+class SlowStartNode(ThreadNode):
+    def on_start_begin(self):
+        time.sleep(0.1)
+
+    def work(self):
+        time.sleep(0.2)
+
+
+class SlowComposeNode(ComposeNode):
+    def __init__(self, concurrent):
+        super().__init__(concurrent=concurrent)
+        for index in range(5):
+            setattr(self, f"node{index}", SlowStartNode())
+
+
+class TestConcurrentComposeNode:
+    @pytest.mark.parametrize("concurrent", [False, True])
+    def test_durations(self, concurrent):
+        compose_node = SlowComposeNode(concurrent=concurrent)
+        start = time.perf_counter()
+        compose_node.start()
+        start_duration = time.perf_counter() - start
+        compose_node.stop()
+        compose_node.join()
+        assert compose_node.joined()
+        assert set(compose_node.start_durations) == set(compose_node._nodes)
+        assert set(compose_node.join_durations) == set(compose_node._nodes)
+        assert all(duration >= 0.1
+                   for duration in compose_node.start_durations.values())
+        if concurrent:
+            assert start_duration < 0.3
+        else:
+            assert start_duration >= 0.5
+
+    def test_join_deadline(self):
+        compose_node = SlowComposeNode(concurrent=True)
+        compose_node.start()
+        time.sleep(0.05)
+        compose_node.stop()
+        start = time.perf_counter()
+        compose_node.join(timeout=0.01)
+        assert time.perf_counter() - start < 0.1
+        assert not compose_node.joined()
+        compose_node.join(timeout=1)
+        assert compose_node.joined()
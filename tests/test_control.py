@@ -0,0 +1,105 @@
+import os
+import time
+import pickle
+import pytest
+import multiprocessing
+
+from rosny import ThreadNode, ProcessNode, ComposeNode
+from rosny.control import ControlBlock
+
+
+_blocks = []
+
+
+def allocate_control_block(names):
+    _blocks.append(ControlBlock(1))  # alive until the process exits
+    names.put(_blocks[-1]._block.name)
+
+
+@pytest.fixture(scope='function')
+def control_block() -> ControlBlock:
+    return ControlBlock(3)
+
+
+class TestControlBlock:
+    def test_init(self, control_block):
+        assert control_block.size == 3
+        for index in range(control_block.size):
+            slot = control_block.slot(index)
+            assert slot.index == index
+            assert slot.stopped
+        with pytest.raises(IndexError):
+            control_block.slot(3)
+
+    def test_slots_independent(self, control_block):
+        control_block.slot(1).stopped = False
+        assert control_block.slot(0).stopped
+        assert not control_block.slot(1).stopped
+        assert control_block.slot(2).stopped
+
+    def test_beat(self, control_block):
+        slot = control_block.slot(0)
+        slot.reset()
+        assert slot.iterations == 0
+        start = time.monotonic()
+        for _ in range(5):
+            slot.beat()
+        assert slot.iterations == 5
+        assert start <= slot.timestamp <= time.monotonic()
+        assert control_block.slot(1).iterations == 0
+
+    def test_pickle(self, control_block):
+        slot = control_block.slot(2)
+        copied = pickle.loads(pickle.dumps(slot))
+        assert copied.index == 2
+        copied.stopped = False
+        copied.beat()
+        assert not slot.stopped
+        assert slot.iterations == 1
+
+
+@pytest.mark.parametrize('node_class', [ThreadNode, ProcessNode])
+def test_compose_control_block(node_class):
+    class CustomNode(node_class):
+        def __init__(self):
+            super().__init__(loop_rate=100)
+
+        def work(self):
+            pass
+
+    class CustomComposeNode(ComposeNode):
+        def __init__(self):
+            super().__init__()
+            self.node1 = CustomNode()
+            self.node2 = CustomNode()
+
+    node = CustomComposeNode()
+    assert node.control_block is None
+    # nothing is allocated before compile
+    assert node.node1._control is None
+    assert node.node1._common_state is None
+    node.compile()
+    assert node.control_block.size == 2
+    assert node.node1.control.block is node.control_block
+    assert node.node2.control.block is node.control_block
+    assert node.node1.control.index != node.node2.control.index
+
+    node.start()
+    assert not node.stopped()
+    node.wait(timeout=0.5)
+    node.stop()
+    assert node.stopped()
+    node.join()
+    for child in (node.node1, node.node2):
+        assert pytest.approx(child.control.iterations, rel=0.2) == 50
+        assert time.monotonic() - child.control.timestamp < 0.5
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="requires /dev/shm")
+def test_child_block_unlinked():
+    names = multiprocessing.SimpleQueue()
+    process = multiprocessing.Process(target=allocate_control_block, args=(names,))
+    process.start()
+    name = names.get()
+    process.join()
+    assert not os.path.exists(os.path.join("/dev/shm", name))
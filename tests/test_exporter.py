@@ -0,0 +1,107 @@
+import os
+import socket
+import pytest
+from urllib.request import urlopen
+from urllib.error import HTTPError
+from multiprocessing import Queue
+
+from rosny import ThreadNode, ProcessNode, ComposeNode
+from rosny.exporter import MetricsExporter, read_process_stats
+
+
+class WorkNode(ThreadNode):
+    def __init__(self):
+        super().__init__(loop_rate=100, profile_interval=0.1)
+
+    def work(self):
+        pass
+
+
+class WorkProcessNode(ProcessNode):
+    def __init__(self):
+        super().__init__(loop_rate=100)
+
+    def work(self):
+        pass
+
+
+class ExporterComposeNode(ComposeNode):
+    def __init__(self, **kwargs):
+        super().__init__()
+        self.queue = Queue()
+        self.thread_node = WorkNode()
+        self.process_node = WorkProcessNode()
+        self.exporter = MetricsExporter(self, **kwargs)
+        self.exporter.add_queue('queue', self.queue)
+
+
+@pytest.fixture(scope='function')
+def compose_node():
+    node = ExporterComposeNode(port=0)
+    yield node
+    node.stop()
+    node.join()
+
+
+def test_exporter_arguments():
+    node = ExporterComposeNode(port=0)
+    with pytest.raises(ValueError):
+        MetricsExporter(node)
+    with pytest.raises(ValueError):
+        MetricsExporter(node, port=0, path='/tmp/rosny.sock')
+
+
+def test_read_process_stats():
+    cpu_time, rss = read_process_stats(os.getpid())
+    assert cpu_time > 0
+    assert rss > 0
+    assert read_process_stats(-1) is None
+
+
+def test_http_exporter(compose_node):
+    assert compose_node.exporter.address is None
+    compose_node.queue.put(1)
+    compose_node.start()
+    compose_node.wait(timeout=0.5)
+    host, port = compose_node.exporter.address
+    with urlopen(f'http://{host}:{port}/metrics') as response:
+        assert response.headers['Content-Type'].startswith('text/plain')
+        text = response.read().decode()
+
+    thread_name = compose_node.thread_node.name
+    process_name = compose_node.process_node.name
+    assert '# TYPE rosny_node_up gauge' in text
+    assert f'rosny_node_up{{node="{thread_name}"}} 1' in text
+    assert f'rosny_node_up{{node="{process_name}"}} 1' in text
+    assert f'rosny_node_loop_rate{{node="{thread_name}"}}' in text
+    assert (f'rosny_node_loop_time_seconds{{node="{thread_name}",quantile="0.99"}}'
+            in text)
+    assert f'rosny_node_overruns_total{{node="{thread_name}"}}' in text
+    assert 'rosny_queue_depth{queue="queue"} 1' in text
+    assert f'pid="{os.getpid()}"' in text
+    assert f'pid="{compose_node.process_node._driver.pid}"' in text
+    assert 'rosny_process_resident_memory_bytes' in text
+
+    with pytest.raises(HTTPError):
+        urlopen(f'http://{host}:{port}/unknown')
+
+    compose_node.stop()
+    assert compose_node.exporter.address is None
+
+
+def test_unix_socket_exporter(tmp_path):
+    path = str(tmp_path / 'metrics.sock')
+    node = ExporterComposeNode(path=path)
+    node.start()
+    node.wait(timeout=0.2)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        client.sendall(b'GET /metrics HTTP/1.0\r\n\r\n')
+        response = b''
+        while chunk := client.recv(65536):
+            response += chunk
+    node.stop()
+    node.join()
+    assert response.startswith(b'HTTP/1.0 200')
+    assert b'rosny_node_iterations_total' in response
+    assert not os.path.exists(path)
@@ -0,0 +1,144 @@
+import time
+import pickle
+import struct
+import pytest
+import threading
+
+from rosny import CommonState, ProcessNode
+from rosny.fields import SharedField, SharedScalar, SharedStruct, SharedArray
+from rosny.shared import WriterDiedError
+
+np = pytest.importorskip("numpy")
+
+
+class State(CommonState):
+    count = SharedScalar("q")
+    ready = SharedScalar("?", default=True)
+    point = SharedStruct(x="d", y="d", visible="?")
+    pose = SharedArray((8, 3), dtype="float32")
+
+
+class ExtendedState(State):
+    count = SharedScalar("i", default=7)
+    scale = SharedScalar()
+
+
+class WriterNode(ProcessNode):
+    def __init__(self):
+        super().__init__(loop_rate=1000)
+
+    def work(self):
+        value = self.control.iterations
+        self.common_state.count = value
+        self.common_state.pose = np.full((8, 3), value % 1000)
+
+
+class TestSharedFields:
+    def test_arguments(self):
+        with pytest.raises(ValueError):
+            SharedScalar("2i")
+        with pytest.raises(ValueError):
+            SharedStruct()
+        with pytest.raises(ValueError):
+            SharedStruct(x="s")
+
+    def test_incomplete_field(self):
+        class LoadOnlyField(SharedField):
+            def load(self, buf):
+                return 0
+
+        with pytest.raises(TypeError):
+            LoadOnlyField()
+
+    def test_defaults(self):
+        state = State()
+        assert state.count == 0
+        assert state.ready is True
+        assert state.point == {"x": 0., "y": 0., "visible": False}
+        assert state.pose.shape == (8, 3)
+        assert state.pose.dtype == np.float32
+        assert not state.pose.any()
+        assert CommonState()._shared_fields is None
+
+    def test_write_read(self):
+        state = State()
+        state.count = 2 ** 40
+        state.ready = False
+        state.point = {"x": 1.5, "y": -2., "visible": True}
+        state.pose = np.arange(24).reshape(8, 3)
+        assert state.count == 2 ** 40
+        assert state.ready is False
+        assert state.point == {"x": 1.5, "y": -2., "visible": True}
+        pose = state.pose
+        assert np.all(pose == np.arange(24).reshape(8, 3))
+        pose[...] = 0  # reads are copies
+        assert state.pose[7, 2] == 23
+        state.pose = 1.  # broadcast
+        assert np.all(state.pose == 1.)
+
+    def test_failed_write(self):
+        state = State()
+        with pytest.raises(ValueError):
+            state.pose = np.zeros(4)
+        with pytest.raises(KeyError):
+            state.point = {"x": 1.}
+        assert not state.pose.any()
+        assert state.point["x"] == 0.
+
+    def test_interrupted_write(self):
+        state = State()
+        lock = state._shared_fields._locks["count"]
+        lock._words[0] += 1  # writer died during a write
+        lock._words[1] = 2 ** 22 + 1  # above the max pid
+        with pytest.raises(WriterDiedError):
+            state.count
+        state.count = 5
+        assert not lock.seq % 2
+        assert state.count == 5
+
+    def test_slow_writer(self):
+        state = State()
+        lock = state._shared_fields._locks["count"]
+        state.count = 3
+        lock._words[0] += 1  # a live writer holds the lock
+
+        def unlock():
+            time.sleep(0.2)
+            lock._words[0] += 1
+
+        thread = threading.Thread(target=unlock)
+        thread.start()
+        assert state.count == 3
+        thread.join()
+
+    def test_inheritance(self):
+        state = ExtendedState()
+        assert set(state._shared_fields.fields) == {"count", "ready", "point",
+                                                    "pose", "scale"}
+        assert state.count == 7
+        state.count = 2 ** 31 - 1
+        with pytest.raises(struct.error):
+            state.count = 2 ** 31
+        assert state.count == 2 ** 31 - 1
+
+    def test_pickle(self):
+        state = State()
+        state.count = 3
+        fields = pickle.loads(pickle.dumps(state._shared_fields))
+        assert fields.read(State.count) == 3
+        fields.write(State.point, {"x": 1., "y": 2., "visible": True})
+        assert state.point["y"] == 2.
+
+    def test_process_writer(self):
+        state = State()
+        node = WriterNode()
+        node.compile(common_state=state)
+        node.start()
+        count = 0
+        while count < 100:
+            pose = state.pose
+            assert np.all(pose == pose[0, 0])  # never torn
+            count = state.count
+        node.stop()
+        node.join()
+        assert 100 <= state.count <= node.control.iterations
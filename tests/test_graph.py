@@ -0,0 +1,236 @@
+import time
+import queue
+import pytest
+
+from rosny import ThreadNode, ProcessNode, ComposeNode
+from rosny.graph import Edge, Port, Input, Output, BoundInput, BoundOutput
+from rosny.serializers import StructSerializer
+
+
+class SourceNode(ProcessNode):
+    numbers = Output(int)
+
+    def __init__(self):
+        super().__init__(loop_rate=200)
+        self.count = 0
+
+    def work(self):
+        self.numbers.put(self.count, timeout=1)
+        self.count += 1
+
+
+class SinkNode(ThreadNode):
+    numbers = Input(int)
+    objects = Input(object)
+
+    def __init__(self):
+        super().__init__()
+        self.received = []
+
+    def work(self):
+        try:
+            self.received.append(self.numbers.get(timeout=0.1))
+        except queue.Empty:
+            pass
+
+
+class TriggeredSinkNode(ThreadNode):
+    numbers = Input(int)
+
+    def __init__(self):
+        super().__init__(min_sleep=0)
+        self.trigger_on(self.numbers)  # before the port is connected
+        self.received = []
+
+    def work(self):
+        self.received.append(self.numbers.get(timeout=1))
+
+
+class TextNode(ThreadNode):
+    texts = Output(str)
+
+    def work(self):
+        pass
+
+
+class GraphComposeNode(ComposeNode):
+    def __init__(self, policy="block", serializer=None):
+        super().__init__()
+        self.source = SourceNode()
+        self.sink = SinkNode()
+        self.edge = self.connect(self.source.numbers, self.sink.numbers,
+                                 capacity=4, policy=policy, serializer=serializer)
+
+
+@pytest.mark.parametrize("kind", ["thread", "process", "shared"])
+class TestEdge:
+    def test_block(self, kind):
+        edge = Edge(capacity=2, policy="block", kind=kind)
+        edge.put(1)
+        edge.put(2)
+        with pytest.raises(queue.Full):
+            edge.put(3, timeout=0.01)
+        assert edge.get(timeout=1) == 1
+        assert edge.puts == 2
+        assert edge.gets == 1
+
+    def test_drop_newest(self, kind):
+        edge = Edge(capacity=2, policy="drop_newest", kind=kind)
+        for item in range(5):
+            edge.put(item)
+        assert [edge.get(timeout=1) for _ in range(2)] == [0, 1]
+        assert edge.drops == 3
+        assert edge.puts == 2
+
+    def test_drop_oldest(self, kind):
+        edge = Edge(capacity=2, policy="drop_oldest", kind=kind)
+        for item in range(5):
+            edge.put(item)
+        assert [edge.get(timeout=1) for _ in range(2)] == [3, 4]
+        assert edge.drops == 3
+        assert edge.puts == 5
+
+    def test_latest_only(self, kind):
+        edge = Edge(capacity=10, policy="latest_only", kind=kind)
+        assert edge.capacity == 1
+        for item in range(5):
+            edge.put(item)
+        assert edge.get(timeout=1) == 4
+        with pytest.raises(queue.Empty):
+            edge.get_nowait()
+
+    def test_serializer(self, kind):
+        np = pytest.importorskip("numpy")
+        edge = Edge(capacity=2, kind=kind, serializer="numpy")
+        array = np.arange(1 << 16, dtype=np.float32).reshape(256, 256)
+        edge.put(array)
+        result = edge.get(timeout=1)
+        assert result.dtype == np.float32
+        assert np.array_equal(result, array)
+        assert edge.serialize_time > 0
+        assert edge.deserialize_time > 0
+
+
+def test_edge_arguments():
+    with pytest.raises(ValueError):
+        Edge(policy="random")
+    with pytest.raises(ValueError):
+        Edge(kind="socket")
+    with pytest.raises(ValueError):
+        Edge(serializer="json")
+    with pytest.raises(ValueError):
+        Edge(capacity=0)
+
+
+def test_port_without_bind():
+    class IncompletePort(Port):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompletePort()
+
+
+def test_edge_state():
+    edge = Edge(capacity=2, kind="thread")
+    state = edge.__getstate__()
+    assert "_counters" not in state
+    copied = Edge.__new__(Edge)
+    copied.__setstate__(state)
+    copied.put(1)
+    assert edge.puts == 1
+    assert edge.get() == 1
+
+
+class TestPorts:
+    def test_bind(self):
+        sink = SinkNode()
+        assert isinstance(SinkNode.numbers, Input)
+        assert isinstance(sink.numbers, BoundInput)
+        assert sink.numbers is sink.numbers
+        assert sink.numbers is not SinkNode().numbers
+        assert isinstance(SourceNode().numbers, BoundOutput)
+        with pytest.raises(RuntimeError):
+            sink.numbers.get()
+        SourceNode().numbers.put(1)
+
+    def test_connect_errors(self):
+        node = GraphComposeNode()
+        with pytest.raises(ValueError):
+            node.connect(node.source.numbers, node.sink.numbers)
+        with pytest.raises(TypeError):
+            node.connect(node.sink.objects, node.source.numbers)
+        with pytest.raises(ValueError):
+            node.connect(node.source.numbers, SinkNode().numbers)
+        node.text = TextNode()
+        with pytest.raises(TypeError):
+            node.connect(node.text.texts, node.sink.numbers)
+        node.connect(node.text.texts, node.sink.objects)
+
+
+class TestGraph:
+    def test_topology(self):
+        node = GraphComposeNode(policy="drop_oldest")
+        node.compile()
+        assert node.graph.topology() == [{
+            "source": "GraphComposeNode/source.numbers",
+            "target": "GraphComposeNode/sink.numbers",
+            "dtype": "int",
+            "capacity": 4,
+            "policy": "drop_oldest",
+            "kind": "process",
+            "serializer": "",
+        }]
+
+    def test_run(self):
+        node = GraphComposeNode()
+        node.start()
+        node.graph.stats()
+        time.sleep(0.5)
+        stats = node.graph.stats()[0]
+        node.stop()
+        node.join()
+        assert node.sink.received == list(range(len(node.sink.received)))
+        assert pytest.approx(stats["put_rate"], rel=0.3) == 200
+        assert pytest.approx(stats["get_rate"], rel=0.3) == 200
+        assert stats["drops"] == 0
+        assert 0 <= stats["depth"] <= 4
+        assert node.edge.gets == len(node.sink.received)
+        assert stats["serialize_time"] == stats["deserialize_time"] == 0.
+
+    def test_serializer(self):
+        node = GraphComposeNode(serializer=StructSerializer("=q"))
+        node.source.profiler.interval = 0.1
+        node.sink.profiler.interval = 0.1
+        node.start()
+        time.sleep(0.5)
+        stats = node.graph.stats()[0]
+        node.stop()
+        node.join()
+        assert node.sink.received == list(range(len(node.sink.received)))
+        assert len(node.sink.received) > 10
+        assert stats["serializer"] == "struct"
+        assert 0 < stats["serialize_time"] < 1e-3
+        assert 0 < stats["deserialize_time"] < 1e-3
+        profile_stats = node.common_state.profile_stats
+        assert profile_stats.stats(node.source.name)["serialize_time"] > 0
+        assert profile_stats.stats(node.source.name)["deserialize_time"] == 0
+        assert profile_stats.stats(node.sink.name)["deserialize_time"] > 0
+
+
+def test_triggered_input():
+    class TriggeredComposeNode(ComposeNode):
+        def __init__(self):
+            super().__init__()
+            self.source = SourceNode()
+            self.sink = TriggeredSinkNode()
+            self.connect(self.source.numbers, self.sink.numbers, capacity=4)
+
+    node = TriggeredComposeNode()
+    node.start()
+    node.wait(timeout=0.5)
+    node.stop()
+    node.join()
+    received = node.sink.received
+    assert len(received) > 20
+    assert received == list(range(len(received)))
+    assert node.sink.control.iterations <= node.source.control.iterations
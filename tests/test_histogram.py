@@ -0,0 +1,75 @@
+import pickle
+import pytest
+
+from rosny.histogram import LatencyHistogram
+
+
+@pytest.fixture(scope='function')
+def histogram() -> LatencyHistogram:
+    return LatencyHistogram()
+
+
+class TestLatencyHistogram:
+    def test_empty(self, histogram):
+        assert histogram.count == 0
+        assert histogram.mean == 0.0
+        assert histogram.max == 0.0
+        assert histogram.percentile(50) == 0.0
+
+    def test_bucket_index(self):
+        assert LatencyHistogram.bucket_index(0.0) == 0
+        assert LatencyHistogram.bucket_index(1e-7) == 0
+        assert LatencyHistogram.bucket_index(1e-6) == 1
+        assert LatencyHistogram.bucket_index(1e9) == LatencyHistogram.num_buckets - 1
+        for value in [1e-5, 1e-3, 0.1, 1.0]:
+            index = LatencyHistogram.bucket_index(value)
+            assert LatencyHistogram.bucket_bound(index - 1) <= value
+            assert value < LatencyHistogram.bucket_bound(index)
+
+    def test_percentiles(self, histogram):
+        for value in range(1, 101):
+            histogram.add(value / 1000)
+        assert histogram.count == 100
+        assert pytest.approx(histogram.mean) == 0.0505
+        assert histogram.max == 0.1
+        assert pytest.approx(histogram.percentile(50), rel=0.2) == 0.05
+        assert pytest.approx(histogram.percentile(90), rel=0.2) == 0.09
+        assert pytest.approx(histogram.percentile(99), rel=0.2) == 0.099
+        assert histogram.percentile(100) == 0.1
+        summary = histogram.summary()
+        assert list(summary) == ['p50', 'p90', 'p99', 'max']
+
+    def test_tail(self, histogram):
+        for _ in range(990):
+            histogram.add(0.001)
+        for _ in range(10):
+            histogram.add(0.5)
+        assert histogram.percentile(50) < 0.0015
+        assert histogram.percentile(99) < 0.0015
+        assert pytest.approx(histogram.percentile(99.5), rel=0.2) == 0.5
+
+    def test_merge_reset(self, histogram):
+        other = LatencyHistogram()
+        histogram.add(0.001)
+        other.add(0.002)
+        other.add(0.003)
+        histogram.merge(other)
+        assert histogram.count == 3
+        assert pytest.approx(histogram.total) == 0.006
+        assert histogram.max == 0.003
+        copied = histogram.copy()
+        histogram.reset()
+        assert histogram.count == 0
+        assert copied.count == 3
+
+    def test_buffer(self):
+        buffer = memoryview(bytearray(LatencyHistogram.nbytes))
+        histogram = LatencyHistogram(buffer)
+        histogram.add(0.01)
+        assert LatencyHistogram(buffer).count == 1
+
+    def test_pickle(self, histogram):
+        histogram.add(0.01)
+        copied = pickle.loads(pickle.dumps(histogram))
+        assert copied.count == 1
+        assert copied.max == 0.01
@@ -7,6 +7,7 @@ from multiprocessing import Value, Manager
 
 from rosny import CommonState, ThreadNode, ProcessNode
 from rosny.signal import SignalException
+from rosny.timing import AdaptiveRate
 
 
 @pytest.fixture(scope='module', params=[ThreadNode, ProcessNode])
@@ -124,6 +125,12 @@ class TestLoopNode:
         assert pytest.approx(node.count.value, rel=0.05) == 180
         loop_time = node.common_state.profile_stats[node.name]
         assert pytest.approx(loop_time, rel=0.05) == 1 / 60
+        stats = node.common_state.profile_stats.stats(node.name)
+        assert pytest.approx(stats['loop_p50'], rel=0.2) == 1 / 60
+        assert stats['loop_max'] >= stats['loop_p99'] >= stats['loop_p50']
+        assert stats['sleep_p50'] > stats['work_p50']
+        histogram = node.common_state.profile_stats.histogram(node.name)
+        assert histogram.count >= 60
 
     def test_join_timeout(self, loop_node_class, time_meter):
         class SleepNode(loop_node_class):
@@ -143,6 +150,47 @@ class TestLoopNode:
         node.join()
         assert node.joined()
 
+    def test_loop_body(self, custom_node_class):
+        node = custom_node_class(min_sleep=0)
+        assert node._loop_body() == node._bare_loop
+        node.rate_manager.loop_rate = 10
+        assert node._reconfigure
+        assert node._loop_body() == node._full_loop
+        assert not node._reconfigure
+        node.rate_manager.loop_rate = None
+        assert node._loop_body() == node._bare_loop
+        node.profiler.interval = 1
+        assert node._loop_body() == node._full_loop
+        node.profiler.interval = None
+        node.rate_manager.min_sleep = 0.01
+        assert node._loop_body() == node._full_loop
+
+    def test_runtime_switch(self, custom_node_class):
+        class SwitchNode(custom_node_class):
+            def work(self):
+                super().work()
+                if self.count.value == 1000:
+                    self.rate_manager.loop_rate = 20
+
+        node = SwitchNode(min_sleep=0)
+        node.start()
+        node.wait(timeout=1.0)
+        node.stop()
+        node.join()
+        assert 1010 <= node.count.value <= 1030
+        assert node.control.iterations == node.count.value
+
+    def test_adaptive_rate(self, node):
+        node.profiler.interval = 0.2
+        node.rate_manager.adaptive = AdaptiveRate(min_rate=10, max_rate=50,
+                                                  outputs=[lambda: 1.0],
+                                                  interval=0.1)
+        node.start()
+        node.wait(timeout=1.5)
+        stats = node.common_state.profile_stats.stats(node.name)
+        assert stats['target_rate'] == 10
+        assert pytest.approx(stats['loop_rate'], rel=0.2) == 10
+
     def test_min_sleep(self, node):
         node.rate_manager.min_sleep = 0.1
         node.start()
@@ -0,0 +1,103 @@
+import os
+import time
+import pytest
+
+from rosny import ThreadNode, ProcessNode, ComposeNode
+from rosny.placement import Placement, available_cpus, read_placement
+
+
+class EmptyNode(ThreadNode):
+    def __init__(self, placement=None):
+        super().__init__(loop_rate=100, profile_interval=0.05, placement=placement)
+
+    def work(self):
+        pass
+
+
+class SpreadComposeNode(ComposeNode):
+    def __init__(self):
+        super().__init__(spread_cpus=True)
+        self.node1 = EmptyNode()
+        self.node2 = EmptyNode(Placement(nice=1))
+        self.node3 = EmptyNode(Placement(cpus=available_cpus()[-1:]))
+
+
+def run_node(node, duration=0.2):
+    node.start()
+    node.wait(timeout=duration)
+    node.stop()
+    node.join()
+    return node.common_state.profile_stats.stats(node.name)
+
+
+class TestPlacement:
+    def test_init(self):
+        placement = Placement(cpus={1, 0}, nice=5, policy="fifo", priority=10)
+        assert placement.cpus == [0, 1]
+        with pytest.raises(ValueError):
+            Placement(policy="deadline")
+
+    def test_read_placement(self):
+        placement = read_placement()
+        cpus = available_cpus()
+        assert placement["cpu_count"] == len(cpus)
+        assert placement["cpu_first"] == cpus[0]
+        assert placement["cpu_last"] == cpus[-1]
+        assert placement["nice"] == os.getpriority(os.PRIO_PROCESS, 0)
+        assert placement["sched_policy"] == os.SCHED_OTHER
+
+    def test_read_many_cpus(self, monkeypatch):
+        monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(64, 2048)))
+        placement = read_placement()
+        assert placement["cpu_count"] == 1984
+        assert placement["cpu_first"] == 64
+        assert placement["cpu_last"] == 2047
+
+    @pytest.mark.parametrize("node_class", [ThreadNode, ProcessNode])
+    def test_apply_in_loop(self, node_class):
+        class CustomNode(node_class):
+            def work(self):
+                time.sleep(0.01)
+
+        cpu = available_cpus()[0]
+        nice = os.getpriority(os.PRIO_PROCESS, 0) + 2
+        node = CustomNode(profile_interval=0.05,
+                          placement=Placement(cpus=[cpu], nice=nice))
+        stats = run_node(node)
+        assert stats["cpu_count"] == 1
+        assert stats["cpu_first"] == stats["cpu_last"] == cpu
+        assert stats["nice"] == nice
+        # placement is applied to the loop thread only
+        assert os.getpriority(os.PRIO_PROCESS, 0) == nice - 2
+
+    def test_not_permitted(self, caplog):
+        node = EmptyNode(Placement(cpus=[4096]))
+        stats = run_node(node)
+        assert stats["iterations"] > 0
+        assert "Failed to set CPU affinity" in caplog.text
+
+
+def test_compose_spread_cpus():
+    node = SpreadComposeNode()
+    node.compile()
+    cpus = available_cpus()
+    assert node.node1.placement.cpus == [cpus[0]]
+    assert node.node2.placement.cpus == [cpus[1 % len(cpus)]]
+    assert node.node2.placement.nice == 1
+    assert node.node3.placement.cpus == cpus[-1:]
+
+
+def test_spread_cpus_copies_placement():
+    placement = Placement(nice=1)
+
+    class SharedPlacementNode(ComposeNode):
+        def __init__(self):
+            super().__init__(spread_cpus=True)
+            self.node1 = EmptyNode(placement)
+            self.node2 = EmptyNode(placement)
+
+    node = SharedPlacementNode()
+    node.compile()
+    assert placement.cpus is None
+    assert node.node1.placement is not placement
+    assert node.node1.placement.nice == 1
@@ -0,0 +1,158 @@
+import time
+import queue
+import random
+import pytest
+
+from rosny.pool import PoolNode, PoolLoad, PoolCollector
+from rosny.restart import RestartPolicy
+
+
+class SleepHandler:
+    def __init__(self, duration=0.01, randomize=False):
+        self.duration = duration
+        self.randomize = randomize
+
+    def __call__(self, item):
+        duration = self.duration
+        if self.randomize:
+            duration *= random.random()
+        time.sleep(duration)
+        return item * 2
+
+
+def sleep_factory():
+    return SleepHandler()
+
+
+def random_sleep_factory():
+    return SleepHandler(randomize=True)
+
+
+class FailingHandler(SleepHandler):
+    def __call__(self, item):
+        if item == 3:
+            raise ValueError(item)
+        return super().__call__(item)
+
+
+def failing_factory():
+    return FailingHandler(randomize=True)
+
+
+def run_pool(pool, num_items, num_outputs=None):
+    pool.compile()
+    pool.start()
+    start = time.perf_counter()
+    for item in range(num_items):
+        pool.input_queue.put(item)
+    if num_outputs is None:
+        num_outputs = num_items
+    outputs = [pool.output_queue.get(timeout=5) for _ in range(num_outputs)]
+    duration = time.perf_counter() - start
+    pool.stop()
+    pool.join()
+    return outputs, duration
+
+
+class TestPoolLoad:
+    def test_least_loaded(self):
+        load = PoolLoad(3, max_pending=2)
+        assert [load.acquire() for _ in range(3)] == [0, 1, 2]
+        load.release(1)
+        assert load.acquire() == 1
+        assert load.acquire() == 0
+        assert load.pending == [2, 1, 1]
+        assert load.collected == 1
+
+    def test_max_pending(self):
+        load = PoolLoad(2, max_pending=1)
+        load.acquire()
+        load.acquire()
+        assert load.acquire(timeout=0.01) is None
+        load.release(0, collected=False)
+        assert load.acquire(timeout=0.01) == 0
+        assert load.collected == 0
+
+
+class TestPoolCollector:
+    def test_restart_keeps_order(self):
+        load = PoolLoad(1, max_pending=4)
+        result_queue, output_queue = queue.Queue(), queue.Queue()
+        collector = PoolCollector(load, result_queue, output_queue,
+                                  ordered=True, timeout=0.01)
+        for seq in [1, 0, 3]:
+            load.acquire()
+            result_queue.put((seq, 0, True, seq))
+            collector.work()
+        collector.on_loop_begin()
+        load.acquire()
+        result_queue.put((2, 0, True, 2))
+        collector.work()
+        assert [output_queue.get_nowait() for _ in range(4)] == [0, 1, 2, 3]
+        assert not collector._reorder
+
+    def test_failed_item(self):
+        load = PoolLoad(1, max_pending=2)
+        result_queue, output_queue = queue.Queue(), queue.Queue()
+        collector = PoolCollector(load, result_queue, output_queue,
+                                  ordered=True, timeout=0.01)
+        for seq, success in [(1, True), (0, False)]:
+            load.acquire()
+            result_queue.put((seq, 0, success, seq))
+            collector.work()
+        assert output_queue.get_nowait() == 1
+        assert output_queue.empty()
+        assert load.collected == 1
+        assert load.pending == [0]
+
+
+class TestPoolNode:
+    def test_init(self):
+        pool = PoolNode(sleep_factory, replicas=3, driver="thread")
+        assert len(pool.replicas) == 3
+        assert set(pool._nodes) == {"dispatcher", "collector",
+                                    "replica0", "replica1", "replica2"}
+        with pytest.raises(ValueError):
+            PoolNode(sleep_factory, driver="asyncio")
+        with pytest.raises(ValueError):
+            PoolNode(sleep_factory, replicas=0)
+
+    @pytest.mark.parametrize("driver", ["thread", "process"])
+    def test_ordered(self, driver):
+        pool = PoolNode(random_sleep_factory, replicas=3,
+                        driver=driver, ordered=True)
+        outputs, _ = run_pool(pool, 50)
+        assert outputs == [item * 2 for item in range(50)]
+        assert pool.load.dispatched == 50
+        assert pool.load.collected == 50
+        assert pool.load.pending == [0, 0, 0]
+
+    def test_ordered_failure(self):
+        pool = PoolNode(failing_factory, replicas=3,
+                        driver="thread", ordered=True)
+        for replica in pool.replicas:
+            replica.restart_policy = RestartPolicy(backoff=0.01)
+        outputs, _ = run_pool(pool, 20, num_outputs=19)
+        assert outputs == [item * 2 for item in range(20) if item != 3]
+        assert pool.load.collected == 19
+        assert pool.load.pending == [0, 0, 0]
+
+    def test_spawn(self):
+        pool = PoolNode(sleep_factory, replicas=2, start_method="spawn",
+                        ordered=True)
+        outputs, _ = run_pool(pool, 10)
+        assert outputs == [item * 2 for item in range(10)]
+
+    def test_unordered(self):
+        pool = PoolNode(random_sleep_factory, replicas=3, driver="thread")
+        outputs, _ = run_pool(pool, 50)
+        assert sorted(outputs) == [item * 2 for item in range(50)]
+
+    def test_scaling(self):
+        _, single_duration = run_pool(
+            PoolNode(sleep_factory, replicas=1, driver="thread"), 40
+        )
+        _, pool_duration = run_pool(
+            PoolNode(sleep_factory, replicas=4, driver="thread"), 40
+        )
+        assert pool_duration < single_duration / 2
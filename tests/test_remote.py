@@ -0,0 +1,302 @@
+import time
+import queue
+import socket
+import pytest
+import threading
+import multiprocessing
+from multiprocessing import AuthenticationError
+
+from rosny import ThreadNode, ProcessNode, ComposeNode
+from rosny.remote import (
+    FRAME_HEADER,
+    FRAME_DATA,
+    FRAME_EXIT,
+    FramedSocket,
+    RemoteSender,
+    RemoteReceiver,
+    BridgeNode,
+    pack_batch,
+    unpack_batch,
+)
+
+
+@pytest.fixture(scope='function', params=["tcp", "unix"])
+def address(request, tmp_path):
+    if request.param == "unix":
+        return str(tmp_path / "remote.sock")
+    return "127.0.0.1", 0
+
+
+def send_items(sender, count):
+    for value in range(count):
+        sender.put({"value": value, "data": bytes(100)})
+    sender.close()
+
+
+class SenderNode(ProcessNode):
+    def __init__(self, sender):
+        super().__init__(loop_rate=200)
+        self.sender = sender
+        self.count = 0
+
+    def work(self):
+        self.sender.put(self.count, timeout=1)
+        self.count += 1
+
+    def on_loop_end(self):
+        self.sender.close()
+
+
+class ReceiverNode(ThreadNode):
+    def __init__(self, receiver):
+        super().__init__()
+        self.receiver = receiver
+        self.received = []
+        self.trigger_on(receiver)
+        self.trigger_timeout = 0.1
+
+    def work(self):
+        try:
+            while True:
+                self.received.append(self.receiver.get_nowait())
+        except queue.Empty:
+            pass
+
+
+class ChannelComposeNode(ComposeNode):
+    def __init__(self, receiver):
+        super().__init__()
+        self.sender = SenderNode(RemoteSender(receiver.address))
+        self.receiver = ReceiverNode(receiver)
+
+
+class Pipeline(ComposeNode):
+    def __init__(self, address, listen, authkey=None):
+        super().__init__()
+        self.bridge = BridgeNode(address, listen=listen, authkey=authkey)
+
+
+def test_batch():
+    items = [b"", b"a", bytes(range(256)) * 10]
+    assert [bytes(item) for item in unpack_batch(pack_batch(items))] == items
+
+
+def test_framed_socket():
+    left, right = socket.socketpair()
+    sender = FramedSocket(left, compress_level=6, compress_min_size=100)
+    receiver = FramedSocket(right)
+    assert not receiver.poll()
+    sender.send(FRAME_EXIT)
+    sender.send(FRAME_DATA, b"small")
+    sender.send(FRAME_DATA, bytes(1 << 20))
+    assert sender.sent_bytes < 1 << 16  # zeros are compressed
+    assert receiver.poll(1.)
+    assert receiver.recv() == (FRAME_EXIT, b"")
+    assert receiver.recv() == (FRAME_DATA, b"small")
+    assert receiver.recv() == (FRAME_DATA, bytes(1 << 20))
+    assert receiver.received_bytes == sender.sent_bytes
+    sender.close()
+    assert receiver.recv() is None
+    receiver.close()
+
+
+def test_frame_limits():
+    left, right = socket.socketpair()
+    sender = FramedSocket(left, compress_level=9)
+    receiver = FramedSocket(right, max_frame_size=1 << 16)
+    sender.send(FRAME_DATA, bytes(1 << 16))
+    assert receiver.recv() == (FRAME_DATA, bytes(1 << 16))
+    sender.send(FRAME_DATA, bytes(1 << 20))  # small, but too large decompressed
+    with pytest.raises(ConnectionError):
+        receiver.recv()
+    sender.compress_level = 0
+    sender.send(FRAME_DATA, bytes((1 << 16) + 1))
+    with pytest.raises(ConnectionError):
+        receiver.recv()
+    sender.close()
+    receiver.close()
+
+
+def test_framed_socket_authenticate():
+    left, right = socket.socketpair()
+    client = FramedSocket(left)
+    server = FramedSocket(right)
+    thread = threading.Thread(target=server.authenticate, args=(b"key", True))
+    thread.start()
+    client.authenticate(b"key", server=False)
+    thread.join()
+    errors = []
+
+    def authenticate_server():
+        try:
+            server.authenticate(b"key", server=True)
+        except AuthenticationError as error:
+            errors.append(error)
+
+    thread = threading.Thread(target=authenticate_server)
+    thread.start()
+    with pytest.raises(AuthenticationError):
+        client.authenticate(b"other", server=False)
+    thread.join()
+    assert len(errors) == 1
+    client.close()
+    server.close()
+
+
+def test_authentication():
+    receiver = RemoteReceiver(("127.0.0.1", 0), authkey=b"secret")
+    receiver.open()
+    with pytest.raises(AuthenticationError):
+        RemoteSender(receiver.address, authkey=b"wrong").put(0)
+    with pytest.raises(AuthenticationError):
+        RemoteSender(receiver.address).put(0)
+    # a peer that skips the handshake can't force a large allocation
+    sock = socket.create_connection(receiver.address)
+    sock.sendall(FRAME_HEADER.pack(2 ** 32 - 1, FRAME_DATA, 0))
+    assert sock.recv(1 << 16)  # challenge
+    assert sock.recv(1) == b""  # dropped
+    sock.close()
+    sender = RemoteSender(receiver.address, authkey=b"secret")
+    sender.put(1)
+    assert receiver.get(timeout=5) == 1
+    sender.close()
+    receiver.close()
+
+
+def test_silent_peer():
+    receiver = RemoteReceiver(("127.0.0.1", 0))
+    receiver.open()
+    silent = socket.create_connection(receiver.address)
+    time.sleep(0.1)
+    sender = RemoteSender(receiver.address)
+    start = time.monotonic()
+    sender.put(1)
+    assert receiver.get(timeout=5) == 1
+    assert time.monotonic() - start < 1.
+    sender.close()
+    silent.close()
+    receiver.close()
+
+
+def test_max_frame_size():
+    receiver = RemoteReceiver(("127.0.0.1", 0), serializer="bytes")
+    receiver.open()
+    sender = RemoteSender(receiver.address, serializer="bytes",
+                          batch_delay=0.1, max_frame_size=2500)
+    with pytest.raises(ValueError):
+        sender.put(bytes(3000))
+    for _ in range(4):
+        sender.put(bytes(1000))
+    assert [receiver.get(timeout=5) for _ in range(4)] == [bytes(1000)] * 4
+    sender.close()
+    receiver.close()
+    assert sender.frames == 2
+
+
+def test_channel(address):
+    receiver = RemoteReceiver(address, capacity=8)
+    receiver.open()
+    sender = RemoteSender(receiver.address, batch_delay=0.01)
+    process = multiprocessing.Process(target=send_items, args=(sender, 1000))
+    process.start()
+    for value in range(1000):
+        item = receiver.get(timeout=5)
+        assert item == {"value": value, "data": bytes(100)}
+    with pytest.raises(queue.Empty):
+        receiver.get(timeout=0.1)
+    process.join()
+    receiver.close()
+
+
+def test_batching_compression(address):
+    receiver = RemoteReceiver(address, serializer="bytes")
+    receiver.open()
+    sender = RemoteSender(receiver.address, serializer="bytes",
+                          batch_size=10, batch_delay=0.5, compress_level=1)
+    for _ in range(20):
+        sender.put(bytes(1000))
+    assert [receiver.get(timeout=5) for _ in range(20)] == [bytes(1000)] * 20
+    sender.close()
+    receiver.close()
+    assert sender.frames == 2
+    assert sender.puts == 20
+    assert sender.sent_bytes < 2000
+
+
+def test_broken_channel():
+    receiver = RemoteReceiver(("127.0.0.1", 0))
+    receiver.open()
+    sender = RemoteSender(receiver.address)
+    sender.put(0)
+    assert receiver.get(timeout=5) == 0
+    receiver.close()
+    with pytest.raises(ConnectionError):
+        for _ in range(1000):
+            sender.put(bytes(1 << 16), timeout=1)
+            time.sleep(0.001)
+    with pytest.raises(ConnectionRefusedError):
+        RemoteSender(receiver.address, connect_timeout=0.05).put(0)
+
+
+def test_nodes(address):
+    receiver = RemoteReceiver(address)
+    receiver.open()
+    node = ChannelComposeNode(receiver)
+    node.start()
+    node.wait(timeout=0.5)
+    node.stop()
+    node.join()
+    receiver.close()
+    received = node.receiver.received
+    assert not node.common_state.exit_is_set()
+    assert len(received) > 20
+    assert received == list(range(len(received)))
+
+
+@pytest.mark.parametrize("action", ["exit", "stop"])
+def test_bridge(tmp_path, action):
+    address = str(tmp_path / "bridge.sock")
+    local = Pipeline(address, listen=True)
+    remote = Pipeline(address, listen=False)
+    local.start()
+    remote.start()
+    time.sleep(0.3)
+    assert local.bridge.connected and remote.bridge.connected
+    assert not local.common_state.exit_is_set()
+    if action == "exit":
+        remote.common_state.set_exit()
+    else:
+        remote.stop()
+    local.wait(timeout=1)
+    assert local.common_state.exit_is_set()
+    local.stop()
+    remote.stop()
+    local.join()
+    remote.join()
+
+
+def test_bridge_not_connected(tmp_path):
+    pipeline = Pipeline(str(tmp_path / "bridge.sock"), listen=False)
+    pipeline.bridge.connect_timeout = 0.2
+    pipeline.start()
+    pipeline.wait(timeout=1)
+    assert pipeline.common_state.exit_is_set()
+    assert not pipeline.bridge.connected
+    pipeline.stop()
+    pipeline.join()
+
+
+def test_bridge_authentication(tmp_path):
+    address = str(tmp_path / "bridge.sock")
+    local = Pipeline(address, listen=True, authkey=b"secret")
+    remote = Pipeline(address, listen=False, authkey=b"wrong")
+    local.start()
+    remote.start()
+    remote.wait(timeout=1)
+    assert remote.common_state.exit_is_set()
+    assert not local.common_state.exit_is_set()
+    assert not local.bridge.connected and not remote.bridge.connected
+    local.stop()
+    remote.stop()
+    local.join()
+    remote.join()
@@ -0,0 +1,110 @@
+import time
+import pytest
+from multiprocessing import Value
+
+from rosny import ThreadNode, ProcessNode, ComposeNode
+from rosny.restart import RestartPolicy
+
+
+@pytest.fixture(scope='module', params=[ThreadNode, ProcessNode])
+def failing_node_class(request):
+    class FailingNode(request.param):
+        def __init__(self, failures, restart_policy=None):
+            super().__init__(loop_rate=100, restart_policy=restart_policy)
+            self.failures = failures
+            self.begins = Value('i', 0)
+            self.count = Value('i', 0)
+
+        def on_loop_begin(self):
+            self.begins.value += 1
+
+        def work(self):
+            if self.begins.value <= self.failures:
+                raise RuntimeError("failure")
+            self.count.value += 1
+
+    return FailingNode
+
+
+class CountNode(ThreadNode):
+    def __init__(self):
+        super().__init__(loop_rate=100)
+        self.count = 0
+
+    def work(self):
+        self.count += 1
+
+
+class RestartComposeNode(ComposeNode):
+    def __init__(self, node):
+        super().__init__()
+        self.failing = node
+        self.sibling = CountNode()
+
+
+class TestRestartPolicy:
+    def test_backoff(self):
+        policy = RestartPolicy(max_restarts=4, backoff=0.1,
+                               multiplier=3, max_backoff=1.0)
+        assert policy.next_delay(now=0.) == pytest.approx(0.1)
+        assert policy.next_delay(now=0.) == pytest.approx(0.3)
+        assert policy.next_delay(now=0.) == pytest.approx(0.9)
+        assert policy.next_delay(now=0.) == pytest.approx(1.0)
+        assert policy.recent_restarts == 4
+
+    def test_window(self):
+        policy = RestartPolicy(max_restarts=2, window=10.0, backoff=0.1)
+        assert policy.next_delay(now=0.) == pytest.approx(0.1)
+        assert policy.next_delay(now=5.) == pytest.approx(0.2)
+        assert policy.next_delay(now=6.) is None
+        assert policy.next_delay(now=10.5) == pytest.approx(0.2)
+        assert policy.next_delay(now=16.) == pytest.approx(0.2)
+        policy.reset()
+        assert policy.recent_restarts == 0
+
+
+class TestRestartNode:
+    def test_restart(self, failing_node_class):
+        node = failing_node_class(2, RestartPolicy(max_restarts=3, backoff=0.01))
+        compose = RestartComposeNode(node)
+        compose.start()
+        compose.wait(timeout=0.5)
+        assert not compose.common_state.exit_is_set()
+        assert not node.stopped()
+        assert node.begins.value == 3
+        assert node.control.restarts == 2
+        assert node.count.value > 10
+        assert compose.sibling.count > 30
+        compose.stop()
+        compose.join()
+
+    def test_escalate(self, failing_node_class):
+        node = failing_node_class(10, RestartPolicy(max_restarts=2, backoff=0.01))
+        compose = RestartComposeNode(node)
+        compose.start()
+        compose.wait(timeout=1.0)
+        assert compose.common_state.exit_is_set()
+        assert node.begins.value == 3
+        assert node.control.restarts == 2
+        compose.stop()
+        compose.join()
+
+    def test_no_policy(self, failing_node_class):
+        node = failing_node_class(1)
+        node.start()
+        node.wait(timeout=1.0)
+        assert node.common_state.exit_is_set()
+        assert node.begins.value == 1
+        node.stop()
+        node.join()
+
+    def test_stop_during_backoff(self, failing_node_class):
+        node = failing_node_class(1, RestartPolicy(backoff=10.0))
+        node.start()
+        time.sleep(0.2)
+        node.stop()
+        start = time.monotonic()
+        node.join()
+        assert time.monotonic() - start < 0.5
+        assert node.begins.value == 1
+        assert node.control.restarts == 0
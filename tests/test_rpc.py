@@ -0,0 +1,121 @@
+import time
+import pytest
+from multiprocessing import Value
+from concurrent.futures import TimeoutError, wait
+
+from rosny import ThreadNode, ProcessNode, ComposeNode
+from rosny.rpc import RpcServer, expose
+
+
+@pytest.fixture(scope='module', params=[ThreadNode, ProcessNode])
+def server_node_class(request):
+    class ServerNode(request.param):
+        def __init__(self):
+            super().__init__()
+            self.server = RpcServer()
+            self.trigger_on(self.server)
+            self.trigger_timeout = 0.1
+            self.scale = 2
+
+        @expose
+        def multiply(self, value, offset=0):
+            return value * self.scale + offset
+
+        @expose
+        def sleep(self, duration):
+            time.sleep(duration)
+            return duration
+
+        @expose
+        def fail(self):
+            raise ValueError("failure")
+
+        @expose
+        def unpicklable(self):
+            return lambda: None
+
+        def hidden(self):
+            return "hidden"
+
+        def work(self):
+            self.server.serve(self)
+
+    return ServerNode
+
+
+class ClientNode(ProcessNode):
+    def __init__(self, client):
+        super().__init__(loop_rate=100)
+        self.client = client
+        self.results = Value('i', 0)
+
+    def work(self):
+        futures = [self.client.call("multiply", value) for value in range(10)]
+        while wait(futures, timeout=0.05).not_done:
+            if self.stopped():
+                return  # the server may be stopped before answering
+        results = [future.result() for future in futures]
+        if results == list(range(0, 20, 2)):
+            self.results.value += 1
+
+
+class RpcComposeNode(ComposeNode):
+    def __init__(self, server_node_class):
+        super().__init__()
+        server_node = server_node_class()
+        # the client is declared first, so it is stopped before the server
+        self.client_node = ClientNode(server_node.server.client(timeout=5))
+        self.server_node = server_node
+
+
+def test_calls(server_node_class):
+    node = server_node_class()
+    client = node.server.client()
+    node.start()
+    futures = [client.call("multiply", value, offset=1) for value in range(100)]
+    done, not_done = wait(futures, timeout=5)
+    assert not not_done
+    assert [future.result() for future in futures] == [value * 2 + 1
+                                                       for value in range(100)]
+    assert client.pending == 0
+    with pytest.raises(ValueError, match="failure"):
+        client.call("fail").result(timeout=1)
+    with pytest.raises(AttributeError):
+        client.call("hidden").result(timeout=1)
+    with pytest.raises(AttributeError):
+        client.call("missing").result(timeout=1)
+    with pytest.raises(RuntimeError):
+        client.call("unpicklable").result(timeout=1)
+    node.stop()
+    node.join()
+    client.close()
+
+
+def test_timeout(server_node_class):
+    node = server_node_class()
+    client = node.server.client(timeout=0.1)
+    node.start()
+    slow = client.call("sleep", 0.3)
+    skipped = client.call("sleep", 0.3)
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        slow.result(timeout=1)
+    assert time.monotonic() - start < 0.25
+    with pytest.raises(TimeoutError):
+        skipped.result(timeout=1)
+    # late responses are dropped, later requests still work
+    assert client.request("sleep", (0.,), timeout=2).result(timeout=2) == 0.
+    assert client.pending == 0
+    node.stop()
+    node.join()
+    client.close()
+
+
+def test_process_client(server_node_class):
+    node = RpcComposeNode(server_node_class)
+    node.start()
+    node.wait(timeout=0.5)
+    node.stop()
+    node.join()
+    assert not node.common_state.exit_is_set()
+    assert node.client_node.results.value > 5
@@ -0,0 +1,76 @@
+import pickle
+import pytest
+
+from rosny.serializers import (
+    Serializer,
+    PickleSerializer,
+    BytesSerializer,
+    NumpySerializer,
+    StructSerializer,
+    get_serializer,
+)
+
+
+def test_get_serializer():
+    assert isinstance(get_serializer("pickle"), PickleSerializer)
+    assert isinstance(get_serializer("bytes"), BytesSerializer)
+    serializer = StructSerializer("=if")
+    assert get_serializer(serializer) is serializer
+    with pytest.raises(ValueError):
+        get_serializer("struct")
+    with pytest.raises(ValueError):
+        get_serializer("json")
+
+
+def test_incomplete_serializer():
+    class DumpsOnlySerializer(Serializer):
+        def dumps(self, item):
+            return bytes(item)
+
+    with pytest.raises(TypeError):
+        DumpsOnlySerializer()
+
+
+def test_pickle():
+    serializer = PickleSerializer()
+    item = {"a": [1, 2.5, "text"], "b": None}
+    assert serializer.loads(serializer.dumps(item)) == item
+
+
+def test_bytes():
+    serializer = BytesSerializer()
+    assert serializer.dumps(bytearray(b"abc")) == b"abc"
+    assert serializer.loads(memoryview(b"abc")) == b"abc"
+
+
+def test_struct():
+    serializer = StructSerializer("=qd?")
+    data = serializer.dumps((7, 0.5, True))
+    assert len(data) == 17
+    assert serializer.loads(data) == (7, 0.5, True)
+    copy = pickle.loads(pickle.dumps(serializer))
+    assert copy.loads(data) == (7, 0.5, True)
+    scalar = StructSerializer("=i")
+    assert scalar.loads(scalar.dumps(-3)) == -3
+
+
+def test_numpy():
+    np = pytest.importorskip("numpy")
+    serializer = NumpySerializer()
+    arrays = [
+        np.arange(12, dtype=np.int16).reshape(3, 4)[:, ::2],
+        np.array(3.5),
+        np.zeros((0, 3), dtype=np.uint8),
+        np.ones((2, 2), dtype=">f8"),
+        np.array(["2020-01-01"], dtype="datetime64[D]"),
+    ]
+    for array in arrays:
+        result = serializer.loads(serializer.dumps(array))
+        assert result.dtype == array.dtype
+        assert result.shape == array.shape
+        assert np.array_equal(result, array)
+    data = serializer.dumps(np.ones(1000, dtype=np.float32))
+    assert len(data) < 4000 + 32
+    assert serializer.loads(bytearray(data)).flags.writeable
+    with pytest.raises(TypeError):
+        serializer.dumps(np.array([None]))
@@ -0,0 +1,108 @@
+import queue
+import pickle
+import pytest
+import multiprocessing
+
+from rosny.slab import SlabPool, SlabQueue
+
+np = pytest.importorskip("numpy")
+
+
+def produce(slab_queue, count):
+    for value in range(count):
+        slab_queue.put({"index": value, "array": np.full((512, 512), value)})
+
+
+@pytest.fixture(scope='function')
+def slab_queue() -> SlabQueue:
+    return SlabQueue(maxsize=4, slab_size=1 << 21, slabs=2, min_size=1024)
+
+
+class TestSlabPool:
+    def test_arguments(self):
+        with pytest.raises(ValueError):
+            SlabPool(0, 1)
+        with pytest.raises(ValueError):
+            SlabPool(1, 0)
+
+    def test_acquire_release(self):
+        pool = SlabPool(100, 2)
+        first = pool.acquire()
+        second = pool.acquire()
+        assert {first, second} == {0, 1}
+        assert pool.acquire(timeout=0.01) is None
+        pool.slab(second)[:3] = b"abc"
+        pool.release(second)
+        assert pool.acquire(block=False) == second
+        assert bytes(pool.slab(second)[:3]) == b"abc"
+        assert len(pool.slab(first)) == 100
+
+
+class TestSlabQueue:
+    def test_put_get(self, slab_queue):
+        array = np.arange(1000, dtype=np.float64)
+        slab_queue.put(("small", array, b"in-band"))
+        text, result, data = slab_queue.get(timeout=1)
+        assert text == "small"
+        assert data == b"in-band"
+        assert np.array_equal(result, array)
+        result[0] = -1.  # writable copy
+        assert slab_queue.empty()
+
+    def test_out_of_band(self, slab_queue):
+        array = np.ones(2048)
+        slab_queue.put(array)
+        header, refs = slab_queue._queue.get(timeout=1)
+        assert len(header) < 1024
+        assert refs == [(0, array.nbytes)]
+        slab_queue.pool.release(0)
+
+    def test_fallbacks(self, slab_queue):
+        large = np.zeros(1 << 19)  # larger than a slab
+        small = np.zeros(8)
+        many = [np.full(1024, value) for value in range(3)]
+        slab_queue.put((large, small))
+        slab_queue.put(many)
+        header, refs = slab_queue._queue.get(timeout=1)
+        assert not refs
+        assert len(header) > large.nbytes
+        header, refs = slab_queue._queue.get(timeout=1)
+        assert len(refs) == 2  # the third buffer is pickled in-band
+        buffers = [bytearray(slab_queue.pool.slab(index)[:size]) for index, size in refs]
+        items = pickle.loads(header, buffers=buffers)
+        assert all(np.all(item == value) for value, item in enumerate(items))
+
+    def test_exhausted_pool(self, slab_queue):
+        slab_queue.put(np.zeros(1024))
+        slab_queue.put(np.zeros(1024))
+        with pytest.raises(queue.Full):
+            slab_queue.put(np.zeros(1024), timeout=0.05)
+        with pytest.raises(queue.Full):
+            slab_queue.put_nowait(np.zeros(1024))
+        slab_queue.get(timeout=1)
+        slab_queue.put_nowait(np.zeros(1024))
+        assert slab_queue.qsize() == 2
+
+    def test_full_queue_releases_slabs(self):
+        slab_queue = SlabQueue(maxsize=1, slab_size=1 << 16, slabs=4, min_size=1024)
+        slab_queue.put(np.zeros(1024))
+        with pytest.raises(queue.Full):
+            slab_queue.put(np.zeros(1024), timeout=0.05)
+        assert slab_queue.pool.acquire(block=False) is not None
+        assert slab_queue.pool.acquire(block=False) is not None
+        assert slab_queue.pool.acquire(block=False) is not None
+        assert slab_queue.pool.acquire(block=False) is None
+
+    def test_get_nowait(self, slab_queue):
+        with pytest.raises(queue.Empty):
+            slab_queue.get_nowait()
+
+    def test_process(self, slab_queue):
+        process = multiprocessing.Process(target=produce, args=(slab_queue, 10))
+        process.start()
+        for value in range(10):
+            item = slab_queue.get(timeout=5)
+            assert item["index"] == value
+            assert item["array"].shape == (512, 512)
+            assert np.all(item["array"] == value)
+        process.join()
@@ -0,0 +1,173 @@
+import os
+import sys
+import time
+import subprocess
+import multiprocessing
+import queue
+import pytest
+
+from rosny import ThreadNode, ProcessNode, ComposeNode
+from rosny.graph import Input, Output
+from rosny.startup import prepare_start_method
+
+
+class EmptyNode(ProcessNode):
+    def work(self):
+        time.sleep(0.01)
+
+
+class SpawnComposeNode(ComposeNode):
+    def __init__(self):
+        super().__init__(start_method="spawn")
+        self.node = EmptyNode()
+
+
+class CounterNode(ProcessNode):
+    numbers = Output(int)
+
+    def __init__(self):
+        super().__init__(loop_rate=200)
+        self.count = 0
+
+    def work(self):
+        self.numbers.put(self.count, timeout=1)
+        self.count += 1
+
+
+class TriggeredSinkNode(ThreadNode):
+    numbers = Input(int)
+
+    def __init__(self):
+        super().__init__()
+        self.trigger_on(self.numbers)
+        self.trigger_timeout = 0.1
+        self.received = []
+
+    def work(self):
+        try:
+            self.received.append(self.numbers.get(timeout=0.1))
+        except queue.Empty:
+            pass
+
+
+class SpawnGraphNode(ComposeNode):
+    def __init__(self, kind):
+        super().__init__(start_method="spawn")
+        self.source = CounterNode()
+        self.sink = TriggeredSinkNode()
+        self.connect(self.source.numbers, self.sink.numbers, capacity=4, kind=kind)
+
+
+class PreloadComposeNode(ComposeNode):
+    def __init__(self):
+        super().__init__(start_method="fork", preload=["colorsys"])
+        self.node1 = EmptyNode()
+        self.node2 = EmptyNode()
+
+
+FORKSERVER_SCRIPT = """
+import sys
+import time
+
+from rosny import ProcessNode, ComposeNode
+
+
+class ImportCheckNode(ProcessNode):
+    def work(self):
+        time.sleep(0.01)
+
+    def on_loop_begin(self):
+        assert "colorsys" in sys.modules
+
+
+class MainNode(ComposeNode):
+    def __init__(self):
+        super().__init__(start_method="forkserver", preload=["colorsys"])
+        self.node = ImportCheckNode()
+
+
+if __name__ == "__main__":
+    node = MainNode()
+    node.start()
+    node.wait(timeout=1.0)
+    node.stop()
+    node.join()
+    assert node.node.startup_time is not None
+    assert "colorsys" not in sys.modules
+    print(node.node.startup_time)
+"""
+
+
+def test_prepare_start_method():
+    with pytest.raises(ValueError):
+        prepare_start_method("vfork")
+
+
+def test_loop_without_driver():
+    class OnceNode(EmptyNode):
+        def work(self):
+            self.control.stopped = True
+
+    node = OnceNode()
+    node.compile()
+    node.control.stopped = False
+    node.loop()
+    assert node.startup_time is None
+    assert node.control.iterations == 1
+    assert not node.common_state.exit_is_set()
+
+
+def test_fork_preload():
+    sys.modules.pop("colorsys", None)
+    start_method = multiprocessing.get_start_method(allow_none=True)
+    node = PreloadComposeNode()
+    assert "colorsys" in sys.modules
+    assert node.mp_context.get_start_method() == "fork"
+    assert multiprocessing.get_start_method(allow_none=True) == start_method
+    assert node.node1.startup_time is None
+    node.start()
+    node.wait(timeout=0.5)
+    node.stop()
+    node.join()
+    for child in (node.node1, node.node2):
+        assert 0 < child.startup_time < 0.5
+
+
+def test_forkserver_preload(tmp_path):
+    script = tmp_path / "forkserver_preload.py"
+    script.write_text(FORKSERVER_SCRIPT)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    result = subprocess.run([sys.executable, str(script)], env=env,
+                            capture_output=True, text=True, timeout=30)
+    assert result.returncode == 0, result.stderr
+    assert "Traceback" not in result.stdout
+    assert 0 < float(result.stdout.splitlines()[-1]) < 1.0
+
+
+def test_spawn_context():
+    start_method = multiprocessing.get_start_method(allow_none=True)
+    node = SpawnComposeNode()
+    assert multiprocessing.get_start_method(allow_none=True) == start_method
+    node.start()
+    assert multiprocessing.get_start_method(allow_none=True) == start_method
+    node.wait(timeout=1.0)
+    node.stop()
+    node.join()
+    assert not node.common_state.exit_is_set()
+    assert node.node.startup_time is not None
+
+
+@pytest.mark.parametrize("kind", ["process", "shared"])
+def test_spawn_graph(kind):
+    default_context = multiprocessing.get_context()
+    node = SpawnGraphNode(kind)
+    node.start()
+    assert multiprocessing.get_context() is default_context
+    node.wait(timeout=1.5)
+    node.stop()
+    node.join()
+    assert not node.common_state.exit_is_set()
+    received = node.sink.received
+    assert len(received) > 20
+    assert received == list(range(len(received)))
@@ -1,5 +1,8 @@
 import pytest
+from multiprocessing.managers import SyncManager
+
 from rosny.state import CommonState
+from rosny.stats import StatsTable
 
 
 @pytest.fixture(scope='function')
@@ -33,3 +36,17 @@ class TestCommonState:
         state = common_state.__getstate__()
         common_state.__setstate__(state)
         assert common_state._manager is None
+
+    def test_lazy_manager(self, common_state):
+        assert common_state._manager is None
+        assert isinstance(common_state.profile_stats, StatsTable)
+        manager = common_state.manager
+        assert isinstance(manager, SyncManager)
+        assert common_state.manager is manager
+        manager.shutdown()
+
+    def test_lazy_profile_stats(self, common_state):
+        assert common_state._profile_stats is None
+        stats = common_state.profile_stats
+        assert stats.max_nodes == 256
+        assert common_state.profile_stats is stats
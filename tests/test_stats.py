@@ -0,0 +1,80 @@
+import pytest
+import multiprocessing
+
+from rosny.histogram import LatencyHistogram
+from rosny.stats import StatsTable, STATS_FIELDS
+
+
+def write_stats(stats_table: StatsTable):
+    stats_table.register('node2').write(loop_time=0.25)
+
+
+@pytest.fixture(scope='function')
+def stats_table() -> StatsTable:
+    return StatsTable(max_nodes=4)
+
+
+class TestStatsTable:
+    def test_register(self, stats_table):
+        row1 = stats_table.register('node1')
+        row2 = stats_table.register('node2')
+        assert row1.index != row2.index
+        assert row1.name == 'node1'
+        assert stats_table.register('node1').index == row1.index
+        assert len(stats_table) == 0
+        assert 'node1' not in stats_table
+
+    def test_register_errors(self, stats_table):
+        with pytest.raises(ValueError):
+            stats_table.register('')
+        with pytest.raises(ValueError):
+            stats_table.register('x' * 1000)
+        for index in range(stats_table.max_nodes):
+            stats_table.register(f'node{index}')
+        with pytest.raises(RuntimeError):
+            stats_table.register('another')
+
+    def test_write_read(self, stats_table):
+        row = stats_table.register('node')
+        row.write(loop_time=0.5, loop_rate=2.0, iterations=10)
+        assert stats_table['node'] == 0.5
+        assert list(stats_table) == ['node']
+        stats = stats_table.stats('node')
+        assert set(stats) == set(STATS_FIELDS)
+        assert stats['loop_rate'] == 2.0
+        assert stats['iterations'] == 10
+        with pytest.raises(KeyError):
+            stats_table['unknown']
+
+    def test_interrupted_write(self, stats_table):
+        row = stats_table.register('node')
+        row.write(loop_time=0.5)
+        row._lock._words[0] += 1  # writer died during a write
+        row._lock._words[1] = 2 ** 22 + 1  # above the max pid
+        assert stats_table['node'] == 0.5
+        row = stats_table.register('node')
+        assert not row._lock.seq % 2
+        row.write(loop_time=0.25)
+        assert not row._lock.seq % 2
+        assert stats_table['node'] == 0.25
+
+    def test_histograms(self, stats_table):
+        row = stats_table.register('node')
+        histogram = LatencyHistogram()
+        histogram.add(0.01)
+        row.write(histograms={'loop': histogram}, loop_time=0.01)
+        row.write(histograms={'loop': histogram, 'sleep': histogram})
+        assert stats_table.histogram('node').count == 2
+        assert stats_table.histogram('node', 'sleep').count == 1
+        assert stats_table.histogram('node', 'work').count == 0
+        with pytest.raises(KeyError):
+            stats_table.histogram('unknown')
+
+    def test_process(self, stats_table):
+        stats_table.register('node1')
+        process = multiprocessing.Process(target=write_stats, args=(stats_table,))
+        process.start()
+        process.join()
+        assert stats_table.register('node2').index == 1
+        assert stats_table['node2'] == 0.25
+        assert dict(stats_table) == {'node2': 0.25}
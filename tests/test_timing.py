@@ -1,7 +1,8 @@
 import time
+import queue
 import pytest
 
-from rosny.timing import LoopRateManager
+from rosny.timing import LoopRateManager, AdaptiveRate, arrival_count, queue_capacity
 
 
 @pytest.mark.parametrize("start", [True, False])
@@ -63,3 +64,132 @@ class TestLoopRateManager:
             rate_manager.timing()
             time_meter.end()
         assert time_meter.mean > 0.001
+        assert rate_manager.sleep_time >= 0.001
+
+    def test_sleep_time(self):
+        rate_manager = LoopRateManager(loop_rate=50)
+        sleep_times = []
+        for _ in range(10):
+            time.sleep(0.005)
+            rate_manager.timing()
+            sleep_times.append(rate_manager.sleep_time)
+        assert 0 < min(sleep_times) < max(sleep_times) < 0.02
+        assert pytest.approx(sum(sleep_times) / 10, abs=0.005) == 0.015
+
+
+class TestPrecisionLoopRateManager:
+    def test_miss_policy_validation(self):
+        with pytest.raises(ValueError):
+            LoopRateManager(loop_rate=10, miss_policy='unknown')
+
+    @pytest.mark.parametrize("loop_rate", [120, 500, 1000])
+    def test_precision_timing(self, loop_rate, time_meter):
+        rate_manager = LoopRateManager(loop_rate=loop_rate,
+                                       precision=True,
+                                       miss_policy="catch_up")
+        time_meter.reset()
+        for _ in range(loop_rate):
+            rate_manager.timing()
+            time_meter.end()
+        assert pytest.approx(time_meter.mean, rel=0.01) == 1 / loop_rate
+        assert rate_manager.jitter.count == loop_rate
+        assert rate_manager.jitter.percentile(50) < 1e-4
+
+    @pytest.mark.parametrize("miss_policy, expected", [
+        ("catch_up", 0.5),
+        ("skip", 0.6),
+        ("rephase", 0.575),
+    ])
+    def test_miss_policy(self, miss_policy, expected, time_meter):
+        rate_manager = LoopRateManager(loop_rate=20,
+                                       precision=True,
+                                       miss_policy=miss_policy)
+        time_meter.reset()
+        for index in range(10):
+            if index == 2:
+                time.sleep(0.125)
+            rate_manager.timing()
+        time_meter.end()
+        assert rate_manager.overruns >= 1
+        assert pytest.approx(time_meter.mean, abs=0.02) == expected
+
+    def test_reset(self):
+        rate_manager = LoopRateManager(loop_rate=100, precision=True)
+        rate_manager.timing()
+        assert rate_manager.jitter.count == 1
+        rate_manager.reset()
+        assert rate_manager.jitter.count == 0
+        assert rate_manager.overruns == 0
+
+
+class Counter:
+    def __init__(self):
+        self.puts = 0
+
+
+class TestAdaptiveRate:
+    def test_arguments(self):
+        with pytest.raises(ValueError):
+            AdaptiveRate(min_rate=10, max_rate=5)
+        with pytest.raises(ValueError):
+            AdaptiveRate(min_rate=0, max_rate=5)
+
+    def test_sources(self):
+        counter = Counter()
+        counter.puts = 3
+        assert arrival_count(counter) == 3
+        assert arrival_count(lambda: 5) == 5
+        with pytest.raises(TypeError):
+            arrival_count(object())
+        assert queue_capacity(queue.Queue(4)) == 4
+        assert queue_capacity(queue.Queue()) is None
+
+    def test_follow_input(self):
+        counter = Counter()
+        adaptive = AdaptiveRate(min_rate=1, max_rate=100, inputs=[counter],
+                                headroom=1.0, gain=1.0)
+        adaptive.reset()
+        start = adaptive._last_time
+        assert adaptive.update(start) == 100
+        counter.puts += 20
+        assert adaptive.update(start + 1) == pytest.approx(20)
+        assert adaptive.input_rate == pytest.approx(20)
+        counter.puts += 1000
+        assert adaptive.update(start + 2) == 100
+        assert adaptive.update(start + 3) == 1
+
+    def test_backpressure(self):
+        output = queue.Queue(10)
+        adaptive = AdaptiveRate(min_rate=10, max_rate=100, outputs=[output],
+                                decrease=0.5, gain=1.0)
+        assert adaptive.update() == 100
+        for item in range(8):
+            output.put(item)
+        assert adaptive.update() == 50
+        assert adaptive.occupancy == pytest.approx(0.8)
+        assert adaptive.update() == 25
+        assert adaptive.update() == 12.5
+        assert adaptive.update() == 10
+        for _ in range(3):
+            output.get()
+        assert adaptive.update() == 10
+        for _ in range(5):
+            output.get()
+        assert adaptive.update() == 100
+
+    def test_rate_manager(self):
+        output = queue.Queue(4)
+        for item in range(4):
+            output.put(item)
+        rate_manager = LoopRateManager()
+        changes = []
+        rate_manager.on_change = lambda: changes.append(True)
+        rate_manager.adaptive = AdaptiveRate(min_rate=20, max_rate=200,
+                                             outputs=[output], interval=0.05)
+        assert changes
+        assert rate_manager.loop_rate == 200
+        rate_manager.reset()
+        start = time.perf_counter()
+        while time.perf_counter() - start < 1.0:
+            rate_manager.timing()
+        assert rate_manager.loop_rate == 20
@@ -0,0 +1,97 @@
+import time
+import pickle
+import pytest
+from threading import Thread
+
+from rosny import CommonState, ThreadNode, ComposeNode
+from rosny.topic import Topic
+
+
+@pytest.fixture(scope='function')
+def topic() -> Topic:
+    return Topic()
+
+
+class TestTopic:
+    def test_publish_get(self, topic):
+        assert topic.seq == 0
+        assert topic.get() == (0, None)
+        assert topic.publish('a') == 1
+        assert topic.publish('b') == 2
+        assert topic.seq == 2
+        assert topic.get() == (2, 'b')
+
+    def test_poll(self, topic):
+        assert topic.poll(0) is None
+        topic.publish('a')
+        assert topic.poll(0) == (1, 'a')
+        assert topic.poll(1) is None
+        topic.publish('b')
+        assert topic.poll(1) == (2, 'b')
+
+    def test_wait_timeout(self, topic, time_meter):
+        topic.publish('a')
+        assert topic.wait(0, timeout=0.1) == (1, 'a')
+        time_meter.start()
+        assert topic.wait(1, timeout=0.1) is None
+        time_meter.end()
+        assert pytest.approx(time_meter.mean, abs=0.05) == 0.1
+
+    def test_wait_publish(self, topic):
+        def publish():
+            time.sleep(0.1)
+            topic.publish('a')
+
+        thread = Thread(target=publish)
+        thread.start()
+        assert topic.wait(0, timeout=1) == (1, 'a')
+        thread.join()
+
+    def test_pickle(self, topic):
+        with pytest.raises(TypeError):
+            pickle.dumps(topic)
+
+
+def test_topic_in_common_state():
+    class State(CommonState):
+        def __init__(self):
+            super().__init__()
+            self.counter = Topic()
+
+    class PublishNode(ThreadNode):
+        def __init__(self):
+            super().__init__(loop_rate=100)
+            self.count = 0
+
+        def work(self):
+            self.count += 1
+            self.common_state.counter.publish(self.count)
+
+    class ConsumeNode(ThreadNode):
+        def __init__(self):
+            super().__init__()
+            self.seq = 0
+            self.values = []
+
+        def work(self):
+            message = self.common_state.counter.wait(self.seq, timeout=0.1)
+            if message is not None:
+                self.seq, value = message
+                self.values.append(value)
+
+    class MainNode(ComposeNode):
+        def __init__(self):
+            super().__init__()
+            self.publisher = PublishNode()
+            self.consumer = ConsumeNode()
+
+    node = MainNode()
+    node.compile(common_state=State())
+    node.start()
+    node.wait(timeout=0.5)
+    node.stop()
+    node.join()
+    values = node.consumer.values
+    assert len(values) > 10
+    assert len(values) == len(set(values))
+    assert values == sorted(values)
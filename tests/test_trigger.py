@@ -0,0 +1,132 @@
+import time
+import pytest
+from queue import Empty
+from threading import Thread
+from multiprocessing import Value
+
+from rosny import ThreadNode, ProcessNode
+from rosny.topic import Topic
+from rosny.trigger import Trigger, TriggerQueue
+
+
+class TestTrigger:
+    def test_notify_wait(self):
+        trigger = Trigger()
+        assert trigger.seq == 0
+        trigger.notify()
+        assert trigger.seq == 1
+        assert trigger.wait(0, timeout=1) == 1
+
+    def test_wait_timeout(self, time_meter):
+        trigger = Trigger()
+        time_meter.start()
+        assert trigger.wait(0, timeout=0.1) == 0
+        time_meter.end()
+        assert pytest.approx(time_meter.mean, abs=0.05) == 0.1
+
+    def test_wait_notify_thread(self):
+        trigger = Trigger()
+
+        def notify():
+            time.sleep(0.1)
+            trigger.notify()
+
+        thread = Thread(target=notify)
+        thread.start()
+        assert trigger.wait(0, timeout=1) == 1
+        thread.join()
+
+
+class TestTriggerQueue:
+    def test_put_get(self):
+        queue = TriggerQueue()
+        trigger = Trigger()
+        queue.add_trigger(trigger)
+        queue.add_trigger(trigger)
+        queue.put(1)
+        queue.put(2)
+        assert trigger.seq == 2
+        assert queue.get() == 1
+        assert queue.get_nowait() == 2
+        with pytest.raises(Empty):
+            queue.get_nowait()
+        with pytest.raises(Empty):
+            queue.get(timeout=0.01)
+
+    def test_topic_trigger(self):
+        topic = Topic()
+        trigger = Trigger()
+        topic.add_trigger(trigger)
+        topic.publish(1)
+        assert trigger.seq == 1
+
+
+@pytest.fixture(scope='module', params=[ThreadNode, ProcessNode])
+def triggered_node_class(request):
+    class TriggeredNode(request.param):
+        def __init__(self, queue: TriggerQueue):
+            super().__init__(min_sleep=0)
+            self.queue = queue
+            self.trigger_on(queue)
+            self.iterations = Value('i', 0)
+            self.items = Value('i', 0)
+
+        def work(self):
+            self.iterations.value += 1
+            while True:
+                try:
+                    self.queue.get_nowait()
+                except Empty:
+                    break
+                self.items.value += 1
+
+    return TriggeredNode
+
+
+def test_triggered_node(triggered_node_class):
+    queue = TriggerQueue()
+    node = triggered_node_class(queue)
+    node.start()
+    node.wait(timeout=0.2)
+    assert node.iterations.value == 0
+    for index in range(10):
+        queue.put(index)
+        time.sleep(0.01)
+    node.wait(timeout=0.1)
+    assert node.items.value == 10
+    assert 1 <= node.iterations.value <= 10
+    node.stop()
+    start = time.perf_counter()
+    node.join(timeout=1)
+    assert node.joined()
+    assert time.perf_counter() - start < 0.5
+
+
+def test_trigger_timeout(triggered_node_class):
+    node = triggered_node_class(TriggerQueue())
+    node.trigger_timeout = 0.05
+    node.start()
+    node.wait(timeout=0.5)
+    node.stop()
+    node.join()
+    assert pytest.approx(node.iterations.value, abs=3) == 10
+
+
+def test_trigger_wait_profiled_as_sleep():
+    class ProfiledNode(ThreadNode):
+        def __init__(self):
+            super().__init__(min_sleep=0, profile_interval=0.2)
+            self.trigger_on(TriggerQueue())
+            self.trigger_timeout = 0.05
+
+        def work(self):
+            pass
+
+    node = ProfiledNode()
+    node.start()
+    node.wait(timeout=0.5)
+    node.stop()
+    node.join()
+    stats = node.common_state.profile_stats.stats(node.name)
+    assert stats["work_p50"] < 0.01
+    assert pytest.approx(stats["sleep_p50"], abs=0.02) == 0.05
@@ -0,0 +1,145 @@
+import time
+import signal
+import threading
+import faulthandler
+import pytest
+from multiprocessing import Value
+
+from rosny import ThreadNode, ProcessNode, ComposeNode
+from rosny.trigger import Trigger
+from rosny.watchdog import Watchdog, format_thread_stack
+
+
+class HangingThreadNode(ThreadNode):
+    def __init__(self):
+        super().__init__(loop_rate=100)
+        self.hang = threading.Event()
+        self.release = threading.Event()
+
+    def work(self):
+        if self.hang.is_set():
+            self.wait_for_release()
+
+    def wait_for_release(self):
+        self.release.wait()
+        self.hang.clear()
+
+
+class HangOnceProcessNode(ProcessNode):
+    def __init__(self):
+        super().__init__(loop_rate=100)
+        self.hangs = Value('i', 0)
+
+    def work(self):
+        if self.control.iterations == 10 and not self.hangs.value:
+            self.hangs.value += 1
+            time.sleep(60)
+
+
+class DumpCheckProcessNode(ProcessNode):
+    def __init__(self):
+        super().__init__(loop_rate=100)
+        self.registered = Value('i', -1)
+
+    def on_loop_begin(self):
+        self.registered.value = faulthandler.unregister(signal.SIGUSR1)
+
+    def work(self):
+        pass
+
+
+class PlainComposeNode(ComposeNode):
+    def __init__(self, node):
+        super().__init__()
+        self.node = node
+
+
+class WatchdogComposeNode(ComposeNode):
+    def __init__(self, node, action=None):
+        super().__init__()
+        self.node = node
+        self.watchdog = Watchdog(self, factor=5, min_timeout=0.2,
+                                 interval=0.02, action=action)
+
+
+def run(compose, duration):
+    compose.start()
+    compose.wait(timeout=duration)
+
+
+def test_format_thread_stack():
+    stack = format_thread_stack(threading.get_ident())
+    assert "test_format_thread_stack" in stack
+    assert format_thread_stack(-1) is None
+
+
+def test_arguments():
+    with pytest.raises(ValueError):
+        Watchdog(WatchdogComposeNode(HangingThreadNode()), action="kill")
+
+
+def test_timeout():
+    compose = WatchdogComposeNode(HangingThreadNode())
+    watchdog = compose.watchdog
+    node = compose.node
+    assert watchdog.timeout(node) == pytest.approx(0.2)
+    node.rate_manager.loop_rate = 1
+    assert watchdog.timeout(node) == pytest.approx(5.0)
+    node.trigger = Trigger()
+    assert watchdog.timeout(node) is None
+    node.trigger_timeout = 0.1
+    assert watchdog.timeout(node) == pytest.approx(0.5)
+
+
+def test_stall_thread(caplog):
+    compose = WatchdogComposeNode(HangingThreadNode())
+    node = compose.node
+    run(compose, 0.2)
+    assert compose.watchdog.stalls == {}
+    node.hang.set()
+    time.sleep(0.5)
+    assert compose.watchdog.stalls == {node.name: 1}
+    assert "wait_for_release" in caplog.text
+    assert not node.stopped()
+    node.release.set()
+    time.sleep(0.1)
+    assert compose.watchdog.stalls == {node.name: 1}
+    compose.stop()
+    compose.join()
+
+
+def test_stall_stop():
+    compose = WatchdogComposeNode(HangingThreadNode(), action="stop")
+    node = compose.node
+    node.hang.set()
+    run(compose, 0.5)
+    assert node.stopped()
+    node.release.set()
+    compose.stop()
+    compose.join()
+    assert compose.joined()
+
+
+@pytest.mark.parametrize("compose_class", [PlainComposeNode, WatchdogComposeNode])
+def test_dump_handler(compose_class):
+    compose = compose_class(DumpCheckProcessNode())
+    run(compose, 0.3)
+    compose.stop()
+    compose.join()
+    registered = compose_class is WatchdogComposeNode
+    assert compose.node.dump_stacks == registered
+    assert compose.node.registered.value == registered
+
+
+def test_stall_restart(capfd):
+    compose = WatchdogComposeNode(HangOnceProcessNode(), action="restart")
+    compose.watchdog.join_timeout = 0.1
+    node = compose.node
+    run(compose, 1.5)
+    assert compose.watchdog.stalls == {node.name: 1}
+    assert node.hangs.value == 1
+    assert not node.stopped()
+    assert node.control.iterations > 10
+    compose.stop()
+    compose.join()
+    assert "in work" in capfd.readouterr().err